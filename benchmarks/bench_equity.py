@@ -0,0 +1,44 @@
+"""
+Trials/sec and estimates for estimate_equity on each backend.
+
+    python -m benchmarks.bench_equity [trials]
+"""
+import random, sys, time
+from poker.card import Card, Suit
+from poker.equity import estimate_equity, BACKENDS
+
+SPOTS = [
+    ("AA preflop, 1 opp", [Card(14, Suit.SPADES), Card(14, Suit.HEARTS)], [], 1),
+    ("AKs flop, 3 opp", [Card(14, Suit.SPADES), Card(13, Suit.SPADES)],
+     [Card(12, Suit.SPADES), Card(7, Suit.HEARTS), Card(2, Suit.CLUBS)], 3),
+]
+
+def main():
+    trials = 20000
+    if len(sys.argv) > 1:
+        try:
+            trials = max(1000, int(sys.argv[1]))
+        except Exception:
+            pass
+    for backend in BACKENDS:  # load tables; numpy builds its array copies on first use
+        try:
+            estimate_equity(SPOTS[0][1], None, trials=10, backend=backend, preflop_table=False)
+        except ImportError:
+            pass
+    for label, hero, board, n_opp in SPOTS:
+        base = None
+        for backend in BACKENDS:
+            random.seed(1)
+            t0 = time.perf_counter()
+            try:
+                eq = estimate_equity(hero, board, trials=trials, n_opponents=n_opp, backend=backend,
+                                     exact=False, preflop_table=False)
+            except ImportError as e:
+                print(f"{label:<20} {backend:<7} skipped: {e}")
+                continue
+            rate = trials / (time.perf_counter() - t0)
+            base = base or rate
+            print(f"{label:<20} {backend:<7} eq={eq:.3f} {rate:>12,.0f} trials/s  x{rate/base:5.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Hands/sec for the 7-card evaluator: the 21-subset reference path vs the table path.
+
+    python -m benchmarks.bench_eval [n_hands]
+"""
+import random, sys, time
+from poker.card import Card, Suit, RANKS, to_ids
+from poker.hand_eval import evaluate, evaluate_ids, evaluate_best, _evaluate_best_subsets, _tables
+
+def _hands(n: int, size: int = 7, seed: int = 1234):
+    rng = random.Random(seed)
+    deck = [Card(rank=v, suit=s) for s in Suit for v in RANKS.values()]
+    return [rng.sample(deck, size) for _ in range(n)]
+
+def _rate(fn, hands) -> float:
+    t0 = time.perf_counter()
+    for h in hands:
+        fn(h)
+    return len(hands) / (time.perf_counter() - t0)
+
+def main():
+    n = 20000
+    if len(sys.argv) > 1:
+        try:
+            n = max(1000, int(sys.argv[1]))
+        except Exception:
+            pass
+    t0 = time.perf_counter()
+    _tables()
+    print(f"table load: {(time.perf_counter() - t0)*1000:.1f} ms")
+    hands = _hands(n)
+    base = None
+    for name, fn in (("subsets (old)", _evaluate_best_subsets), ("evaluate_best", evaluate_best), ("evaluate", evaluate)):
+        r = _rate(fn, hands)
+        base = base or r
+        print(f"{name:<14} {r:>12,.0f} hands/s  x{r/base:5.1f}")
+    r = _rate(evaluate_ids, [to_ids(h) for h in hands])
+    print(f"{'evaluate_ids':<14} {r:>12,.0f} hands/s  x{r/base:5.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+PLO hands/sec: 60 five-card evaluations per hand (old) vs the Omaha board evaluator.
+
+    python -m benchmarks.bench_plo [n_hands]
+"""
+import random, sys, time
+from itertools import combinations
+from poker.card import CARDS, to_ids
+from poker.hand_eval import evaluate_ids, hand_class
+from poker.omaha import OmahaBoard, _evaluate_omaha_combos, evaluate_omaha_ids
+
+def _spots(n: int, players: int = 1, seed: int = 1234):
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        cards = rng.sample(CARDS, 5 + 4*players)
+        out.append((cards[:5], [cards[5 + 4*k:9 + 4*k] for k in range(players)]))
+    return out
+
+def _rate(fn, spots, players: int) -> float:
+    t0 = time.perf_counter()
+    for board, holes in spots:
+        fn(board, holes)
+    return len(spots) * players / (time.perf_counter() - t0)
+
+def _old_engine(board, holes):
+    return [_evaluate_omaha_combos(h, board) for h in holes]
+
+def _old_equity(board, holes):
+    # what equity._eval_plo did: 60 evaluate_ids calls per hole
+    return [max(evaluate_ids(h2 + b3) for h2 in combinations(h, 2) for b3 in combinations(board, 3))
+            for h in holes]
+
+def _board_per_hole(board, holes):
+    return [evaluate_omaha_ids(h, board) for h in holes]
+
+def _shared_board(board, holes):
+    ob = OmahaBoard(board)
+    return [ob.score(h) for h in holes]
+
+def main():
+    n = 3000
+    if len(sys.argv) > 1:
+        try:
+            n = max(200, int(sys.argv[1]))
+        except Exception:
+            pass
+    hand_class(1)  # load tables
+    for players in (1, 6):
+        spots = _spots(n, players)
+        ids = [(to_ids(b), [to_ids(h) for h in hs]) for b, hs in spots]
+        base = None
+        for name, data, fn in (("60x evaluate_best", spots, _old_engine), ("60x evaluate_ids", ids, _old_equity),
+                               ("OmahaBoard/hole", ids, _board_per_hole), ("OmahaBoard shared", ids, _shared_board)):
+            r = _rate(fn, data, players)
+            base = base or r
+            print(f"{players} player(s)  {name:<18} {r:>10,.0f} hands/s  x{r/base:5.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Cold-start guard for the command-line entry points, via python -X importtime.
+
+Each entry point is imported in a fresh interpreter; its time is the
+cumulative import time CPython reports for that module (microseconds,
+best of --repeat, lower is better). Two things fail a run:
+
+  * an entry point importing a module on its deny list (Rich, the bots,
+    the equity sampler...): that is a lazy import gone eager, caught on
+    any machine without a baseline
+  * with --compare, an import time more than --max-rise percent above
+    the baseline
+
+    python -m benchmarks.importtime [--only poker.replay ...] [--repeat 5]
+                                    [--save benchmarks/importtime.json]
+                                    [--compare benchmarks/importtime.json] [--max-rise 25]
+
+Baselines are per machine, like benchmarks.suite's.
+"""
+from typing import Dict, List, Optional, Tuple
+import argparse, json, os, platform, subprocess, sys, time
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "importtime.json")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# entry point -> modules (and their submodules) it must not import at startup
+ENTRY_POINTS: Dict[str, Tuple[str, ...]] = {
+    "poker.replay": ("rich", "poker.card", "poker.equity", "poker.bot"),
+    "poker.sim_cli": ("rich", "poker.bot", "poker.equity_cache", "numpy"),
+    "poker.cli_play": ("rich", "poker.bot", "poker.equity", "poker.suggest"),
+}
+
+def measure(module: str) -> Tuple[int, List[str]]:
+    """(cumulative import microseconds, every module imported) for one cold import."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get("PYTHONPATH")])))
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], cwd=ROOT, env=env,
+                         capture_output=True, text=True, check=True).stderr
+    total, names = 0, []
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue  # the column header
+        names.append(name.strip())
+        if name.strip() == module:
+            total = int(cumulative)
+    return total, names
+
+def denied(names: List[str], deny: Tuple[str, ...]) -> List[str]:
+    """Entries of `deny` that were imported, themselves or through a submodule."""
+    return [d for d in deny if any(n == d or n.startswith(d + ".") for n in names)]
+
+def run(modules: Optional[List[str]] = None, repeat: int = 5, progress=print) -> dict:
+    """{"meta": {...}, "results": {module: {"us", "modules", "denied"}}}; us is the best of `repeat` imports."""
+    results = {}
+    for module in modules or list(ENTRY_POINTS):
+        best, names = None, []
+        for _ in range(max(1, repeat)):
+            us, names = measure(module)
+            best = us if best is None else min(best, us)
+        bad = denied(names, ENTRY_POINTS.get(module, ()))
+        results[module] = {"us": best, "modules": len(names), "denied": bad}
+        if progress:
+            progress(f"{module:<20} {best / 1000:>8.1f} ms {len(names):>5} modules"
+                     + (f"  imports {', '.join(bad)}" if bad else ""))
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(), "repeat": repeat,
+                 "date": time.strftime("%Y-%m-%d %H:%M:%S")},
+        "results": results,
+    }
+
+def compare(baseline: dict, current: dict, max_rise: float) -> List[Tuple[str, int, int, float, bool]]:
+    """(module, baseline us, current us, % change, regressed) for entry points in both runs."""
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base or not base["us"]:
+            continue
+        change = 100.0 * (cur["us"] - base["us"]) / base["us"]
+        rows.append((name, base["us"], cur["us"], change, change > max_rise))
+    return rows
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.importtime", description="Entry-point cold-start guard.")
+    ap.add_argument("--only", nargs="+", choices=list(ENTRY_POINTS), default=None, metavar="MODULE")
+    ap.add_argument("--repeat", type=int, default=5, help="cold imports per entry point; the fastest counts")
+    ap.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, default=None, help="write results as a baseline")
+    ap.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, default=None, help="baseline to compare to")
+    ap.add_argument("--max-rise", type=float, default=25.0, help="percent slowdown that fails --compare")
+    args = ap.parse_args(argv)
+
+    data = run(args.only, args.repeat)
+    status = 0
+    eager = [m for m, r in data["results"].items() if r["denied"]]
+    if eager:
+        print(f"{len(eager)} entry point(s) import modules they should load lazily: {', '.join(eager)}")
+        status = 1
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        print(f"wrote {args.save}")
+    if not args.compare:
+        return status
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(baseline, data, args.max_rise)
+    print(f"\n{'entry point':<20} {'baseline ms':>12} {'now ms':>10} {'change':>8}")
+    for name, base, cur, change, bad in rows:
+        print(f"{name:<20} {base / 1000:>12.1f} {cur / 1000:>10.1f} {change:>+7.1f}%" + ("  REGRESSION" if bad else ""))
+    failed = [r[0] for r in rows if r[4]]
+    if failed:
+        print(f"{len(failed)} entry point(s) more than {args.max_rise:g}% slower to import than {args.compare}: "
+              f"{', '.join(failed)}")
+        return 1
+    print(f"no entry point more than {args.max_rise:g}% slower to import")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Load test for poker.server: add bot tables in steps and report bot action
+latency at each size, then the most tables per core that stayed under the
+p99 budget. Start a local instance first:
+
+    python -m poker.server --port 8000 &
+    python -m benchmarks.load_server [url] [step] [max_tables] [window_s] [budget_ms]
+"""
+import json, sys, time, urllib.request
+
+def _call(url: str, method: str = "GET", body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, method=method, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return json.loads(resp.read())
+
+def main():
+    args = sys.argv[1:]
+    url = args[0].rstrip("/") if args else "http://127.0.0.1:8000"
+    step, max_tables, window, budget = 8, 256, 10.0, 250.0
+    try:
+        if len(args) > 1: step = max(1, int(args[1]))
+        if len(args) > 2: max_tables = max(step, int(args[2]))
+        if len(args) > 3: window = max(1.0, float(args[3]))
+        if len(args) > 4: budget = float(args[4])
+    except Exception:
+        pass
+
+    created, best = [], None
+    print(f"{'tables':>7} {'hands/s':>9} {'actions/s':>10} {'p50 ms':>8} {'p99 ms':>8}")
+    try:
+        while len(created) < max_tables:
+            for _ in range(step):
+                t = _call(f"{url}/tables", "POST", {"bots": [1, 3, 5, 7], "hand_pause": 0.5})
+                created.append(t["id"])
+            h0 = _call(f"{url}/stats?window={window}")["hands"]
+            time.sleep(window)
+            s = _call(f"{url}/stats?window={window}")
+            hands_s = (s["hands"] - h0) / window
+            print(f"{len(created):>7} {hands_s:>9.1f} {s['actions_per_s']:>10.1f} {s['p50_ms']:>8.1f} {s['p99_ms']:>8.1f}")
+            if s["p99_ms"] > budget:
+                break
+            best = (len(created), s)
+    finally:
+        for tid in created:
+            try:
+                _call(f"{url}/tables/{tid}", "DELETE")
+            except Exception:
+                pass
+
+    if best is None:
+        print(f"p99 above {budget:.0f} ms already at {step} tables")
+        return
+    n, s = best
+    print(f"{n} tables under p99 {budget:.0f} ms on {s['cpus']} cores "
+          f"({s['workers']} bot workers): {n / s['cpus']:.1f} tables/core")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Regression benchmarks for the hot paths, with JSON baselines.
+
+Each workload is seeded and runs the same work every time; its rate is the
+best of --repeat runs (ops/sec, higher is better):
+
+    eval7              7-card evaluate_ids calls
+    plo                Omaha hole scorings on a fixed board (OmahaBoard.score)
+    equity_1..7        Monte Carlo trials vs 1..7 opponents (AKs on a flop)
+    sidepots           build_sidepots calls, 6 seats with all-ins
+    hands              headless bot hands (hand_state + bot.act_batch, simulated equity)
+    hands_buckets      the same with postflop bucket lookup
+    history_dump       Recorder.dump appends to the hand log
+    history_background BackgroundRecorder.dump + flush, no fsync
+
+    python -m benchmarks.suite [--only eval7 plo ...] [--repeat 3] [--scale 1.0]
+                               [--save benchmarks/baseline.json]
+                               [--compare benchmarks/baseline.json] [--max-drop 10]
+
+--compare exits with status 1 when any workload's rate is more than
+--max-drop percent below the baseline. Baselines are per machine, so save
+one on the machine you compare on.
+"""
+from dataclasses import replace
+from decimal import Decimal
+from typing import Callable, Dict, List, Optional, Tuple
+import argparse, json, os, platform, random, sys, tempfile, time
+
+from poker.equity import sample_counts
+from poker.hand_eval import evaluate_ids
+from poker.history import BackgroundRecorder, Recorder, build_sidepots
+from poker.omaha import OmahaBoard
+from poker.ranges import parse_cards
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+# a workload factory takes the scale, does its setup and returns run() -> ops done
+Workload = Callable[[float], Callable[[], int]]
+
+def _n(base: int, scale: float) -> int:
+    return max(1, int(base * scale))
+
+def _eval7(scale: float):
+    rng = random.Random(1234)
+    hands = [rng.sample(range(52), 7) for _ in range(_n(50_000, scale))]
+    evaluate_ids(hands[0])  # load tables outside the timing
+
+    def run():
+        for h in hands:
+            evaluate_ids(h)
+        return len(hands)
+    return run
+
+def _plo(scale: float):
+    rng = random.Random(1234)
+    spots = []
+    for _ in range(_n(2_000, scale)):
+        cards = rng.sample(range(52), 5 + 4*4)
+        spots.append((cards[:5], [cards[5 + 4*k:9 + 4*k] for k in range(4)]))
+
+    def run():
+        for board, holes in spots:
+            score = OmahaBoard(board).score
+            for h in holes:
+                score(h)
+        return len(spots) * 4
+    return run
+
+def _equity(n_opponents: int) -> Workload:
+    def factory(scale: float):
+        hero, board = parse_cards("AsKs"), parse_cards("Qs7h2c")
+        trials = _n(4_000, scale)
+
+        def run():
+            sample_counts(hero, board, trials, n_opponents, "holdem", 5, seed=1)
+            return trials
+        return run
+    return factory
+
+def _sidepots(scale: float):
+    rng = random.Random(1234)
+    cases = [([Decimal(rng.choice((0, 2, 10, 37, 120, 200))) for _ in range(6)],
+              [rng.random() < 0.7 for _ in range(6)]) for _ in range(_n(20_000, scale))]
+
+    def run():
+        for contrib, alive in cases:
+            build_sidepots(contrib, alive)
+        return len(cases)
+    return run
+
+def _hands(mode: str, base: int) -> Workload:
+    def factory(scale: float):
+        from poker.selfplay import simulate
+        hands = _n(base, scale)
+
+        def run():
+            simulate([1, 4, 7], hands=hands, seed=1, mode=mode)
+            return hands
+        return run
+    return factory
+
+def _records(n: int) -> list:
+    from poker.deck import Deck
+    from poker.engine import GameConfig
+    from poker.hand_state import apply, new_hand
+    from poker import bot, history
+    cfg = GameConfig("holdem", 2, [3, 1, 1], 5)
+    rng = random.Random(1234)
+    recs = []
+    for i in range(min(n, 50)):
+        stacks = [Decimal("200")] * 3
+        state, events = new_hand(cfg, stacks, Deck(rng))
+        while not state.done:
+            state, ev = apply(state, bot.act_batch([(state, [1, 4, 7])], mode="buckets")[0])
+            events += ev
+        recs.append(history.record_from_events(f"bench-{i:06d}", "holdem", ["You", "L4", "L7"],
+                                               [0, 4, 7], stacks, state, events))
+    return [replace(recs[i % len(recs)], hand_id=f"bench-{i:06d}") for i in range(n)]
+
+def _history(background: bool) -> Workload:
+    def factory(scale: float):
+        recs = _records(_n(2_000, scale))
+
+        def run():
+            with tempfile.TemporaryDirectory() as d:
+                if background:
+                    rec = BackgroundRecorder(d, fsync_every=None)
+                    for r in recs:
+                        rec.dump(r)
+                    rec.flush()
+                    rec.close()
+                else:
+                    rec = Recorder(d)
+                    for r in recs:
+                        rec.dump(r)
+                    rec.log.close()
+            return len(recs)
+        return run
+    return factory
+
+WORKLOADS: Dict[str, Tuple[Workload, str]] = {
+    "eval7": (_eval7, "evals/s"),
+    "plo": (_plo, "holes/s"),
+    **{f"equity_{n}": (_equity(n), "trials/s") for n in range(1, 8)},
+    "sidepots": (_sidepots, "calls/s"),
+    "hands": (_hands("simulate", 20), "hands/s"),
+    "hands_buckets": (_hands("buckets", 400), "hands/s"),
+    "history_dump": (_history(False), "writes/s"),
+    "history_background": (_history(True), "writes/s"),
+}
+
+def run_suite(names: Optional[List[str]] = None, repeat: int = 3, scale: float = 1.0, progress=print) -> dict:
+    """{"meta": {...}, "results": {name: {"rate", "unit"}}}; rate is the best of `repeat` runs."""
+    results = {}
+    for name in names or list(WORKLOADS):
+        factory, unit = WORKLOADS[name]
+        run = factory(scale)
+        best = 0.0
+        for _ in range(max(1, repeat)):
+            t0 = time.perf_counter()
+            ops = run()
+            best = max(best, ops / (time.perf_counter() - t0))
+        results[name] = {"rate": round(best, 1), "unit": unit}
+        if progress:
+            progress(f"{name:<20} {best:>14,.1f} {unit}")
+    return {
+        "meta": {"python": platform.python_version(), "machine": platform.machine(),
+                 "cpus": os.cpu_count(), "scale": scale, "repeat": repeat,
+                 "date": time.strftime("%Y-%m-%d %H:%M:%S")},
+        "results": results,
+    }
+
+def compare(baseline: dict, current: dict, max_drop: float) -> List[Tuple[str, float, float, float, bool]]:
+    """(name, baseline rate, current rate, % change, regressed) for workloads in both runs."""
+    rows = []
+    for name, cur in current["results"].items():
+        base = baseline["results"].get(name)
+        if not base or not base["rate"]:
+            continue
+        change = 100.0 * (cur["rate"] - base["rate"]) / base["rate"]
+        rows.append((name, base["rate"], cur["rate"], change, change < -max_drop))
+    return rows
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.suite", description="Hot-path regression benchmarks.")
+    ap.add_argument("--only", nargs="+", choices=list(WORKLOADS), default=None, metavar="NAME")
+    ap.add_argument("--repeat", type=int, default=3, help="runs per workload; the best counts")
+    ap.add_argument("--scale", type=float, default=1.0, help="multiply every workload's size")
+    ap.add_argument("--save", nargs="?", const=DEFAULT_BASELINE, default=None, help="write results as a baseline")
+    ap.add_argument("--compare", nargs="?", const=DEFAULT_BASELINE, default=None, help="baseline to compare to")
+    ap.add_argument("--max-drop", type=float, default=10.0, help="percent slowdown that fails --compare")
+    args = ap.parse_args(argv)
+
+    data = run_suite(args.only, args.repeat, args.scale)
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        print(f"wrote {args.save}")
+    if not args.compare:
+        return 0
+    with open(args.compare, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(baseline, data, args.max_drop)
+    print(f"\n{'workload':<20} {'baseline':>14} {'now':>14} {'change':>8}")
+    for name, base, cur, change, bad in rows:
+        print(f"{name:<20} {base:>14,.1f} {cur:>14,.1f} {change:>+7.1f}%" + ("  REGRESSION" if bad else ""))
+    failed = [r[0] for r in rows if r[4]]
+    if failed:
+        print(f"{len(failed)} workload(s) more than {args.max_drop:g}% slower than {args.compare}: {', '.join(failed)}")
+        return 1
+    print(f"no workload more than {args.max_drop:g}% slower")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,32 @@
-from typing import List
-from .card import Card
-from .equity import estimate_equity
+from decimal import Decimal
+from typing import Dict, List, Optional, Sequence, Tuple
+import random
+from . import metrics
+from .card import Card, from_ids, to_ids
+from .equity import EXACT_LIMIT
+from .equity_cache import EquityCache, EquityQuery, cached_equity, cached_equity_batch
+from .hand_state import Action, BET, CALL, CHECK, CENT, FOLD, HandState
+from .postflop import lookup
 
 # 1 = weakest/loose, 7 = strongest/tightest
 BET_THR  = {1:0.55, 2:0.58, 3:0.60, 4:0.62, 5:0.64, 6:0.66, 7:0.68}
 CALL_THR = {1:0.44, 2:0.46, 3:0.48, 4:0.50, 5:0.52, 6:0.54, 7:0.56}
 
+BET_SIZE = Decimal("4.00")
+
+# Where postflop equity comes from: "simulate" samples every spot, "buckets"
+# reads poker.postflop's precomputed strength table (spots it does not cover
+# are still simulated). Preflop Hold'em always uses the preflop table.
+MODES = ("simulate", "buckets")
+
+def thresholds(level: int, n_live_opponents: int) -> Tuple[float, float]:
+    """(bet, call) equity thresholds for a level facing n_live_opponents."""
+    # Multiway penalty: more opponents → need stronger equity
+    add = max(0, n_live_opponents-1) * 0.04
+    bthr = min(0.98, BET_THR.get(level, BET_THR[4]) + add)
+    cthr = min(0.98, CALL_THR.get(level, CALL_THR[4]) + add)
+    return bthr, cthr
+
 def decide(
     level: int,
     hole: List[Card],
@@ -13,9 +34,101 @@ def decide(
     facing_bet: bool,
     n_live_opponents: int,
     eval_variant: str,
-    board_target_size: int
+    board_target_size: int,
+    mode: str = "simulate"
 ) -> str:
-    # Multiway penalty: more opponents → need stronger equity
-    add = max(0, n_live_opponents-1) * 0.04
-    bthr = min(0.98, BET_THR.get(level, 4) + add)
+    bthr, cthr = thresholds(level, n_live_opponents)
+    eq = _decision_equity(hole, board, facing_bet, n_live_opponents, eval_variant, board_target_size,
+                          bthr, cthr, mode)
+    if not facing_bet:
+        return "BET" if eq >= bthr else "CHECK"
+    return "CALL" if eq >= cthr else "FOLD"
+
+@metrics.timed("bot.decide")
+def _decision_equity(hole: List[Card], board, facing_bet: bool, n_live_opponents: int, eval_variant: str,
+                     board_target_size: int, bthr: float, cthr: float, mode: str) -> float:
+    # Preflop Hold'em is served from the 169-class table; later streets sample
+    # until equity is clearly above or below the threshold for this decision.
+    eq = _bucket_equity(to_ids(hole), to_ids(board or []), max(1, n_live_opponents), eval_variant,
+                        board_target_size, mode)
+    if eq is None:
+        eq = cached_equity(
+            hole,
+            board,
+            trials=1000,
+            n_opponents=max(1, n_live_opponents),
+            eval_variant=eval_variant,
+            board_target_size=board_target_size,
+            threshold=cthr if facing_bet else bthr
+        )
+    return eq
+
+def _bucket_equity(hole: Sequence[int], board: Sequence[int], n_opponents: int, eval_variant: str,
+                   board_target_size: int, mode: str) -> Optional[float]:
+    if mode not in MODES:
+        raise ValueError(f"unknown mode {mode!r}; expected one of {MODES}")
+    if mode != "buckets" or not board:
+        return None
+    s = lookup(hole, board, n_opponents, eval_variant, board_target_size)
+    return None if s is None else s.equity
+
+def _action(state: HandState, level: int, eq: float) -> Action:
+    seat = state.to_act
+    bthr, cthr = thresholds(level, state.live_opponents(seat))
+    if state.facing_bet:
+        return Action(CALL) if eq >= cthr else Action(FOLD)
+    amt = min(BET_SIZE, state.max_bet(seat))
+    if eq >= bthr and amt >= CENT:
+        return Action(BET, amt)
+    return Action(CHECK)
+
+def act(state: HandState, level: int, mode: str = "simulate") -> Action:
+    """decide() for the seat on the move in a hand_state.HandState."""
+    seat = state.to_act
+    board = from_ids(state.board)
+    n_live = state.live_opponents(seat)
+    bthr, cthr = thresholds(level, n_live)
+    eq = _decision_equity(from_ids(state.holes[seat]), board if board else None, state.facing_bet, n_live,
+                          state.eval_variant, state.board_target_size, bthr, cthr, mode)
+    return _action(state, level, eq)
 
+@metrics.timed("bot.act_batch")
+def act_batch(items: Sequence[Tuple[HandState, Sequence[Optional[int]]]], trials: int = 1000,
+              mode: str = "simulate", cache: Optional[EquityCache] = None,
+              rng: Optional[random.Random] = None, exact_limit: int = EXACT_LIMIT) -> List[Action]:
+    """
+    act() for the seat on the move in each state, with one equity batch for all.
+    levels[pos] is the bot level at hand position pos (None for a human).
+    Bots still to act later on the same street go into the batch too, sampled
+    until clear of both their bet and call thresholds, so their own turns are
+    answered from EQUITY_CACHE (or `cache`). In "buckets" mode tabled spots
+    skip the batch. With `rng` the batch is seeded from it instead of drawing
+    from the global random module. Spots with more than exact_limit deals are
+    sampled (up to `trials`) rather than enumerated.
+    """
+    queries, firsts = [], []
+    tabled: Dict[int, float] = {}
+    for k, (state, levels) in enumerate(items):
+        seat = state.to_act
+        eq = _bucket_equity(state.holes[seat], state.board, max(1, state.live_opponents(seat)),
+                            state.eval_variant, state.board_target_size, mode)
+        if eq is not None:
+            tabled[k] = eq
+            firsts.append(-1)
+            continue
+        firsts.append(len(queries))
+        board = from_ids(state.board)
+        later = [p for p in state.queue[1:] if levels[p] is not None and state.in_hand[p] and state.stacks[p] > 0]
+        for p in [state.to_act] + later:
+            n = state.live_opponents(p)
+            bthr, cthr = thresholds(levels[p], n)
+            if p == state.to_act:
+                thr = (cthr,) if state.facing_bet else (bthr,)
+            else:
+                thr = (cthr,) if state.facing_bet else (bthr, cthr)
+            queries.append(EquityQuery(from_ids(state.holes[p]), board, max(1, n), state.eval_variant,
+                                       state.board_target_size, thr))
+    results = cached_equity_batch(queries, trials, cache=cache,
+                                  seed=None if rng is None else rng.getrandbits(64), exact_limit=exact_limit)
+    return [_action(state, levels[state.to_act], tabled[k] if q < 0 else results[q].equity)
+            for k, ((state, levels), q) in enumerate(zip(items, firsts))]
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum, auto
+from typing import Iterable, List, Tuple
 
 class Suit(Enum):
     CLUBS = auto()
@@ -30,3 +31,22 @@ class Card:
 
     def __str__(self) -> str:
         return f"{RANK_NAME[self.rank]} OF {SUIT_NAME[self.suit]}"
+
+# ---------- integer encoding ----------
+# Card id = (suit.value-1)*13 + (rank-2), i.e. 0..51 grouped by suit.
+# Hot loops (evaluator, equity) work on ids and index flat tables with them.
+
+def card_id(c: Card) -> int:
+    return (c.suit.value - 1) * 13 + (c.rank - 2)
+
+# interned Card for every id: CARDS[card_id(c)] == c
+CARDS: Tuple[Card, ...] = tuple(Card(rank=r, suit=s) for s in Suit for r in range(2, 15))
+
+def from_id(i: int) -> Card:
+    return CARDS[i]
+
+def to_ids(cards: Iterable[Card]) -> List[int]:
+    return [card_id(c) for c in cards]
+
+def from_ids(ids: Iterable[int]) -> List[Card]:
+    return [CARDS[i] for i in ids]
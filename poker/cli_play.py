@@ -1,13 +1,11 @@
 from decimal import Decimal, ROUND_DOWN
 from typing import List, Dict, Any
 import os
-from .engine import play_hand_console, GameConfig
+from . import metrics
+from .engine import play_hand_console, GameConfig, ODDS_TARGET_SE
 from .promptctx import get_prompt_context
 from .names import random_names
-from .equity import estimate_equity
-from .history import Recorder
-from .suggest import suggest_action
-from .ui import stats_panel
+from .history import BackgroundRecorder
 
 WELCOME = """Welcome to MIMO'S CASINO — where we go all in, all night.
 
@@ -60,7 +58,7 @@ def ask(prompt: str) -> str:
         if "action (" in prompt.lower():
             if t in ("suggest","s") or t in ("odds","o"):
                 from .promptctx import get_prompt_context
-                from .equity import estimate_equity
+                from .equity_cache import cached_equity
                 from .suggest import suggest_action
                 ctx = get_prompt_context()
                 hole = ctx.get("hole")
@@ -82,14 +80,20 @@ def ask(prompt: str) -> str:
                         print("Cheat 'suggest' is not active for custom.")
                         continue
                     try:
-                        action, why = suggest_action(cfg.variant, hole, bd, n_live, False)
+                        t0 = metrics.value("equity.trials")
+                        with metrics.timer("cheat.suggest"):
+                            action, why = suggest_action(cfg.variant, hole, bd, n_live, False)
+                        metrics.inc("cheat.suggest.trials", metrics.value("equity.trials") - t0)
                         print(f"suggest: {action.lower()} — {why}")
                     except Exception as e:
                         print(f"suggest unavailable: {e}")
                     continue
                 else:  # odds
                     try:
-                        eq = estimate_equity(hole, bd, trials=1200, n_opponents=n_live)
+                        t0 = metrics.value("equity.trials")
+                        with metrics.timer("cheat.odds"):
+                            eq = cached_equity(hole, bd, trials=1200, n_opponents=n_live, target_se=ODDS_TARGET_SE)
+                        metrics.inc("cheat.odds.trials", metrics.value("equity.trials") - t0)
                         print(f"odds: win≈{eq:.1%} vs {n_live} opp(s)")
                     except Exception as e:
                         print(f"odds unavailable: {e}")
@@ -185,6 +189,15 @@ def _pick_mode_and_config():
             return "sng", GameConfig(variant="holdem", hole_cards=2, row_sizes=[3,1,1], board_target_size=5)
         print("Please enter 1, 2, 3 or 4.")
 
+_hands_played = 0
+
+def _play_hand(hero, names, levels, bot_stacks, config):
+    """play_hand_console for a session; POKERLAB_PROFILE_HAND=N profiles the Nth hand of the run."""
+    global _hands_played
+    _hands_played += 1
+    with metrics.profile_hand(_hands_played):
+        return play_hand_console(hero, names, levels, bot_stacks, config, input_fn=ask, print_fn=print, record=True)
+
 def session_cash(bank: Decimal) -> Decimal:
     # Opponents
     while True:
@@ -216,12 +229,12 @@ def session_cash(bank: Decimal) -> Decimal:
     top_pots: List[float] = []
 
     dealer_idx = 0
-    rec = Recorder()
+    rec = BackgroundRecorder()  # hands are written off the game loop
 
     try:
         while True:
             before = hero
-            __res = play_hand_console(hero, names, levels, bot_stacks, _current_config, input_fn=ask, print_fn=print)
+            __res = _play_hand(hero, names, levels, bot_stacks, _current_config)
 
             # Accept 2/3/4-tuple returns from play_hand_console
 
@@ -254,9 +267,9 @@ def session_cash(bank: Decimal) -> Decimal:
             profit_deltas.append(float(after - before))
 
             # Save history if available
-            jpath = None
+            hand_id = None
             if "record" in handinfo:
-                jpath = rec.dump(handinfo["record"])
+                hand_id = rec.dump(handinfo["record"])
                 pot_total = sum(float(p["amount"]) for p in handinfo["record"].pots)
                 top_pots.append(pot_total)
 
@@ -286,8 +299,9 @@ Another hand? (y/n): """).strip().lower()
                         print(f"- {a.name} {a.type} on {a.street}{amt}")
                     continue
                 if nxt == "r":
-                    if jpath:
-                        os.system(f'python -m poker.replay "{jpath}"')
+                    if hand_id:
+                        rec.flush()
+                        os.system(f'python -m poker.replay "{hand_id}" "{rec.history_dir}"')
                     else:
                         print("No recorded hand to replay.")
                     continue
@@ -301,6 +315,7 @@ Another hand? (y/n): """).strip().lower()
                 pfr  = stats["pfr_n"] / denom
                 stats_out = {"hands": stats["hands"], "vpip": vpip, "pfr": pfr, "sd_wins": stats["sd_wins"]}
                 top3 = sorted(top_pots, reverse=True)[:3]
+                from .ui import stats_panel
                 stats_panel(stats_out, profit_deltas, top3)
                 print(f"You cashed out. Total bank: {_money_str(wallet)}")
                 return wallet
@@ -316,6 +331,8 @@ Another hand? (y/n): """).strip().lower()
         print(f"\nCashing out {_money_str(hero)} and restarting. Total bank: {_money_str(wallet)}")
         hero = Decimal("0.00")
         raise
+    finally:
+        rec.close()  # exit/reset/leave: everything queued reaches the log
     return wallet
 
 def session_sng(bank: Decimal) -> Decimal:
@@ -332,11 +349,11 @@ def session_sng(bank: Decimal) -> Decimal:
     bot_stacks = [Decimal("200.00")] * n
     dealer_idx = 0
     config = GameConfig("holdem", 2, [3,1,1], 5)
-    rec = Recorder()
+    rec = BackgroundRecorder()  # hands are written off the game loop
 
     try:
         while True:
-            __res = play_hand_console(hero, names, levels, bot_stacks, config, input_fn=ask, print_fn=print)
+            __res = _play_hand(hero, names, levels, bot_stacks, config)
 
             # Accept 2/3/4-tuple returns from play_hand_console
 
@@ -380,6 +397,8 @@ Next hand? (y/n): """).strip().lower()
     except ResetGame:
         print(f"\nLeaving Sit-n-Go (reset). Your bank is {_money_str(bank)}")
         raise
+    finally:
+        rec.close()
 
 def main():
     print(WELCOME)
@@ -409,6 +428,9 @@ def main():
                 continue
     except (KeyboardInterrupt, SystemExit):
         print("\nExiting. Goodbye!")
+    finally:
+        if metrics.ENABLED:
+            print(metrics.summary())
 
 if __name__ == "__main__":
     main()
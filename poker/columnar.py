@@ -0,0 +1,192 @@
+"""
+Columnar export of the hand-history log for vectorized analysis.
+
+Streams the log (handlog.scan) into one .npy file per column, so the output
+opens with numpy.load(..., mmap_mode="r") and millions of hands scan without
+parsing JSON. Writing needs no numpy: columns are buffered in array.array
+and appended to files whose fixed 128-byte .npy header is filled in at the
+end, so memory stays flat whatever the log size.
+
+    out/
+      hands/      ts, hand_id (S32), variant, n_seats, pot_cents, winners (seat bitmask),
+                  board_start, board_len
+      seats/      hand, seat, player, level, start_cents, end_cents
+      actions/    hand, seat, street, type, amount_cents
+      showdowns/  hand, seat, strength, hole_start, hole_len
+      cards.npy   card ids (card.card_id) that board_* and hole_* slice into
+      dicts.json  code -> string for every dictionary-encoded column
+      meta.json   row counts
+
+`hand` columns are row numbers in hands/. Strings (variant, player, street,
+type) are dictionary-encoded as small ints; money is integer cents.
+
+    python -m poker.columnar [history_dir] [out_dir]
+"""
+from array import array
+from decimal import Decimal
+from typing import Any, Dict, List
+import json, os, struct, sys
+
+from .card import CARDS
+from .handlog import scan
+
+HEADER_BYTES = 128
+_ORDER = "<" if sys.byteorder == "little" else ">"
+# array typecode -> numpy dtype descr
+_DESCR = {"b": "|i1", "B": "|u1", "h": _ORDER + "i2", "H": _ORDER + "u2",
+          "i": _ORDER + "i4", "q": _ORDER + "i8", "d": _ORDER + "f8"}
+_CARD_ID = {str(c): i for i, c in enumerate(CARDS)}
+
+SCHEMA = {
+    "hands": {"ts": "d", "hand_id": "S32", "variant": "B", "n_seats": "B", "pot_cents": "q",
+              "winners": "H", "board_start": "q", "board_len": "B"},
+    "seats": {"hand": "q", "seat": "B", "player": "H", "level": "b", "start_cents": "q", "end_cents": "q"},
+    "actions": {"hand": "q", "seat": "B", "street": "B", "type": "B", "amount_cents": "q"},
+    "showdowns": {"hand": "q", "seat": "B", "strength": "h", "hole_start": "q", "hole_len": "B"},
+}
+
+def _npy_header(descr: str, n: int) -> bytes:
+    d = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (descr, n)
+    body = d.ljust(HEADER_BYTES - 11) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(body)) + body.encode("latin1")
+
+class _Column:
+    FLUSH = 1 << 16
+
+    def __init__(self, path: str, typecode: str):
+        self.f = open(path, "wb")
+        self.f.write(b"\0" * HEADER_BYTES)
+        self.n = 0
+        if typecode.startswith("S"):
+            self.width = int(typecode[1:])
+            self.descr = f"|S{self.width}"
+            self.buf: Any = bytearray()
+        else:
+            self.width = 0
+            self.descr = _DESCR[typecode]
+            self.buf = array(typecode)
+
+    def append(self, v) -> None:
+        if self.width:
+            self.buf += v[:self.width].ljust(self.width, b"\0")
+        else:
+            self.buf.append(v)
+        self.n += 1
+        if len(self.buf) >= self.FLUSH:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self.width:
+            self.f.write(self.buf)
+            self.buf.clear()
+        else:
+            self.buf.tofile(self.f)
+            del self.buf[:]
+
+    def close(self) -> None:
+        self._flush()
+        self.f.seek(0)
+        self.f.write(_npy_header(self.descr, self.n))
+        self.f.close()
+
+class _Dict:
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+
+    def __call__(self, s: str) -> int:
+        c = self.codes.get(s)
+        if c is None:
+            c = self.codes[s] = len(self.codes)
+        return c
+
+    def values(self) -> List[str]:
+        return list(self.codes)
+
+def _cents(s: Any) -> int:
+    return int((Decimal(str(s)) * 100).to_integral_value()) if s not in ("", None) else 0
+
+def export(directory: str, out_dir: str) -> Dict[str, int]:
+    """Write the columnar tables for every hand in the log at `directory`; returns row counts."""
+    cols: Dict[str, Dict[str, _Column]] = {}
+    for table, schema in SCHEMA.items():
+        os.makedirs(os.path.join(out_dir, table), exist_ok=True)
+        cols[table] = {name: _Column(os.path.join(out_dir, table, f"{name}.npy"), tc) for name, tc in schema.items()}
+    cards = _Column(os.path.join(out_dir, "cards.npy"), "b")
+    dicts = {"variant": _Dict(), "player": _Dict(), "street": _Dict(), "type": _Dict()}
+    H, S, A, D = cols["hands"], cols["seats"], cols["actions"], cols["showdowns"]
+    row = 0
+    try:
+        for _, hand_id, ts, rec in scan(directory):
+            seats = rec["seats"]
+            levels = rec.get("levels") or [0] * len(seats)
+            H["ts"].append(ts)
+            H["hand_id"].append(hand_id.encode())
+            H["variant"].append(dicts["variant"](rec["variant"]))
+            H["n_seats"].append(len(seats))
+            H["pot_cents"].append(sum(_cents(p["amount"]) for p in rec.get("pots", [])))
+            H["winners"].append(sum(1 << w for w in rec.get("winners", [])))
+            H["board_start"].append(cards.n)
+            H["board_len"].append(len(rec.get("board", [])))
+            for c in rec.get("board", []):
+                cards.append(_CARD_ID[c])
+            for i, name in enumerate(seats):
+                S["hand"].append(row)
+                S["seat"].append(i)
+                S["player"].append(dicts["player"](name))
+                S["level"].append(levels[i])
+                S["start_cents"].append(_cents(rec["stacks_start"][i]))
+                S["end_cents"].append(_cents(rec["stacks_end"][i]))
+            for a in rec.get("actions", []):
+                if a["type"] == "SHOWDOWN":
+                    meta = a.get("meta") or {}
+                    hole = meta.get("hole", [])
+                    D["hand"].append(row)
+                    D["seat"].append(a["seat"])
+                    D["strength"].append(meta.get("strength", 0))
+                    D["hole_start"].append(cards.n)
+                    D["hole_len"].append(len(hole))
+                    for c in hole:
+                        cards.append(c)
+                    continue
+                A["hand"].append(row)
+                A["seat"].append(a["seat"])
+                A["street"].append(dicts["street"](a["street"]))
+                A["type"].append(dicts["type"](a["type"]))
+                A["amount_cents"].append(_cents(a.get("amount")))
+            row += 1
+    finally:
+        for table in cols.values():
+            for c in table.values():
+                c.close()
+        cards.close()
+    counts = {t: next(iter(c.values())).n for t, c in cols.items()}
+    counts["cards"] = cards.n
+    with open(os.path.join(out_dir, "dicts.json"), "w", encoding="utf-8") as f:
+        json.dump({k: d.values() for k, d in dicts.items()}, f, indent=2)
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"rows": counts, "schema": SCHEMA}, f, indent=2)
+    return counts
+
+def load(out_dir: str, mmap: bool = True) -> Dict[str, Any]:
+    """{"hands": {column: array}, ..., "cards": array, "dicts": {...}}, memory-mapped by default (needs numpy)."""
+    try:
+        import numpy as np
+    except ImportError as e:  # optional dependency: pip install .[fast]
+        raise ImportError("loading columnar exports needs numpy (pip install .[fast])") from e
+    mode = "r" if mmap else None
+    out: Dict[str, Any] = {t: {name: np.load(os.path.join(out_dir, t, f"{name}.npy"), mmap_mode=mode)
+                               for name in schema} for t, schema in SCHEMA.items()}
+    out["cards"] = np.load(os.path.join(out_dir, "cards.npy"), mmap_mode=mode)
+    with open(os.path.join(out_dir, "dicts.json"), encoding="utf-8") as f:
+        out["dicts"] = json.load(f)
+    return out
+
+def main():
+    args = sys.argv[1:]
+    directory = args[0] if args else "history"
+    out_dir = args[1] if len(args) > 1 else os.path.join(directory, "columnar")
+    counts = export(directory, out_dir)
+    print(f"wrote {out_dir}: " + ", ".join(f"{k}={v:,}" for k, v in counts.items()))
+
+if __name__ == "__main__":
+    main()
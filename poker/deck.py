@@ -1,13 +1,16 @@
 import random
-from .card import Card, Suit, RANKS
+from typing import Optional
+from .card import Card, CARDS
 
 class Deck:
-    def __init__(self) -> None:
-        self.cards = [Card(rank=v, suit=s) for s in Suit for v in RANKS.values()]
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        # rng: private random.Random for reproducible deals; the global module by default
+        self.rng = rng or random
+        self.cards = list(CARDS)
         self.shuffle()
 
     def shuffle(self) -> None:
-        random.shuffle(self.cards)
+        self.rng.shuffle(self.cards)
 
     def deal(self) -> Card:
         if not self.cards:
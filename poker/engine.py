@@ -1,17 +1,17 @@
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from dataclasses import dataclass
 from decimal import Decimal, ROUND_DOWN, getcontext
 from .deck import Deck
-from .card import Card, RANK_NAME
-from .hand_eval import evaluate_best, compare, STRAIGHT_FLUSH, FOUR_KIND, FULL_HOUSE, FLUSH, STRAIGHT, THREE_KIND, TWO_PAIR, ONE_PAIR, HIGH_CARD
-from .bot import decide
-from .promptctx import record_prompt_context
-from .ui import fmt_cards, console
-from .suggest import suggest_action
-from .equity import estimate_equity
+from .card import Card, RANK_NAME, from_ids
+from .hand_eval import hand_class, STRAIGHT_FLUSH, FOUR_KIND, FULL_HOUSE, FLUSH, STRAIGHT, THREE_KIND, TWO_PAIR, ONE_PAIR
+from .hand_state import Action, Event, BET, CALL, CHECK, FOLD, apply, new_hand
+from .history import new_hand_id, record_from_events
 
 getcontext().prec = 28
 
+# Odds cheat precision: stop sampling once the standard error is this small
+ODDS_TARGET_SE = 0.0125
+
 @dataclass
 class GameConfig:
     variant: str            # 'holdem' | 'plo' | 'custom'
@@ -44,8 +44,36 @@ def _hand_name(hv):
     if cat == ONE_PAIR:       return f"Pair of {RANK_NAME[tb[0]]}s"
     return f"{RANK_NAME[tb[0]]} High"
 
-def _eval_variant_for(config: GameConfig) -> str:
-    return "plo" if config.variant == "plo" else "holdem"
+def _seat_verb(name: str, you: str, other: str) -> str:
+    return f"{name} {you if name == 'You' else other}"
+
+def render_events(events: List[Event], names: List[str], print_fn=print) -> None:
+    """Console text for hand_state events; names[0] is "You"."""
+    for ev in events:
+        k = ev.kind
+        if k == "STREET":
+            street, board = ev.info
+            print_fn(f"{street} | Board: {_fmt_cards(from_ids(board))}")
+        elif k == CHECK:
+            print_fn(_seat_verb(names[ev.seat], "check.", "checks."))
+        elif k == BET:
+            print_fn(f"{_seat_verb(names[ev.seat], 'bet', 'bets')} {_fmt(ev.amount)}")
+        elif k == CALL:
+            print_fn(f"{_seat_verb(names[ev.seat], 'call', 'calls')} {_fmt(ev.amount)}")
+        elif k == FOLD:
+            print_fn(_seat_verb(names[ev.seat], "fold.", "folds."))
+        elif k == "TAKE":
+            print_fn(f"Everyone folded. {_seat_verb(names[ev.seat], 'win', 'wins')} {_fmt(ev.amount)}.")
+        elif k == "SHOWDOWN":
+            print_fn("Showdown!")
+            for i, strength in ev.info:
+                print_fn(f"  {names[i]}: {_hand_name(hand_class(strength))}")
+        elif k == "WIN":
+            winners, best = ev.info
+            if len(winners) == 1:
+                print_fn(f"{names[winners[0]]} wins {_fmt(ev.amount)} with {_hand_name(hand_class(best))}.")
+            else:
+                print_fn(f"Split pot among: {', '.join(names[w] for w in winners)}.")
 
 def play_hand_console(
     hero_stack: Decimal,
@@ -54,49 +82,44 @@ def play_hand_console(
     bot_stacks: List[Decimal],
     config: GameConfig,
     input_fn=input,
-    print_fn=print
-) -> Tuple[Decimal, List[Decimal]]:
-    """Multi-player hand, one-bet-per-street (no raises). Seats: You (0), then bots."""
-    n_bots = len(bot_names)
-    stacks = [hero_stack] + bot_stacks[:]  # copy
-    in_hand = [True] * (1 + n_bots)
-
-    deck = Deck()
-    board: List[Card] = []
-    pot = Decimal("0.00")
-
-    # Blinds: Hero SB $1, Bot0 BB $2 (if exists)
-    if n_bots >= 1:
-        sb = min(stacks[0], Decimal("1.00")); stacks[0] -= sb; pot += sb
-        bb = min(stacks[1], Decimal("2.00")); stacks[1] -= bb; pot += bb
-
-    # Deal hole cards
-    holes: List[List[Card]] = [[deck.deal() for _ in range(config.hole_cards)] for _ in range(1 + n_bots)]
+    print_fn=print,
+    deck: Optional[Deck] = None,
+    hero_level: Optional[int] = None,
+    record: bool = False
+):
+    """
+    Multi-player hand, one-bet-per-street (no raises). Seats: You (0), then bots.
+    Console front end for hand_state: prompts seat 0, asks bot.act_batch for the rest
+    and prints the resulting events.
+    deck: pre-built (e.g. seeded) deck to deal from; a fresh shuffled Deck by default.
+    hero_level: if set, seat 0 is played by the bots at that level instead of input_fn.
+    Returns (hero stack, bot stacks); with record=True, (hero stack, bot stacks,
+    None, {"record": HandRecord, "explain": its actions}) for cli_play's history.
+    """
+    # the bots and the equity cache are only imported once a hand is played
+    from .bot import act_batch
+    from .equity_cache import cached_equity
+    levels = [hero_level] + list(bot_levels)
+    names = ["You"] + list(bot_names)
+    start = [hero_stack] + list(bot_stacks)
+    state, events = new_hand(config, start, deck)
+    log = list(events)
 
     print_fn(f"=== {config.variant.upper()} — One bet per street ===")
-    print_fn(f"Players: You + {n_bots} opponents")
-    print_fn(f"Your hand: {_fmt_cards(holes[0])}")
-
-    eval_variant = _eval_variant_for(config)
-
-    def max_bet_for(player_idx: int) -> Decimal:
-        my = stacks[player_idx]
-        others = [stacks[j] for j in range(1 + n_bots) if j != player_idx and in_hand[j]]
-        return min([my] + others) if others else my
-
-    def live_opponents_for(idx: int) -> int:
-        return sum(1 for j in range(1 + n_bots) if j != idx and in_hand[j])
+    print_fn(f"Players: You + {len(bot_names)} opponents")
+    print_fn(f"Your hand: {_fmt_cards(from_ids(state.holes[0]))}")
 
     def cheat_odds():
         # Compute hero equity vs remaining live opponents
-        n_live_opp = live_opponents_for(0)
-        eq = estimate_equity(
-            holes[0],
-            board,
+        n_live_opp = state.live_opponents(0)
+        eq = cached_equity(
+            from_ids(state.holes[0]),
+            from_ids(state.board),
             trials=1500,
             n_opponents=max(1, n_live_opp),
-            eval_variant=eval_variant,
-            board_target_size=config.board_target_size
+            eval_variant=state.eval_variant,
+            board_target_size=state.board_target_size,
+            target_se=ODDS_TARGET_SE
         )
         print_fn(f"Cheat: your win odds ≈ {eq*100:.1f}% vs {n_live_opp} opponent(s).")
 
@@ -109,187 +132,41 @@ def play_hand_console(
                 continue
             return s
 
-    def street(name: str, add_cards: int) -> bool:
-        nonlocal pot
-        for _ in range(add_cards):
-            board.append(deck.deal())
-        print_fn(f"{name} | Board: {_fmt_cards(board)}")
-
-        bet_made = False
-        bet_size = Decimal("0.00")
-        bettor = -1
-        acted_before_bet = [False]*(1+n_bots)
-
-        # First pass: seat order, bet may occur here
-        for idx in range(1 + n_bots):
-            if not in_hand[idx] or stacks[idx] <= 0:
-                continue
-            if not bet_made:
-                if idx == 0:
-                    a = read_input("Action (C=check, B=bet, F=fold): ").strip().lower()
-                    if a in ("f","fold"):
-                        in_hand[0] = False
-                        print_fn("You fold.")
-                        # If only one left, end immediately
-                        if sum(1 for i in range(1+n_bots) if in_hand[i]) == 1:
-                            winner = next(i for i in range(1+n_bots) if in_hand[i])
-                            if winner == 0:
-                                print_fn(f"Everyone folded. You win {_fmt(pot)}.")
-                                stacks[0] += pot
-                            else:
-                                print_fn(f"Everyone folded. {bot_names[winner-1]} wins {_fmt(pot)}.")
-                                stacks[winner] += pot
-                            return True
-                        acted_before_bet[idx] = True
-                        continue
-                    if a in ("b","bet"):
-                        maxb = max_bet_for(0)
-                        if maxb < Decimal("0.01"):
-                            print_fn("You cannot bet (no chips behind). You check.")
-                            acted_before_bet[idx] = True
-                            continue
-                        s = read_input(f"Enter bet amount (max {_fmt(maxb)}): ").strip()
-                        amt = _to_money(s)
-                        if not (Decimal("0.01") <= amt <= maxb):
-                            print_fn("Invalid amount. Treated as check.")
-                            acted_before_bet[idx] = True
-                            continue
-                        stacks[0] -= amt; pot += amt
-                        bet_made = True; bet_size = amt; bettor = 0
-                        print_fn(f"You bet {_fmt(amt)}")
-                    else:
-                        print_fn("You check.")
-                        acted_before_bet[idx] = True
-                else:
-                    live_opp = live_opponents_for(idx)
-                    d = decide(bot_levels[idx-1], holes[idx], board if board else None, False, live_opp, eval_variant, config.board_target_size)
-                    if d == "BET":
-                        amt = min(Decimal("4.00"), max_bet_for(idx))
-                        if amt < Decimal("0.01"):
-                            print_fn(f"{bot_names[idx-1]} checks.")
-                            acted_before_bet[idx] = True
-                        else:
-                            stacks[idx] -= amt; pot += amt
-                            bet_made = True; bet_size = amt; bettor = idx
-                            print_fn(f"{bot_names[idx-1]} bets {_fmt(amt)}")
-                    else:
-                        print_fn(f"{bot_names[idx-1]} checks.")
-                        acted_before_bet[idx] = True
-            else:
-                if idx == 0:
-                    a = read_input("Action (C=call, F=fold): ").strip().lower()
-                    if a in ("c","call"):
-                        call = min(stacks[0], bet_size)
-                        stacks[0] -= call; pot += call
-                        print_fn(f"You call {_fmt(call)}")
-                    else:
-                        in_hand[0] = False
-                        print_fn("You fold.")
-                else:
-                    live_opp = live_opponents_for(idx)
-                    d = decide(bot_levels[idx-1], holes[idx], board if board else None, True, live_opp, eval_variant, config.board_target_size)
-                    if d == "CALL":
-                        call = min(stacks[idx], bet_size)
-                        stacks[idx] -= call; pot += call
-                        print_fn(f"{bot_names[idx-1]} calls {_fmt(call)}")
-                    else:
-                        in_hand[idx] = False
-                        print_fn(f"{bot_names[idx-1]} folds.")
-
-        # Second pass: players who acted before a later bet must respond
-        if bet_made:
-            for idx in range(0, bettor):
-                if not in_hand[idx] or stacks[idx] <= 0:
-                    continue
-                if acted_before_bet[idx]:
-                    if idx == 0:
-                        a = read_input("Action (C=call, F=fold): ").strip().lower()
-                        if a in ("c","call"):
-                            call = min(stacks[0], bet_size)
-                            stacks[0] -= call; pot += call
-                            print_fn(f"You call {_fmt(call)}")
-                        else:
-                            in_hand[0] = False
-                            print_fn("You fold.")
-                    else:
-                        live_opp = live_opponents_for(idx)
-                        d = decide(bot_levels[idx-1], holes[idx], board if board else None, True, live_opp, eval_variant, config.board_target_size)
-                        if d == "CALL":
-                            call = min(stacks[idx], bet_size)
-                            stacks[idx] -= call; pot += call
-                            print_fn(f"{bot_names[idx-1]} calls {_fmt(call)}")
-                        else:
-                            in_hand[idx] = False
-                            print_fn(f"{bot_names[idx-1]} folds.")
-
-        # If only one player remains, award pot
-        if sum(1 for i in range(1+n_bots) if in_hand[i]) == 1:
-            winner = next(i for i in range(1+n_bots) if in_hand[i])
-            if winner == 0:
-                print_fn(f"Everyone folded. You win {_fmt(pot)}.")
-                stacks[0] += pot
-            else:
-                print_fn(f"Everyone folded. {bot_names[winner-1]} wins {_fmt(pot)}.")
-                stacks[winner] += pot
-            return True
-        return False
-
-    # Streets per config
-    if street("Preflop", 0): return stacks[0], stacks[1:]
-    # Name rows nicely for standard 3-1-1, else generic
-    if config.row_sizes == [3,1,1]:
-        labels = ["Flop","Turn","River"]
-    else:
-        labels = [f"Row {i+1}" for i in range(len(config.row_sizes))]
-    for lab, add in zip(labels, config.row_sizes):
-        if street(lab, add): return stacks[0], stacks[1:]
-
-    # Showdown
-    results = []
-    for i in range(1+n_bots):
-        if in_hand[i]:
-            # Evaluate based on variant
-            if config.variant == "plo":
-                # use 2-from-hole + 3-from-board: re-use equity evaluator’s PLO rule
-                from itertools import combinations
-                best = None
-                for h2 in combinations(holes[i], 2):
-                    for b3 in combinations(board, 3):
-                        hv = evaluate_best(list(h2)+list(b3))
-                        if best is None or compare(hv, best) > 0:
-                            best = hv
-                hv = best
-            else:
-                hv = evaluate_best(holes[i] + board)
-            results.append((i, hv))
-
-    # Find winners
-    winners = []
-    best = None
-    for i, hv in results:
-        if best is None or compare(hv, best[1]) > 0:
-            best = (i, hv)
-            winners = [i]
-        elif compare(hv, best[1]) == 0:
-            winners.append(i)
-
-    print_fn("Showdown!")
-    for i, hv in results:
-        name = "You" if i == 0 else bot_names[i-1]
-        print_fn(f"  {name}: {_hand_name(hv)}")
-
-    share = (pot / Decimal(len(winners))).quantize(Decimal("0.01"), rounding=ROUND_DOWN)
-    remainder = pot - share*Decimal(len(winners))
-    for wid in winners:
-        stacks[wid] += share
-    stacks[winners[0]] += remainder  # cents remainder
-
-    if len(winners) == 1:
-        name = "You" if winners[0] == 0 else bot_names[winners[0]-1]
-        hvw = next(hv for i,hv in results if i==winners[0])
-        print_fn(f"{name} wins {_fmt(pot)} with {_hand_name(hvw)}.")
-    else:
-        names = ", ".join(("You" if w==0 else bot_names[w-1]) for w in winners)
-        print_fn(f"Split pot among: {names}.")
-
-    return stacks[0], stacks[1:]
+    def hero_action() -> Tuple[Action, bool]:
+        """(action, whether a message already announced it as a check)"""
+        if state.facing_bet:
+            a = read_input("Action (C=call, F=fold): ").strip().lower()
+            return (Action(CALL) if a in ("c", "call") else Action(FOLD)), False
+        a = read_input("Action (C=check, B=bet, F=fold): ").strip().lower()
+        if a in ("f", "fold"):
+            return Action(FOLD), False
+        if a in ("b", "bet"):
+            maxb = state.max_bet(0)
+            if BET not in state.legal_actions():
+                print_fn("You cannot bet (no chips behind). You check.")
+                return Action(CHECK), True
+            amt = _to_money(read_input(f"Enter bet amount (max {_fmt(maxb)}): ").strip())
+            if not (Decimal("0.01") <= amt <= maxb):
+                print_fn("Invalid amount. Treated as check.")
+                return Action(CHECK), True
+            return Action(BET, amt), False
+        return Action(CHECK), False
+
+    render_events(events, names, print_fn)
+    while not state.done:
+        seat = state.to_act
+        announced = False
+        if seat == 0 and hero_level is None:
+            action, announced = hero_action()
+        else:
+            action = act_batch([(state, levels)])[0]
+        state, events = apply(state, action)
+        log.extend(events)
+        if announced:  # no second "You check." after the explanation
+            events = [ev for ev in events if not (ev.kind == CHECK and ev.seat == 0)]
+        render_events(events, names, print_fn)
+
+    if record:
+        rec = record_from_events(new_hand_id(), config.variant, names, [0] + list(bot_levels), start, state, log)
+        return state.stacks[0], list(state.stacks[1:]), None, {"record": rec, "explain": rec.actions}
+    return state.stacks[0], list(state.stacks[1:])
@@ -1,22 +1,74 @@
-from typing import List, Optional
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
 import random
 from itertools import combinations
-from .card import Card, Suit, RANKS
-from .hand_eval import evaluate_best, compare
+from math import comb, factorial, sqrt
+from . import metrics
+from .card import Card, to_ids
+from .hand_eval import BoardEval
+from .omaha import OmahaBoard
 
-def _eval_holdem_like(hole: List[Card], board: List[Card]) -> tuple:
+BACKENDS = ("python", "numpy")
+# Enumerate instead of sampling when a spot has at most this many deals
+# (heads-up Hold'em: 990 on the river, 39,732 on the turn).
+EXACT_LIMIT = 50_000
+# Two-sided ~95% interval used by the adaptive stopping rule
+Z_95 = 1.96
+
+class EquityResult(NamedTuple):
+    equity: float
+    stderr: float   # standard error of `equity`; 0 for exact answers
+    trials: int     # deals sampled; 0 when answered from a table or by enumeration
+
+# Evaluators and the simulation loop work on card ids (see card.card_id).
+# A board scorer takes a complete board and returns a function scoring any hole
+# on it, so board-side work is done once per runout for hero and opponents.
+def _holdem_board(board: List[int]) -> Callable[[List[int]], int]:
     # Standard: best 5 out of all cards
-    return evaluate_best(hole + board)
+    return BoardEval(board).score
 
-def _eval_plo(hole: List[Card], board: List[Card]) -> tuple:
+def _plo_board(board: List[int]) -> Callable[[List[int]], int]:
     # Must use EXACTLY 2 from hole and 3 from board
-    best = None
-    for h2 in combinations(hole, 2):
-        for b3 in combinations(board, 3):
-            hv = evaluate_best(list(h2) + list(b3))  # exactly 5 cards
-            if best is None or compare(hv, best) > 0:
-                best = hv
-    return best
+    return OmahaBoard(board).score
+
+def _board_scorer(eval_variant: str):
+    return _plo_board if eval_variant == "plo" else _holdem_board
+
+def exact_deals(n_rest: int, board_left: int, n_opponents: int, hole_size: int) -> int:
+    """Number of distinct (runout, unordered opponent holes) deals from n_rest cards."""
+    n = comb(n_rest, max(0, board_left))
+    left = n_rest - max(0, board_left)
+    for _ in range(n_opponents):
+        n *= comb(left, hole_size)
+        left -= hole_size
+    return n // factorial(n_opponents)
+
+def _exact_equity(hero, board, rest, board_scorer, target, n_opponents) -> float:
+    # Opponents are interchangeable, so each unordered set of holes is visited once
+    # (holes taken in increasing combination order) with the same weight.
+    hole_size = len(hero)
+    score2 = 0  # 2 per win, 1 per tie
+    deals = 0
+    for run in combinations(rest, max(0, target - len(board))):
+        b = board + list(run)
+        score = board_scorer(b)
+        hv = score(hero)
+        left = [c for c in rest if c not in run]
+        holes = [(sum(1 << c for c in h), score(list(h))) for h in combinations(left, hole_size)]
+        stack = [(0, 0, 0, 0)]  # (next hole index, opponents placed, used-card mask, best opp value)
+        while stack:
+            start, placed, used, best = stack.pop()
+            if placed == n_opponents:
+                deals += 1
+                if hv > best:
+                    score2 += 2
+                elif hv == best:
+                    score2 += 1
+                continue
+            for j in range(start, len(holes)):
+                mask, ov = holes[j]
+                if not used & mask:
+                    stack.append((j + 1, placed + 1, used | mask, max(best, ov)))
+    return score2 / (2 * max(1, deals))
 
 def estimate_equity(
     hero: List[Card],
@@ -24,62 +76,398 @@ def estimate_equity(
     trials: int = 10000,
     n_opponents: int = 1,
     eval_variant: str = "holdem",
-    board_target_size: Optional[int] = None
+    board_target_size: Optional[int] = None,
+    backend: str = "python",
+    exact: Optional[bool] = None,
+    exact_limit: int = EXACT_LIMIT,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    preflop_table: bool = True
 ) -> float:
+    """
+    Monte Carlo equity vs n_opponents, as a float.
+    Kept returning a bare float for compatibility; estimate_equity_result
+    takes the same arguments and also returns the standard error and the
+    number of trials behind the estimate.
+    """
+    return estimate_equity_result(
+        hero, board, trials=trials, n_opponents=n_opponents, eval_variant=eval_variant,
+        board_target_size=board_target_size, backend=backend, exact=exact, exact_limit=exact_limit,
+        workers=workers, seed=seed, preflop_table=preflop_table
+    ).equity
+
+def estimate_equity_result(
+    hero: List[Card],
+    board: Optional[List[Card]],
+    trials: int = 10000,
+    n_opponents: int = 1,
+    eval_variant: str = "holdem",
+    board_target_size: Optional[int] = None,
+    backend: str = "python",
+    exact: Optional[bool] = None,
+    exact_limit: int = EXACT_LIMIT,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    preflop_table: bool = True
+) -> EquityResult:
     """
     Monte Carlo equity vs n_opponents.
     Variants:
       - 'holdem' (default) and 'custom': best 5 out of all cards
       - 'plo': exactly 2 from hole + 3 from board
-    Ties count as 0.5.
+    Backends:
+      - 'python' (default): one trial at a time, no dependencies
+      - 'numpy': batched deals and array evaluation (needs numpy); worth it
+        for long runs, see poker.equity_np
+    Exact mode enumerates every runout and opponent-hole combination instead:
+      - exact=None (default): only when there are at most exact_limit deals,
+        e.g. the turn and river heads-up
+      - exact=True: always; exact=False: never
+    workers > 1 spreads the trials over a process pool (see poker.parallel).
+    With a seed, results are reproducible for a fixed worker count.
+    With an empty Hold'em board the answer comes from the precomputed
+    169-class table in poker.preflop when available (preflop_table=False
+    forces simulation).
+    Ties count as 0.5. Sampled answers carry the standard error of the
+    per-trial score (1 / 0.5 / 0); tabled and enumerated ones have stderr 0
+    and trials 0, as in adaptive_equity_ids.
     """
-    if board is None:
-        board = []
+    return estimate_equity_result_ids(
+        to_ids(hero), to_ids(board or []), trials=trials, n_opponents=n_opponents,
+        eval_variant=eval_variant, board_target_size=board_target_size, backend=backend,
+        exact=exact, exact_limit=exact_limit, workers=workers, seed=seed,
+        preflop_table=preflop_table
+    )
+
+def estimate_equity_ids(
+    hero: Sequence[int],
+    board: Sequence[int],
+    trials: int = 10000,
+    n_opponents: int = 1,
+    eval_variant: str = "holdem",
+    board_target_size: Optional[int] = None,
+    backend: str = "python",
+    exact: Optional[bool] = None,
+    exact_limit: int = EXACT_LIMIT,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    preflop_table: bool = True
+) -> float:
+    """estimate_equity on card ids (0..51) instead of Card objects."""
+    return estimate_equity_result_ids(
+        hero, board, trials=trials, n_opponents=n_opponents, eval_variant=eval_variant,
+        board_target_size=board_target_size, backend=backend, exact=exact, exact_limit=exact_limit,
+        workers=workers, seed=seed, preflop_table=preflop_table
+    ).equity
+
+@metrics.timed("equity.estimate")
+def estimate_equity_result_ids(
+    hero: Sequence[int],
+    board: Sequence[int],
+    trials: int = 10000,
+    n_opponents: int = 1,
+    eval_variant: str = "holdem",
+    board_target_size: Optional[int] = None,
+    backend: str = "python",
+    exact: Optional[bool] = None,
+    exact_limit: int = EXACT_LIMIT,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    preflop_table: bool = True
+) -> EquityResult:
+    """estimate_equity_result on card ids (0..51) instead of Card objects."""
+    hero, board = list(hero), list(board)
+    if backend not in BACKENDS:
+        raise ValueError(f"unknown backend {backend!r}; expected one of {BACKENDS}")
+    target = 5 if board_target_size is None else board_target_size
+
+    if preflop_table and not board and eval_variant != "plo" and target == 5:
+        from .preflop import preflop_equity
+        eq = preflop_equity(hero, n_opponents)
+        if eq is not None:
+            metrics.inc("equity.preflop_table")
+            return EquityResult(eq, 0.0, 0)
+
+    if exact is not False:
+        rest = [i for i in range(52) if i not in set(hero) | set(board)]
+        if exact or exact_deals(len(rest), target - len(board), n_opponents, len(hero)) <= exact_limit:
+            metrics.inc("equity.exact")
+            return EquityResult(_exact_equity(hero, board, rest, _board_scorer(eval_variant), target, n_opponents),
+                                0.0, 0)
 
-    # Choose evaluator and target board size
-    if eval_variant == "plo":
-        eval_fn = _eval_plo
-        target = 5 if board_target_size is None else board_target_size
+    if workers > 1 or seed is not None:
+        from .parallel import parallel_counts
+        wins, ties = parallel_counts(hero, board, trials, n_opponents, eval_variant, target,
+                                     backend=backend, workers=workers, seed=seed)
     else:
-        eval_fn = _eval_holdem_like
-        target = 5 if board_target_size is None else board_target_size
+        wins, ties = sample_counts(hero, board, trials, n_opponents, eval_variant, target, backend=backend)
+    metrics.inc("equity.trials", trials)
+    n = max(1, trials)
+    eq = (wins + 0.5*ties) / n
+    var = max(0.0, (wins + 0.25*ties) / n - eq*eq)
+    return EquityResult(eq, sqrt(var / n), trials)
 
-    # Build deck minus used
-    deck_full = [Card(rank=v, suit=s) for s in Suit for v in RANKS.values()]
+def deterministic_spot(
+    hero: Sequence[int],
+    board: Sequence[int],
+    n_opponents: int,
+    eval_variant: str = "holdem",
+    board_target_size: Optional[int] = None,
+    exact_limit: int = EXACT_LIMIT
+) -> bool:
+    """True when estimate_equity (with this exact_limit) answers from the preflop table or by enumeration."""
+    target = 5 if board_target_size is None else board_target_size
+    if not board and eval_variant != "plo" and target == 5:
+        from .preflop import preflop_equity
+        if preflop_equity(hero, n_opponents) is not None:
+            return True
+    n_rest = 52 - len(set(hero) | set(board))
+    return exact_deals(n_rest, target - len(board), n_opponents, len(hero)) <= exact_limit
+
+def precise_enough(res: EquityResult, target_se: Optional[float] = None,
+                   threshold: Optional[float] = None, z: float = Z_95) -> bool:
+    """Adaptive stopping rule: SE at most target_se, or equity ± z*SE clear of threshold."""
+    if target_se is not None and res.stderr <= target_se:
+        return True
+    return threshold is not None and abs(res.equity - threshold) > z * res.stderr
+
+@metrics.timed("equity.adaptive")
+def adaptive_equity_ids(
+    hero: Sequence[int],
+    board: Sequence[int],
+    max_trials: int = 5000,
+    n_opponents: int = 1,
+    eval_variant: str = "holdem",
+    board_target_size: Optional[int] = None,
+    target_se: Optional[float] = None,
+    threshold: Optional[float] = None,
+    z: float = Z_95,
+    batch: int = 250,
+    backend: str = "python",
+    seed: Optional[int] = None
+) -> EquityResult:
+    """
+    Sample in batches until the estimate is good enough for the caller:
+      - target_se: stop once the standard error is at most this
+      - threshold: stop once equity ± z*SE no longer straddles it
+    whichever comes first, and never beyond max_trials (with neither, it
+    simply runs max_trials). Each trial scores 1 / 0.5 / 0, so the SE is the
+    sample standard deviation of those scores over sqrt(trials).
+    Spots answered from the preflop table or by enumeration return stderr 0.
+    """
+    hero, board = list(hero), list(board)
+    if deterministic_spot(hero, board, n_opponents, eval_variant, board_target_size):
+        eq = estimate_equity_ids(hero, board, n_opponents=n_opponents, eval_variant=eval_variant,
+                                 board_target_size=board_target_size)
+        return EquityResult(eq, 0.0, 0)
+    from .parallel import chunk_seed
+    target = 5 if board_target_size is None else board_target_size
+    wins = ties = n = 0
+    res = EquityResult(0.0, 0.0, 0)
+    while n < max_trials:
+        k = min(batch, max_trials - n)
+        w, t = sample_counts(hero, board, k, n_opponents, eval_variant, target, backend=backend,
+                             seed=None if seed is None else chunk_seed(seed, n))
+        wins += w; ties += t; n += k
+        eq = (wins + 0.5*ties) / n
+        var = max(0.0, (wins + 0.25*ties) / n - eq*eq)
+        res = EquityResult(eq, sqrt(var / n), n)
+        if precise_enough(res, target_se, threshold, z):
+            break
+    metrics.inc("equity.trials", n)
+    return res
+
+@metrics.timed("equity.batch")
+def batch_equity_ids(
+    heroes: Sequence[Sequence[int]],
+    board: Sequence[int],
+    n_opponents: Sequence[int],
+    max_trials: int = 5000,
+    eval_variant: str = "holdem",
+    board_target_size: Optional[int] = None,
+    target_se: Optional[float] = None,
+    thresholds: Optional[Sequence[Sequence[float]]] = None,
+    z: float = Z_95,
+    batch: int = 250,
+    seed: Optional[int] = None,
+    exact_limit: int = EXACT_LIMIT
+) -> List[EquityResult]:
+    """
+    adaptive_equity_ids for several heroes on one board, sharing the samples.
+    Each trial draws one card sequence from the deck minus the board: the
+    runout, then opponent holes in order. A hero none of whose cards are among
+    the ones it uses reuses the shared runout and the shared opponent scores;
+    otherwise its cards are dropped from the sequence and the rest move up,
+    which is still a uniform deal from that hero's side.
+    Hero i stops once within target_se or clear of every value in
+    thresholds[i] (or at max_trials); deterministic spots are answered as in
+    adaptive_equity_ids, with exact_limit deals at most enumerated.
+    """
+    board = list(board)
+    target = 5 if board_target_size is None else board_target_size
+    thresholds = thresholds or [()] * len(heroes)
+    results: List[Optional[EquityResult]] = [None] * len(heroes)
+    active = []
+    for i, hero in enumerate(heroes):
+        if deterministic_spot(hero, board, n_opponents[i], eval_variant, board_target_size, exact_limit):
+            eq = estimate_equity_ids(hero, board, n_opponents=n_opponents[i], eval_variant=eval_variant,
+                                     board_target_size=board_target_size, exact_limit=exact_limit)
+            results[i] = EquityResult(eq, 0.0, 0)
+        else:
+            active.append(i)
+    if not active:
+        return results
+
+    rng = random if seed is None else random.Random(seed)
+    max_trials = max(1, max_trials)
+    board_scorer = _board_scorer(eval_variant)
+    hole_size = len(heroes[active[0]])
+    k = max(0, target - len(board))
+    used = set(board)
+    rest = [c for c in range(52) if c not in used]
+    masks = [sum(1 << c for c in h) for h in heroes]
+    wins = [0] * len(heroes)
+    ties = [0] * len(heroes)
+    n = 0
+    while active:
+        # one spare hole's worth of cards covers a hero dropping its own cards
+        need = k + (max(n_opponents[i] for i in active) + 1) * hole_size
+        m = min(batch, max_trials - n)
+        for _ in range(m):
+            seq = rng.sample(rest, need)
+            prefix = [0]
+            for c in seq:
+                prefix.append(prefix[-1] | (1 << c))
+            score = board_scorer(board + seq[:k])
+            opp: Dict[int, int] = {}  # shared opponent chunk -> score
+            for i in active:
+                hero = heroes[i]
+                n_i = n_opponents[i]
+                if not masks[i] & prefix[k + n_i * hole_size]:
+                    hv = score(hero)
+                    best = 0
+                    for j in range(n_i):
+                        ov = opp.get(j)
+                        if ov is None:
+                            a = k + j * hole_size
+                            ov = opp[j] = score(seq[a:a + hole_size])
+                        if ov > best:
+                            best = ov
+                            if best > hv:
+                                break
+                else:
+                    own = set(hero)
+                    cards = [c for c in seq if c not in own]
+                    sc = score if not masks[i] & prefix[k] else board_scorer(board + cards[:k])
+                    hv = sc(hero)
+                    best = 0
+                    for j in range(n_i):
+                        a = k + j * hole_size
+                        ov = sc(cards[a:a + hole_size])
+                        if ov > best:
+                            best = ov
+                            if best > hv:
+                                break
+                if hv > best:
+                    wins[i] += 1
+                elif hv == best:
+                    ties[i] += 1
+        n += m
+        still = []
+        for i in active:
+            eq = (wins[i] + 0.5*ties[i]) / n
+            var = max(0.0, (wins[i] + 0.25*ties[i]) / n - eq*eq)
+            res = results[i] = EquityResult(eq, sqrt(var / n), n)
+            done = (target_se is not None and res.stderr <= target_se) or \
+                   (bool(thresholds[i]) and all(precise_enough(res, None, t, z) for t in thresholds[i]))
+            if not done and n < max_trials:
+                still.append(i)
+        metrics.inc("equity.trials", m * len(active))
+        active = still
+    return results
+
+def sample_counts(
+    hero: List[int],
+    board: List[int],
+    trials: int,
+    n_opponents: int,
+    eval_variant: str,
+    target: int,
+    backend: str = "python",
+    seed: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    Monte Carlo (wins, ties) over `trials` random deals on card ids.
+    seed=None draws from the global random module; otherwise a private RNG is used.
+    """
+    if backend == "numpy":
+        from .equity_np import sample_counts_np
+        return sample_counts_np(hero, board, trials, n_opponents, eval_variant, target, seed)
+
+    rng = random if seed is None else random.Random(seed)
+    rand = rng.random
+    hole_size = len(hero)
+    k = max(0, target - len(board))
+    opp_cards = n_opponents * hole_size
+    need = opp_cards + k
+
+    # One deck buffer for every trial. A partial Fisher-Yates shuffles only the
+    # first `need` positions (opponent holes, then the runout); starting from
+    # the previous trial's order does not bias it.
     used = set(hero) | set(board)
-    base_deck = [c for c in deck_full if c not in used]
+    buf = [i for i in range(52) if i not in used]
+    n_buf = len(buf)
+    if need > n_buf:
+        raise ValueError(f"{need} cards needed but only {n_buf} left in the deck")
+    swaps = [(i, n_buf - i) for i in range(need)]
+
+    plo = eval_variant == "plo"
+    if plo:
+        full_board = list(board) + [0] * k
+        runout = range(len(board), len(full_board))
+        pair = False
+    else:
+        # the known board is folded into `known` once; each trial rewinds `ctx`
+        # to it, adds the runout, and scores holes against that
+        known = BoardEval(board)
+        ctx = BoardEval(board)
+        pair = hole_size == 2 and 3 <= target <= 5
+        score, score2 = ctx.score, ctx.score2
+        h0, h1 = (hero[0], hero[1]) if pair else (0, 0)
+    opp_hole = [0] * hole_size
 
     wins = 0
     ties = 0
     for _ in range(trials):
-        deck = base_deck[:]
-        random.shuffle(deck)
-        idx = 0
-
-        # deal opponents
-        # assume opponents have same hole size as hero
-        opp_holes = []
-        hole_size = len(hero)
-        for _k in range(n_opponents):
-            opp_holes.append([deck[idx + i] for i in range(hole_size)])
-            idx += hole_size
-
-        # complete board
-        b = list(board)
-        while len(b) < target:
-            b.append(deck[idx]); idx += 1
-
-        hv = eval_fn(hero, b)
-        # compare vs each opponent
+        for i, span in swaps:
+            j = i + int(rand() * span)
+            buf[i], buf[j] = buf[j], buf[i]
+
+        if plo:
+            for t, slot in enumerate(runout):
+                full_board[slot] = buf[opp_cards + t]
+            score = OmahaBoard(full_board).score
+            hv = score(hero)
+        else:
+            ctx.reset(known)
+            for t in range(opp_cards, need):
+                ctx.add(buf[t])
+            hv = score2(h0, h1) if pair else score(hero)
+
+        # compare vs each opponent; a loss ends the trial
         hero_best = True
         tie_seen = False
-        for hole in opp_holes:
-            ov = eval_fn(hole, b)
-            c = compare(hv, ov)
-            if c < 0:
+        for o in range(0, opp_cards, hole_size):
+            if pair:
+                ov = score2(buf[o], buf[o + 1])
+            else:
+                for t in range(hole_size):
+                    opp_hole[t] = buf[o + t]
+                ov = score(opp_hole)
+            if hv < ov:
                 hero_best = False
                 break
-            elif c == 0:
+            elif hv == ov:
                 tie_seen = True
         if not hero_best:
             continue
@@ -88,4 +476,4 @@ def estimate_equity(
         else:
             wins += 1
 
-    return (wins + 0.5*ties) / max(1, trials)
+    return wins, ties
@@ -0,0 +1,203 @@
+"""
+Shared memo for equity lookups made during play.
+
+The same spots recur across a session (the same flop texture in another
+suit, the same preflop hand for another bot), so results are keyed on a
+suit-isomorphic canonical form of (hole, board, n_opponents, variant, target)
+and kept in a bounded LRU. A cached Monte Carlo result is only reused for a
+request asking for at most as many trials, or for an adaptive request
+(target_se / threshold) whose stopping rule it already satisfies; enumerated
+and tabled results are exact and always reused.
+
+engine.cheat_odds, cli_play.ask, suggest and bot.decide all go through
+cached_equity() and so share EQUITY_CACHE; bot.act_batch asks for many
+spots at once through cached_equity_batch().
+"""
+from collections import OrderedDict
+from itertools import permutations
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+import math
+
+from . import metrics
+from .card import Card, to_ids
+from .equity import (EXACT_LIMIT, EquityResult, Z_95, adaptive_equity_ids, batch_equity_ids, deterministic_spot,
+                     estimate_equity_result_ids, precise_enough)
+
+_SUIT_PERMS = list(permutations(range(4)))
+
+def canonical_key(
+    hole: Sequence[int],
+    board: Sequence[int],
+    n_opponents: int,
+    variant: str = "holdem",
+    target: int = 5
+) -> tuple:
+    """
+    Suit-isomorphic key on card ids: the lexicographically smallest
+    (board, hole) over all 24 suit relabelings, both as sorted tuples
+    (card order within the hole or board does not affect equity).
+    """
+    best = None
+    for p in _SUIT_PERMS:
+        b = tuple(sorted(p[c // 13]*13 + c % 13 for c in board))
+        h = tuple(sorted(p[c // 13]*13 + c % 13 for c in hole))
+        if best is None or (b, h) < best:
+            best = (b, h)
+    return (variant, target, n_opponents, best[1], best[0])
+
+class EquityCache:
+    def __init__(self, maxsize: int = 4096, reuse_ratio: float = 1.0):
+        """
+        maxsize: entries kept before the least recently used is evicted.
+        reuse_ratio: a cached result computed with T trials serves requests
+                     for up to T / reuse_ratio trials (1.0 = at least as many).
+        """
+        self.maxsize = maxsize
+        self.reuse_ratio = reuse_ratio
+        self._data: "OrderedDict[tuple, EquityResult]" = OrderedDict()  # exact entries have trials=inf
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: tuple, trials: int, target_se: Optional[float] = None,
+            threshold: Optional[float] = None, z: float = Z_95,
+            thresholds: Sequence[float] = ()) -> Optional[EquityResult]:
+        """Cached result if usable; `thresholds` requires it to be clear of each one."""
+        entry = self._data.get(key)
+        if threshold is not None:
+            thresholds = (threshold,) + tuple(thresholds)
+        if entry is None or not (entry.trials >= trials * self.reuse_ratio
+                                 or precise_enough(entry, target_se, None, z)
+                                 or (thresholds and all(precise_enough(entry, None, t, z) for t in thresholds))):
+            self.misses += 1
+            metrics.inc("cache.misses")
+            return None
+        self._data.move_to_end(key)
+        self.hits += 1
+        metrics.inc("cache.hits")
+        return entry
+
+    def put(self, key: tuple, result: EquityResult) -> None:
+        old = self._data.get(key)
+        if old is not None and old.trials > result.trials:
+            return  # keep the more precise estimate
+        self._data[key] = result
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits,
+                "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+EQUITY_CACHE = EquityCache()
+
+def _store(cache: EquityCache, key: tuple, res: EquityResult, exact: bool) -> None:
+    # exact answers are stored with trials=inf so every later request reuses them;
+    # a 0-trial estimate (trials=0 / max_trials=0) says nothing and is not stored
+    if exact:
+        cache.put(key, res._replace(trials=math.inf))
+    elif res.trials:
+        cache.put(key, res)
+
+def cached_equity_result(
+    hole: List[Card],
+    board: Optional[List[Card]],
+    trials: int,
+    n_opponents: int = 1,
+    eval_variant: str = "holdem",
+    board_target_size: Optional[int] = None,
+    target_se: Optional[float] = None,
+    threshold: Optional[float] = None,
+    cache: Optional[EquityCache] = None
+) -> EquityResult:
+    """
+    Equity through the shared LRU (or `cache`). With target_se or threshold the
+    spot is sampled adaptively (equity.adaptive_equity_ids) and `trials` is the
+    budget; otherwise it is a fixed-trial estimate_equity_result run.
+    """
+    cache = EQUITY_CACHE if cache is None else cache
+    hero, bd = to_ids(hole), to_ids(board or [])
+    target = 5 if board_target_size is None else board_target_size
+    key = canonical_key(hero, bd, n_opponents, eval_variant, target)
+    res = cache.get(key, trials, target_se, threshold)
+    if res is not None:
+        return res
+    exact = deterministic_spot(hero, bd, n_opponents, eval_variant, board_target_size)
+    if exact:
+        res = estimate_equity_result_ids(hero, bd, n_opponents=n_opponents, eval_variant=eval_variant,
+                                         board_target_size=board_target_size)
+    elif target_se is not None or threshold is not None:
+        res = adaptive_equity_ids(hero, bd, max_trials=trials, n_opponents=n_opponents,
+                                  eval_variant=eval_variant, board_target_size=board_target_size,
+                                  target_se=target_se, threshold=threshold)
+    else:
+        res = estimate_equity_result_ids(hero, bd, trials=trials, n_opponents=n_opponents,
+                                         eval_variant=eval_variant, board_target_size=board_target_size)
+    _store(cache, key, res, exact)
+    return res
+
+def cached_equity(hole: List[Card], board: Optional[List[Card]], trials: int, **kw) -> float:
+    """cached_equity_result(...).equity"""
+    return cached_equity_result(hole, board, trials, **kw).equity
+
+class EquityQuery(NamedTuple):
+    hole: List[Card]
+    board: Optional[List[Card]]
+    n_opponents: int = 1
+    eval_variant: str = "holdem"
+    board_target_size: Optional[int] = None
+    thresholds: Tuple[float, ...] = ()   # sample until clear of all of these
+
+def cached_equity_batch(
+    queries: Sequence[EquityQuery],
+    trials: int,
+    target_se: Optional[float] = None,
+    cache: Optional[EquityCache] = None,
+    seed: Optional[int] = None,
+    exact_limit: int = EXACT_LIMIT
+) -> List[EquityResult]:
+    """
+    cached_equity_result for many spots in one call. Spots that miss the
+    cache and share a board, variant and target are sampled together by
+    equity.batch_equity_ids, so the runouts and opponent holes are drawn and
+    scored once for all of them. seed and exact_limit are passed on to each
+    of those runs (seed None: the global random module).
+    """
+    cache = EQUITY_CACHE if cache is None else cache
+    out: List[Optional[EquityResult]] = [None] * len(queries)
+    keys = []
+    groups: Dict[tuple, Dict[tuple, List[int]]] = {}  # board group -> canonical key -> query indices
+    for i, q in enumerate(queries):
+        hero, bd = to_ids(q.hole), to_ids(q.board or [])
+        target = 5 if q.board_target_size is None else q.board_target_size
+        key = canonical_key(hero, bd, q.n_opponents, q.eval_variant, target)
+        keys.append(key)
+        res = cache.get(key, trials, target_se, thresholds=q.thresholds)
+        if res is not None:
+            out[i] = res
+        else:
+            groups.setdefault((tuple(bd), q.eval_variant, q.board_target_size), {}).setdefault(key, []).append(i)
+    for (bd, variant, target_size), by_key in groups.items():
+        firsts = [idx[0] for idx in by_key.values()]
+        results = batch_equity_ids(
+            [to_ids(queries[i].hole) for i in firsts], list(bd),
+            [queries[i].n_opponents for i in firsts], max_trials=trials,
+            eval_variant=variant, board_target_size=target_size, target_se=target_se,
+            thresholds=[tuple(t for j in idx for t in queries[j].thresholds) for idx in by_key.values()],
+            seed=seed, exact_limit=exact_limit
+        )
+        for (key, idx), res in zip(by_key.items(), results):
+            q = queries[idx[0]]
+            _store(cache, key, res, deterministic_spot(to_ids(q.hole), list(bd), q.n_opponents, variant, target_size,
+                                                       exact_limit))
+            for i in idx:
+                out[i] = res
+    return out
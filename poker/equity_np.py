@@ -0,0 +1,156 @@
+"""
+NumPy batch backend for equity.estimate_equity (backend="numpy").
+
+Deals a whole batch of trials at once: a row-wise partial Fisher-Yates draws
+only the cards each trial needs from the remaining deck, which are sliced into
+opponent holes and the board runout. All hands are scored with array copies of the
+evaluator tables and wins/ties are reduced with vectorized comparisons.
+
+When to choose it: the array tables are built on first use (about 0.1 s, once
+per process, as long as ~20k trials take on the python backend), so a process
+making a few small estimates is no faster with it and should keep the default
+backend="python"; counting that build, a single 20k-trial flop run measured
+~180k trials/s here against ~217k for python. Once the tables exist the batches
+pay off, most on long multi-opponent runs (AKs on a flop against 3 opponents,
+200k trials: ~700k trials/s against ~175k), so pick it for work such as
+building the preflop table or long simulations.
+"""
+from itertools import combinations
+from typing import List, NamedTuple, Optional, Tuple
+import random
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency: pip install .[fast]
+    np = None
+
+from .card import CARDS
+from .hand_eval import _tables
+
+BATCH = 4096
+
+class _NpTables(NamedTuple):
+    id_key: "np.ndarray"        # card id -> rank-count key
+    id_suit: "np.ndarray"       # card id -> suit 0..3
+    id_suit_inc: "np.ndarray"   # card id -> 1 << 4*suit (suit-count nibble)
+    id_bit: "np.ndarray"        # card id -> rank bit
+    noflush_keys: "np.ndarray"  # sorted rank-count keys
+    noflush_vals: "np.ndarray"  # strength per key
+    flush: "np.ndarray"         # rank mask -> strength
+
+_NP_TABLES: Optional[_NpTables] = None
+
+def _require_numpy():
+    if np is None:
+        raise ImportError("backend='numpy' needs numpy (pip install .[fast])")
+
+def _np_tables() -> _NpTables:
+    global _NP_TABLES
+    if _NP_TABLES is None:
+        from .eval_tables import RANK_KEY
+        t = _tables()
+        keys = sorted(t.noflush)
+        _NP_TABLES = _NpTables(
+            id_key=np.array([RANK_KEY[c.rank] for c in CARDS], dtype=np.int64),
+            id_suit=np.array([c.suit.value - 1 for c in CARDS], dtype=np.int8),
+            id_suit_inc=np.array([1 << 4*(c.suit.value - 1) for c in CARDS], dtype=np.int64),
+            id_bit=np.array([1 << (c.rank - 2) for c in CARDS], dtype=np.int64),
+            noflush_keys=np.array(keys, dtype=np.int64),
+            noflush_vals=np.array([t.noflush[k] for k in keys], dtype=np.int32),
+            flush=np.array(t.flush, dtype=np.int32),
+        )
+    return _NP_TABLES
+
+def evaluate_batch(cards: "np.ndarray") -> "np.ndarray":
+    """Vectorized evaluate_ids: (rows, 5..7) card ids -> (rows,) strengths."""
+    _require_numpy()
+    T = _np_tables()
+    return _score(T, T.id_key[cards].sum(axis=1), T.id_suit_inc[cards].sum(axis=1), cards.__getitem__)
+
+def _score(T: _NpTables, key, suits, hands) -> "np.ndarray":
+    # hands(rows) -> card ids of those rows; only called for rows holding a flush
+    out = T.noflush_vals[np.searchsorted(T.noflush_keys, key)]
+    # same biased suit nibbles as hand_eval.evaluate_ids: bit 3 set <=> 5+ cards
+    flushed = (suits + 0x3333) & 0x8888
+    rows = np.nonzero(flushed)[0]
+    if rows.size:
+        # at most 7 cards: a flush beats anything the rank table can hold
+        fsuit = (np.log2(flushed[rows]).astype(np.int8) - 3) >> 2
+        sub = hands(rows)
+        mask = (T.id_bit[sub] * (T.id_suit[sub] == fsuit[:, None])).sum(axis=1)
+        out[rows] = T.flush[mask]
+    return out
+
+class _HoldemBoard:
+    # The board's key and suit sums are shared by every hole scored against it.
+    def __init__(self, board: "np.ndarray"):
+        self.T = T = _np_tables()
+        self.board = board
+        self.key = T.id_key[board].sum(axis=1)
+        self.suits = T.id_suit_inc[board].sum(axis=1)
+
+    def __call__(self, hole: "np.ndarray") -> "np.ndarray":
+        T = self.T
+        key = self.key + T.id_key[hole].sum(axis=1)
+        suits = self.suits + T.id_suit_inc[hole].sum(axis=1)
+        return _score(T, key, suits, lambda rows: np.concatenate([hole[rows], self.board[rows]], axis=1))
+
+class _PloBoard:
+    # Exactly 2 from hole + 3 from board: max over every pair/triple.
+    def __init__(self, board: "np.ndarray"):
+        self.board = board
+
+    def __call__(self, hole: "np.ndarray") -> "np.ndarray":
+        best = None
+        for h2 in combinations(range(hole.shape[1]), 2):
+            for b3 in combinations(range(self.board.shape[1]), 3):
+                hv = evaluate_batch(np.concatenate([hole[:, h2], self.board[:, b3]], axis=1))
+                best = hv if best is None else np.maximum(best, hv)
+        return best
+
+def _deal(rest: "np.ndarray", rows: int, need: int, rng) -> "np.ndarray":
+    """Partial Fisher-Yates on every row at once: (rows, need) distinct cards from rest."""
+    deck = np.broadcast_to(rest, (rows, rest.size)).copy()
+    r = np.arange(rows)
+    for j in range(need):
+        k = j + (rng.random(rows) * (rest.size - j)).astype(np.intp)
+        pick = deck[r, k]
+        deck[r, k] = deck[:, j]
+        deck[:, j] = pick
+    return deck[:, :need]
+
+def sample_counts_np(
+    hero: List[int],
+    board: List[int],
+    trials: int,
+    n_opponents: int,
+    eval_variant: str,
+    target: int,
+    seed: Optional[int] = None,
+) -> Tuple[int, int]:
+    """Batched Monte Carlo (wins, ties) on card ids; same model as equity.sample_counts."""
+    _require_numpy()
+    rng = np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+    board_ctx = _PloBoard if eval_variant == "plo" else _HoldemBoard
+    used = set(hero) | set(board)
+    rest = np.array([i for i in range(52) if i not in used], dtype=np.int64)
+    hole_size = len(hero)
+    n_opp_cards = n_opponents * hole_size
+    need = n_opp_cards + max(0, target - len(board))
+
+    wins = ties = 0
+    done = 0
+    while done < trials:
+        b = min(BATCH, trials - done)
+        dealt = _deal(rest, b, need, rng)
+        full_board = np.concatenate([np.broadcast_to(np.array(board, dtype=np.int64), (b, len(board))),
+                                     dealt[:, n_opp_cards:]], axis=1)
+        score = board_ctx(full_board)
+        hv = score(np.broadcast_to(np.array(hero, dtype=np.int64), (b, hole_size)))
+        best_opp = np.zeros(b, dtype=hv.dtype)
+        for k in range(n_opponents):
+            best_opp = np.maximum(best_opp, score(dealt[:, k*hole_size:(k+1)*hole_size]))
+        wins += int((hv > best_opp).sum())
+        ties += int((hv == best_opp).sum())
+        done += b
+    return wins, ties
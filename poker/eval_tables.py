@@ -0,0 +1,181 @@
+"""
+Lookup tables for the single-pass evaluator in hand_eval.
+
+Every 5..7 card hand is scored as one integer strength in 1..7462 (higher is
+better), one value per distinct 5-card hand class. Two tables cover all hands:
+
+  * flush:   13-bit rank mask of the flush suit -> best strength
+  * noflush: rank-count key (one base-5 digit per rank) -> best strength
+
+Building walks every rank multiset once (a few seconds in pure Python), so the
+result is cached in a versioned, checksummed binary file that later processes
+memory-map instead of rebuilding. The file is only rewritten when it is
+missing, from an older TABLE_VERSION, or fails its checksum; worker processes
+mapping it share the same read-only pages.
+"""
+from array import array
+from itertools import combinations_with_replacement
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+import mmap, os, struct, zlib
+
+from .card import Card, Suit
+
+TABLE_VERSION = 2
+
+# key contribution of one card of each rank (index = rank 2..14)
+RANK_KEY = [0, 0] + [5 ** (r - 2) for r in range(2, 15)]
+# tiebreak length per category (STRAIGHT_FLUSH .. HIGH_CARD), used to unpack classes
+_TB_LEN = {8: 1, 7: 2, 6: 2, 5: 5, 4: 1, 3: 3, 2: 3, 1: 4, 0: 5}
+
+class Tables(NamedTuple):
+    noflush: Dict[int, int]           # rank-count key -> strength
+    flush: Sequence[int]              # rank mask -> strength (0 = no flush)
+    classes: Sequence[Tuple[int, List[int]]]  # strength -> (category, tiebreaks)
+
+def cache_dir() -> str:
+    return os.environ.get("POKERLAB_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "pokerlab")
+
+def cache_path() -> str:
+    return os.path.join(cache_dir(), f"eval_tables_v{TABLE_VERSION}.bin")
+
+# ---------- building ----------
+def _class_of(ranks, suited: bool):
+    from .hand_eval import _evaluate5
+    suits = [Suit.HEARTS]*5 if suited else [Suit.CLUBS, Suit.DIAMONDS, Suit.HEARTS, Suit.SPADES, Suit.CLUBS]
+    cat, tb = _evaluate5([Card(r, s) for r, s in zip(ranks, suits)])
+    return cat, tuple(tb)
+
+def _rank_multisets(n: int):
+    for ranks in combinations_with_replacement(range(2, 15), n):
+        if all(ranks.count(r) <= 4 for r in set(ranks)):
+            yield ranks
+
+def build_tables() -> Tables:
+    """Enumerate every hand class and fill both tables from scratch."""
+    flush_cls: Dict[Tuple[int, ...], tuple] = {}
+    noflush_cls: Dict[Tuple[int, ...], tuple] = {}
+    for ranks in _rank_multisets(5):
+        noflush_cls[ranks] = _class_of(ranks, suited=False)
+        if len(set(ranks)) == 5:
+            flush_cls[ranks] = _class_of(ranks, suited=True)
+    ordered = sorted(set(flush_cls.values()) | set(noflush_cls.values()))
+    strength = {c: i + 1 for i, c in enumerate(ordered)}
+
+    noflush: Dict[int, int] = {}
+    for ranks, c in noflush_cls.items():
+        noflush[sum(RANK_KEY[r] for r in ranks)] = strength[c]
+    # 6 and 7 cards: best over dropping one card of each distinct rank
+    for n in (6, 7):
+        for ranks in _rank_multisets(n):
+            key = sum(RANK_KEY[r] for r in ranks)
+            noflush[key] = max(noflush[key - RANK_KEY[r]] for r in set(ranks))
+
+    flush = array("H", [0]) * 8192
+    for ranks, c in flush_cls.items():
+        flush[sum(1 << (r - 2) for r in ranks)] = strength[c]
+    for n in (6, 7):
+        for mask in range(8192):
+            if bin(mask).count("1") == n:
+                flush[mask] = max(flush[mask & ~(1 << b)] for b in range(13) if mask >> b & 1)
+
+    classes = [(-1, [])] + [(cat, list(tb)) for cat, tb in ordered]
+    return Tables(noflush, flush, classes)
+
+# ---------- disk cache ----------
+# File layout (native byte order; the cache is per machine):
+#   header  magic, version, n_keys, n_flush, n_classes, crc32 of everything after the header
+#   keys    uint32 x n_keys     sorted noflush keys
+#   classes uint32 x n_classes  packed (category, tiebreaks) for strength 1..n_classes
+#   vals    uint16 x n_keys     strength per key
+#   flush   uint16 x n_flush
+# The 32-bit sections come first so every section is aligned for memoryview.cast.
+MAGIC = b"PKEV"
+_HEADER = struct.Struct("=4s5I")
+
+def _pack_class(cat: int, tb: List[int]) -> int:
+    v = cat
+    for i in range(5):
+        v = v << 4 | (tb[i] if i < len(tb) else 0)
+    return v
+
+def _unpack_class(v: int) -> Tuple[int, List[int]]:
+    cat = v >> 20
+    nibbles = [(v >> (16 - 4*i)) & 0xF for i in range(5)]
+    return cat, nibbles[:_TB_LEN[cat]]
+
+class _Classes:
+    """classes over the packed section of a mapped file; entries are unpacked on access."""
+    __slots__ = ("_packed",)
+
+    def __init__(self, packed: memoryview):
+        self._packed = packed
+
+    def __len__(self) -> int:
+        return len(self._packed) + 1
+
+    def __getitem__(self, value):
+        if isinstance(value, slice):
+            return [self[i] for i in range(*value.indices(len(self)))]
+        if value == 0:
+            return (-1, [])
+        if value < 0:
+            value += len(self)
+        return _unpack_class(self._packed[value - 1])
+
+def save_tables(t: Tables, path: str) -> None:
+    keys = array("I", sorted(t.noflush))
+    vals = array("H", (t.noflush[k] for k in keys))
+    classes = array("I", (_pack_class(*t.classes[v]) for v in range(1, len(t.classes))))
+    flush = array("H", t.flush)
+    payload = b"".join(arr.tobytes() for arr in (keys, classes, vals, flush))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, TABLE_VERSION, len(keys), len(flush), len(classes), zlib.crc32(payload)))
+        f.write(payload)
+    os.replace(tmp, path)
+
+def read_tables(path: str) -> Tables:
+    """
+    Map a saved file read-only. flush and classes are views of the mapping, so
+    every process reading the same file shares its pages; noflush is a dict
+    (the evaluator's hot lookup) built from the mapped keys and values.
+    Raises ValueError if the file is truncated, stale or fails its checksum.
+    """
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mm) < _HEADER.size:
+        raise ValueError(f"{path}: truncated header")
+    magic, version, n_keys, n_flush, n_classes, crc = _HEADER.unpack_from(mm)
+    if magic != MAGIC or version != TABLE_VERSION:
+        raise ValueError(f"{path}: not a v{TABLE_VERSION} table file")
+    if len(mm) != _HEADER.size + 6 * n_keys + 4 * n_classes + 2 * n_flush:
+        raise ValueError(f"{path}: size does not match header")
+    body = memoryview(mm)[_HEADER.size:]
+    if zlib.crc32(body) != crc:
+        raise ValueError(f"{path}: checksum mismatch")
+    sections, at = [], 0
+    for fmt, n in (("I", n_keys), ("I", n_classes), ("H", n_keys), ("H", n_flush)):
+        size = n * struct.calcsize(fmt)
+        sections.append(body[at:at + size].cast(fmt))
+        at += size
+    keys, classes, vals, flush = sections
+    return Tables(dict(zip(keys, vals)), flush, _Classes(classes))
+
+def load_tables() -> Tables:
+    """
+    Map the cached tables, rebuilding them first if the file is missing,
+    from another version, or corrupt. The rebuilt file is written to a temp
+    name and renamed into place, so concurrent workers never see half a file.
+    """
+    path = cache_path()
+    try:
+        return read_tables(path)
+    except (OSError, ValueError):
+        pass
+    t = build_tables()
+    try:
+        save_tables(t, path)
+        return read_tables(path)
+    except (OSError, ValueError):
+        return t  # read-only home: keep the in-memory copy
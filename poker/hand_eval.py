@@ -1,5 +1,6 @@
-from typing import List, Tuple
-from .card import Card
+from typing import List, Sequence, Tuple
+from .card import Card, CARDS, card_id
+from .eval_tables import RANK_KEY
 
 STRAIGHT_FLUSH = 8
 FOUR_KIND = 7
@@ -94,7 +95,132 @@ def _evaluate5(cards: List[Card]) -> Tuple[int, List[int]]:
     ranks_desc = [v for v in range(14, 1, -1) if cnt[v] > 0]
     return (HIGH_CARD, ranks_desc)
 
+_TABLES = None
+
+def _tables():
+    global _TABLES
+    if _TABLES is None:
+        from .eval_tables import load_tables
+        _TABLES = load_tables()
+    return _TABLES
+
+# per-card-id tables so the inner loop does no attribute or enum lookups
+_ID_KEY = [RANK_KEY[c.rank] for c in CARDS]
+_ID_SUIT = [c.suit.value - 1 for c in CARDS]
+_ID_SUIT_INC = [1 << 4*s for s in _ID_SUIT]
+_ID_BIT = [1 << (c.rank - 2) for c in CARDS]
+
+def evaluate_ids(ids: Sequence[int]) -> int:
+    """
+    Score 5..7 card ids (see card.card_id) in one pass with the precomputed tables.
+    Returns a strength in 1..7462: higher is better, equal values tie.
+    """
+    n = len(ids)
+    if n < 5 or n > 7:
+        raise ValueError("need 5..7 cards")
+    t = _TABLES or _tables()
+    key = 0
+    suits = 0x3333  # one nibble per suit, biased so a count of 5+ sets bit 3
+    for i in ids:
+        key += _ID_KEY[i]
+        suits += _ID_SUIT_INC[i]
+    flushed = suits & 0x8888
+    if flushed:
+        # with at most 7 cards a flush rules out quads and full houses
+        s = (flushed.bit_length() - 4) >> 2
+        mask = 0
+        for i in ids:
+            if _ID_SUIT[i] == s:
+                mask |= _ID_BIT[i]
+        return t.flush[mask]
+    return t.noflush[key]
+
+class BoardEval:
+    """
+    A board scored once so that any number of holes score against it
+    incrementally: the board's rank-count key, per-suit counts and per-suit
+    rank masks are kept, and a hole only adds its own cards. A flush is only
+    looked for when the board already has three of a suit. score(hole) equals
+    evaluate_ids(hole + board).
+
+    add() and reset() grow or rewind the board in place, so a sampler can
+    keep one BoardEval for the known cards and one it refills every runout.
+    """
+    __slots__ = ("key", "counts", "masks", "n", "fsuit", "_noflush", "_flush")
+
+    def __init__(self, board: Sequence[int] = ()):
+        t = _TABLES or _tables()
+        self._noflush, self._flush = t.noflush, t.flush
+        self.key = 0
+        self.counts = [0, 0, 0, 0]
+        self.masks = [0, 0, 0, 0]
+        self.n = 0
+        self.fsuit = -1  # the suit with 3+ board cards, if any
+        for c in board:
+            self.add(c)
+
+    def add(self, c: int) -> None:
+        s = _ID_SUIT[c]
+        self.key += _ID_KEY[c]
+        self.counts[s] += 1
+        self.masks[s] |= _ID_BIT[c]
+        self.n += 1
+        if self.counts[s] >= 3:
+            self.fsuit = s
+
+    def reset(self, base: "BoardEval") -> None:
+        """Make this board a copy of `base` (typically the known cards before a runout)."""
+        self.key, self.n, self.fsuit = base.key, base.n, base.fsuit
+        self.counts[:] = base.counts
+        self.masks[:] = base.masks
+
+    def score2(self, a: int, b: int) -> int:
+        """Strength of the two-card hole (a, b); the board must have 3..5 cards."""
+        s = self.fsuit
+        if s >= 0:
+            sa, sb = _ID_SUIT[a] == s, _ID_SUIT[b] == s
+            if self.counts[s] + sa + sb >= 5:
+                m = self.masks[s]
+                if sa:
+                    m |= _ID_BIT[a]
+                if sb:
+                    m |= _ID_BIT[b]
+                return self._flush[m]
+        return self._noflush[self.key + _ID_KEY[a] + _ID_KEY[b]]
+
+    def score(self, hole: Sequence[int]) -> int:
+        """Strength of `hole` on this board (5..7 cards in all)."""
+        if len(hole) == 2 and 3 <= self.n <= 5:
+            return self.score2(hole[0], hole[1])
+        if not 5 <= self.n + len(hole) <= 7:
+            raise ValueError("need 5..7 cards")
+        key = self.key
+        counts = list(self.counts)
+        masks = list(self.masks)
+        for c in hole:
+            s = _ID_SUIT[c]
+            key += _ID_KEY[c]
+            counts[s] += 1
+            masks[s] |= _ID_BIT[c]
+        for s in range(4):
+            if counts[s] >= 5:
+                return self._flush[masks[s]]
+        return self._noflush[key]
+
+def evaluate(cards: List[Card]) -> int:
+    """Card-object front end for evaluate_ids."""
+    return evaluate_ids([card_id(c) for c in cards])
+
+def hand_class(value: int) -> Tuple[int, List[int]]:
+    """(category, tiebreak ranks) for a strength returned by evaluate()."""
+    cat, tb = _tables().classes[value]
+    return cat, list(tb)
+
 def evaluate_best(cards: List[Card]) -> Tuple[int, List[int]]:
+    return hand_class(evaluate(cards))
+
+def _evaluate_best_subsets(cards: List[Card]) -> Tuple[int, List[int]]:
+    # Reference path: best of every 5-card subset. Used to build/check the tables.
     n = len(cards)
     if n < 5 or n > 7:
         raise ValueError("need 5..7 cards")
@@ -0,0 +1,256 @@
+"""
+Pure hand engine: a HandState value and apply(state, action) -> (state, events).
+
+Rules are the console game's: seat 0 posts $1 and seat 1 posts $2, one bet
+per street (no raises), the bet is capped by the shortest live stack, and
+players who checked before a bet answer it after the players behind the
+bettor. Nothing here reads input or prints. States are frozen dataclasses of
+tuples, so keeping one around as a checkpoint is free; to_dict/from_dict turn
+a state into plain JSON types and back so a hand can be stored and resumed.
+
+Cards are ids (card.card_id). The undealt deck is part of the state, in
+deal order, so a state replays identically wherever it is resumed.
+"""
+from dataclasses import dataclass, replace
+from decimal import Decimal, ROUND_DOWN
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from . import metrics
+from .card import card_id
+from .deck import Deck
+from .hand_eval import BoardEval
+from .omaha import OmahaBoard
+
+CHECK, BET, CALL, FOLD = "CHECK", "BET", "CALL", "FOLD"
+
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+SMALL_BLIND = Decimal("1.00")
+BIG_BLIND = Decimal("2.00")
+
+class Action(NamedTuple):
+    kind: str                # CHECK | BET | CALL | FOLD
+    amount: Decimal = ZERO   # BET only; a call is always min(stack, bet)
+
+class Event(NamedTuple):
+    kind: str                # STREET | CHECK | BET | CALL | FOLD | TAKE | SHOWDOWN | WIN
+    seat: int = -1
+    amount: Decimal = ZERO
+    info: Any = None         # STREET: (name, board); SHOWDOWN: ((seat, strength), ...);
+                             # WIN: (winner seats, best strength)
+
+@dataclass(frozen=True)
+class HandState:
+    variant: str                      # 'holdem' | 'plo' | 'custom'
+    street_names: Tuple[str, ...]     # "Preflop", then one per board row
+    row_sizes: Tuple[int, ...]
+    holes: Tuple[Tuple[int, ...], ...]
+    board: Tuple[int, ...]
+    deck: Tuple[int, ...]             # undealt card ids, next card first
+    stacks: Tuple[Decimal, ...]
+    in_hand: Tuple[bool, ...]
+    pot: Decimal
+    street: int = 0
+    bet: Decimal = ZERO               # amount to call on this street, 0 before a bet
+    bettor: int = -1
+    queue: Tuple[int, ...] = ()       # seats still to act this street; queue[0] is on the move
+    done: bool = False
+
+    @property
+    def n_seats(self) -> int:
+        return len(self.stacks)
+
+    @property
+    def to_act(self) -> Optional[int]:
+        return None if self.done else self.queue[0]
+
+    @property
+    def facing_bet(self) -> bool:
+        return self.bet > 0
+
+    @property
+    def board_target_size(self) -> int:
+        return sum(self.row_sizes)
+
+    @property
+    def eval_variant(self) -> str:
+        return "plo" if self.variant == "plo" else "holdem"
+
+    def live_opponents(self, seat: int) -> int:
+        return sum(1 for j, live in enumerate(self.in_hand) if live and j != seat)
+
+    def max_bet(self, seat: int) -> Decimal:
+        """Largest bet `seat` may make: its stack, capped by every live opponent's stack."""
+        others = [s for j, s in enumerate(self.stacks) if j != seat and self.in_hand[j]]
+        return min([self.stacks[seat]] + others)
+
+    def legal_actions(self) -> Tuple[str, ...]:
+        if self.done:
+            return ()
+        if self.facing_bet:
+            return (CALL, FOLD)
+        if self.max_bet(self.queue[0]) >= CENT:
+            return (CHECK, BET, FOLD)
+        return (CHECK, FOLD)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "variant": self.variant,
+            "street_names": list(self.street_names),
+            "row_sizes": list(self.row_sizes),
+            "holes": [list(h) for h in self.holes],
+            "board": list(self.board),
+            "deck": list(self.deck),
+            "stacks": [str(s) for s in self.stacks],
+            "in_hand": list(self.in_hand),
+            "pot": str(self.pot),
+            "street": self.street,
+            "bet": str(self.bet),
+            "bettor": self.bettor,
+            "queue": list(self.queue),
+            "done": self.done,
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "HandState":
+        return cls(
+            variant=d["variant"],
+            street_names=tuple(d["street_names"]),
+            row_sizes=tuple(d["row_sizes"]),
+            holes=tuple(tuple(h) for h in d["holes"]),
+            board=tuple(d["board"]),
+            deck=tuple(d["deck"]),
+            stacks=tuple(Decimal(s) for s in d["stacks"]),
+            in_hand=tuple(d["in_hand"]),
+            pot=Decimal(d["pot"]),
+            street=d["street"],
+            bet=Decimal(d["bet"]),
+            bettor=d["bettor"],
+            queue=tuple(d["queue"]),
+            done=d["done"],
+        )
+
+def street_names_for(row_sizes: Sequence[int]) -> Tuple[str, ...]:
+    if list(row_sizes) == [3, 1, 1]:
+        return ("Preflop", "Flop", "Turn", "River")
+    return ("Preflop",) + tuple(f"Row {i+1}" for i in range(len(row_sizes)))
+
+def new_hand(config, stacks: Sequence[Decimal], deck: Optional[Deck] = None) -> Tuple[HandState, List[Event]]:
+    """
+    Post blinds, deal hole cards and open the preflop street.
+    config is an engine.GameConfig; deck a shuffled Deck (a fresh one by default).
+    """
+    if deck is None:
+        deck = Deck()
+    order = [card_id(c) for c in reversed(deck.cards)]  # Deck.deal pops from the end
+    n = len(stacks)
+    st = list(stacks)
+    pot = ZERO
+    if n >= 2:
+        sb = min(st[0], SMALL_BLIND); st[0] -= sb; pot += sb
+        bb = min(st[1], BIG_BLIND); st[1] -= bb; pot += bb
+    k = config.hole_cards
+    holes = tuple(tuple(order[i*k:(i+1)*k]) for i in range(n))
+    state = HandState(
+        variant=config.variant,
+        street_names=street_names_for(config.row_sizes),
+        row_sizes=tuple(config.row_sizes),
+        holes=holes,
+        board=(),
+        deck=tuple(order[n*k:]),
+        stacks=tuple(st),
+        in_hand=(True,) * n,
+        pot=pot,
+        street=-1,
+    )
+    events: List[Event] = []
+    return _next_street(state, events), events
+
+@metrics.timed("engine.apply")
+def apply(state: HandState, action: Action) -> Tuple[HandState, List[Event]]:
+    """Play `action` for state.to_act. Returns the new state and what happened, in order."""
+    kind = action.kind
+    if kind not in state.legal_actions():
+        raise ValueError(f"illegal action {kind} (legal: {', '.join(state.legal_actions()) or 'none'})")
+    seat = state.queue[0]
+    events: List[Event] = []
+    stacks = list(state.stacks)
+    rest = state.queue[1:]
+
+    if kind == CHECK:
+        events.append(Event(CHECK, seat))
+        state = replace(state, queue=rest)
+    elif kind == BET:
+        amt = Decimal(action.amount).quantize(CENT, rounding=ROUND_DOWN)
+        if not (CENT <= amt <= state.max_bet(seat)):
+            raise ValueError(f"bet {amt} outside 0.01..{state.max_bet(seat)}")
+        stacks[seat] -= amt
+        events.append(Event(BET, seat, amt))
+        # everyone behind the bettor, then those who checked in front of it
+        n = state.n_seats
+        queue = tuple(range(seat + 1, n)) + tuple(range(seat))
+        state = replace(state, stacks=tuple(stacks), pot=state.pot + amt, bet=amt, bettor=seat, queue=queue)
+    elif kind == CALL:
+        call = min(stacks[seat], state.bet)
+        stacks[seat] -= call
+        events.append(Event(CALL, seat, call))
+        state = replace(state, stacks=tuple(stacks), pot=state.pot + call, queue=rest)
+    else:
+        in_hand = list(state.in_hand)
+        in_hand[seat] = False
+        events.append(Event(FOLD, seat))
+        state = replace(state, in_hand=tuple(in_hand), queue=rest)
+        if sum(in_hand) == 1:
+            winner = in_hand.index(True)
+            stacks[winner] += state.pot
+            events.append(Event("TAKE", winner, state.pot))
+            return replace(state, stacks=tuple(stacks), pot=ZERO, queue=(), done=True), events
+    return _advance(state, events), events
+
+def _can_act(state: HandState, seat: int) -> bool:
+    return state.in_hand[seat] and state.stacks[seat] > 0
+
+def _advance(state: HandState, events: List[Event]) -> HandState:
+    # skip folded and all-in seats; an empty queue closes the street
+    queue = state.queue
+    while queue and not _can_act(state, queue[0]):
+        queue = queue[1:]
+    if queue:
+        return state if queue is state.queue else replace(state, queue=queue)
+    return _next_street(replace(state, queue=()), events)
+
+def _next_street(state: HandState, events: List[Event]) -> HandState:
+    street = state.street + 1
+    if street >= len(state.street_names):
+        return _showdown(state, events)
+    take = state.row_sizes[street - 1] if street > 0 else 0
+    board = state.board + state.deck[:take]
+    state = replace(state, street=street, board=board, deck=state.deck[take:],
+                    bet=ZERO, bettor=-1, queue=tuple(range(state.n_seats)))
+    events.append(Event("STREET", info=(state.street_names[street], board)))
+    metrics.inc("engine.street." + state.street_names[street].lower())
+    return _advance(state, events)
+
+def _showdown(state: HandState, events: List[Event]) -> HandState:
+    live = [i for i in range(state.n_seats) if state.in_hand[i]]
+    with metrics.timer("engine.showdown_eval"):
+        if state.variant == "plo":
+            # 2-from-hole + 3-from-board, same Omaha evaluator as equity
+            omaha_board = OmahaBoard(state.board)
+            scores = [(i, omaha_board.score(state.holes[i])) for i in live]
+        else:
+            # board context built once; each player adds only their hole cards
+            board = BoardEval(state.board)
+            scores = [(i, board.score(state.holes[i])) for i in live]
+    best = max(s for _, s in scores)
+    winners = tuple(i for i, s in scores if s == best)
+
+    pot = state.pot
+    share = (pot / Decimal(len(winners))).quantize(CENT, rounding=ROUND_DOWN)
+    stacks = list(state.stacks)
+    for w in winners:
+        stacks[w] += share
+    stacks[winners[0]] += pot - share * len(winners)  # cents remainder
+    events.append(Event("SHOWDOWN", info=tuple(scores)))
+    events.append(Event("WIN", winners[0], pot, (winners, best)))
+    return replace(state, stacks=tuple(stacks), pot=ZERO, queue=(), done=True)
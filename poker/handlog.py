@@ -0,0 +1,378 @@
+"""
+Append-only hand-history log: length-prefixed records in rotating segment
+files, with a sidecar index for lookup by hand_id and by time.
+
+    history/
+      hands-000001.log   MAGIC, then records back to back
+      hands-000002.log   started once the previous one reached segment_bytes
+      hands.idx          one fixed-size entry per record, in append order
+
+A record is a header (payload length, CRC-32, flags, timestamp, hand_id
+length), the hand_id and the payload: compact JSON, zlib-compressed when
+that is smaller and compression is on. Records carry their own hand_id and
+timestamp, so the index can always be rebuilt from the segments (reindex);
+on open, records written after the last index entry are indexed and a torn
+tail left by a crash is cut off. Reading one hand is a dict lookup and a
+single seek.
+
+HandLog(dir, readonly=True) is for readers next to a live writer (replay,
+ls): it never creates the directory, truncates or writes the index. A torn
+tail is skipped rather than repaired, since it may be a record the writer
+is still appending, and unindexed records are only indexed in memory.
+
+    python -m poker.handlog ls [dir]
+    python -m poker.handlog export [dir] [out_dir]      one indented JSON file per hand
+    python -m poker.handlog csv [dir] [out.csv]         one summary row per hand
+    python -m poker.handlog reindex [dir]
+"""
+from bisect import bisect_left, bisect_right
+from decimal import Decimal
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+import csv, json, os, struct, sys, time, zlib
+
+MAGIC = b"PLHLOG\x00\x01"             # last byte: format version
+_REC = struct.Struct("<IIBdH")        # payload length, crc32(hand_id + payload), flags, timestamp, hand_id length
+_IDX = struct.Struct("<dIQI32s")      # timestamp, segment, offset, record length, hand_id
+FLAG_ZLIB = 1
+SEGMENT_BYTES = 64 << 20
+INDEX_NAME = "hands.idx"
+
+def _segment_name(n: int) -> str:
+    return f"hands-{n:06d}.log"
+
+class CorruptRecord(ValueError):
+    pass
+
+def _read_record(f: BinaryIO) -> Optional[Tuple[str, float, bytes, int]]:
+    """(hand_id, timestamp, payload json bytes, record length) at f's position; None at a clean EOF."""
+    head = f.read(_REC.size)
+    if not head:
+        return None
+    if len(head) < _REC.size:
+        raise CorruptRecord("truncated header")
+    size, crc, flags, ts, id_len = _REC.unpack(head)
+    body = f.read(id_len + size)
+    if len(body) < id_len + size:
+        raise CorruptRecord("truncated record")
+    if zlib.crc32(body) != crc:
+        raise CorruptRecord("checksum mismatch")
+    payload = body[id_len:]
+    if flags & FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return body[:id_len].decode(), ts, payload, _REC.size + id_len + size
+
+class HandLog:
+    def __init__(self, directory: str = "history", segment_bytes: int = SEGMENT_BYTES, compress: bool = True,
+                 readonly: bool = False):
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.compress = compress
+        self.readonly = readonly
+        if not readonly:
+            os.makedirs(directory, exist_ok=True)
+        self._ts: List[float] = []                 # index entries in append order
+        self._loc: List[Tuple[int, int, int]] = []  # (segment, offset, length)
+        self._ids: List[str] = []
+        self._by_id: Dict[str, int] = {}           # hand_id -> latest entry
+        self._sorted = True                        # timestamps non-decreasing
+        self._writer: Optional[BinaryIO] = None
+        self._index: Optional[BinaryIO] = None
+        self._readers: Dict[int, BinaryIO] = {}
+        self._load_index()
+
+    # ---------- index ----------
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, INDEX_NAME)
+
+    def _segments(self) -> List[int]:
+        if not os.path.isdir(self.directory):  # read-only open of a log never written
+            return []
+        out = []
+        for name in os.listdir(self.directory):
+            if name.startswith("hands-") and name.endswith(".log"):
+                try:
+                    out.append(int(name[6:-4]))
+                except ValueError:
+                    pass
+        return sorted(out)
+
+    def _add(self, hand_id: str, ts: float, seg: int, off: int, length: int) -> None:
+        if self._ts and ts < self._ts[-1]:
+            self._sorted = False
+        self._by_id[hand_id] = len(self._ts)
+        self._ts.append(ts)
+        self._loc.append((seg, off, length))
+        self._ids.append(hand_id)
+
+    def _load_index(self) -> None:
+        path = self._index_path()
+        data = b""
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                data = f.read()
+        whole = len(data) - len(data) % _IDX.size
+        for ts, seg, off, length, raw in _IDX.iter_unpack(data[:whole]):
+            self._add(raw.rstrip(b"\0").decode(), ts, seg, off, length)
+        if whole != len(data) and not self.readonly:  # torn index entry
+            with open(path, "r+b") as f:
+                f.truncate(whole)
+        self._catch_up()
+
+    def _catch_up(self) -> None:
+        # index records the segments hold beyond the last index entry
+        segs = self._segments()
+        if not segs:
+            return
+        if self._loc:
+            seg, off, length = self._loc[-1]
+            start = off + length
+        else:
+            seg, start = segs[0], len(MAGIC)
+        new = []
+        for s in [x for x in segs if x >= seg]:
+            path = os.path.join(self.directory, _segment_name(s))
+            pos = start if s == seg else len(MAGIC)
+            with open(path, "rb") as f:
+                f.seek(pos)
+                while True:
+                    try:
+                        rec = _read_record(f)
+                    except CorruptRecord:
+                        rec = None
+                        if s != segs[-1]:
+                            raise
+                        if self.readonly:  # maybe a record still being appended: leave it
+                            break
+                        f.close()
+                        with open(path, "r+b") as w:  # torn tail from an interrupted write
+                            w.truncate(pos)
+                    if rec is None:
+                        break
+                    hand_id, ts, _, length = rec
+                    new.append((hand_id, ts, s, pos, length))
+                    pos += length
+        if new and self.readonly:
+            for e in new:
+                self._add(*e)
+        elif new:
+            with open(self._index_path(), "ab") as f:
+                for hand_id, ts, s, pos, length in new:
+                    f.write(_IDX.pack(ts, s, pos, length, hand_id.encode()))
+                    self._add(hand_id, ts, s, pos, length)
+
+    def reindex(self) -> int:
+        """Rebuild the index from the segments; returns the number of records."""
+        self._check_writable()
+        self.close()
+        if os.path.exists(self._index_path()):
+            os.remove(self._index_path())
+        self._ts, self._loc, self._ids, self._by_id, self._sorted = [], [], [], {}, True
+        self._catch_up()
+        return len(self._ts)
+
+    # ---------- writing ----------
+    def append(self, hand_id: str, record: Dict[str, Any], ts: Optional[float] = None) -> None:
+        self.append_many([(hand_id, record, ts)])
+
+    def append_many(self, items: Iterable[Tuple[str, Dict[str, Any], Optional[float]]]) -> int:
+        """
+        Append (hand_id, record, timestamp or None for now) items with one
+        segment write and one index write (two if a segment fills up).
+        Returns the number of records written.
+        """
+        self._check_writable()
+        buf, index_buf, entries = bytearray(), bytearray(), []
+        w = self._open_writer()
+        pos = w.tell()
+        for hand_id, record, ts in items:
+            raw_id = hand_id.encode()
+            if not raw_id or len(raw_id) > 32:
+                raise ValueError("hand_id must be 1..32 bytes")
+            ts = time.time() if ts is None else ts
+            payload = json.dumps(record, separators=(",", ":"), default=str).encode()
+            flags = 0
+            if self.compress:
+                packed = zlib.compress(payload, 6)
+                if len(packed) < len(payload):
+                    payload, flags = packed, FLAG_ZLIB
+            body = raw_id + payload
+            blob = _REC.pack(len(payload), zlib.crc32(body), flags, ts, len(raw_id)) + body
+            if pos > len(MAGIC) and pos + len(blob) > self.segment_bytes:
+                w.write(buf)
+                buf.clear()
+                w = self._rotate()
+                pos = w.tell()
+            buf += blob
+            index_buf += _IDX.pack(ts, self._write_seg, pos, len(blob), raw_id)
+            entries.append((hand_id, ts, self._write_seg, pos, len(blob)))
+            pos += len(blob)
+        w.write(buf)
+        w.flush()
+        # index after data: a crash in between is repaired by _catch_up on open
+        if self._index is None:
+            self._index = open(self._index_path(), "ab")
+        self._index.write(index_buf)
+        self._index.flush()
+        for e in entries:
+            self._add(*e)
+        return len(entries)
+
+    def _check_writable(self) -> None:
+        if self.readonly:
+            raise ValueError(f"hand log {self.directory!r} is open read-only")
+
+    def sync(self) -> None:
+        """fsync the current segment and the index."""
+        for f in (self._writer, self._index):
+            if f is not None:
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _open_writer(self) -> BinaryIO:
+        if self._writer is None:
+            segs = self._segments()
+            self._write_seg = segs[-1] if segs else 1
+            self._writer = open(os.path.join(self.directory, _segment_name(self._write_seg)), "ab")
+            if self._writer.tell() == 0:
+                self._writer.write(MAGIC)
+        return self._writer
+
+    def _rotate(self) -> BinaryIO:
+        self._writer.flush()
+        os.fsync(self._writer.fileno())  # a full segment is never written again
+        self._writer.close()
+        self._write_seg += 1
+        self._writer = open(os.path.join(self.directory, _segment_name(self._write_seg)), "ab")
+        self._writer.write(MAGIC)
+        return self._writer
+
+    # ---------- reading ----------
+    def __len__(self) -> int:
+        return len(self._ts)
+
+    def __contains__(self, hand_id: str) -> bool:
+        return hand_id in self._by_id
+
+    def hand_ids(self) -> List[str]:
+        return list(self._ids)
+
+    def _read_at(self, i: int) -> Dict[str, Any]:
+        seg, off, _ = self._loc[i]
+        f = self._readers.get(seg)
+        if f is None:
+            f = self._readers[seg] = open(os.path.join(self.directory, _segment_name(seg)), "rb")
+        f.seek(off)
+        rec = _read_record(f)
+        if rec is None:
+            raise CorruptRecord(f"no record at segment {seg} offset {off}")
+        return json.loads(rec[2])
+
+    def get(self, hand_id: str) -> Dict[str, Any]:
+        i = self._by_id.get(hand_id)
+        if i is None:
+            raise KeyError(hand_id)
+        return self._read_at(i)
+
+    def between(self, start: float, end: float) -> Iterator[Dict[str, Any]]:
+        """Records with start <= timestamp <= end, in append order."""
+        if self._sorted:
+            lo, hi = bisect_left(self._ts, start), bisect_right(self._ts, end)
+            picks = range(lo, hi)
+        else:
+            picks = [i for i, t in enumerate(self._ts) if start <= t <= end]
+        for i in picks:
+            yield self._read_at(i)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self._ts)):
+            yield self._read_at(i)
+
+    def close(self) -> None:
+        for f in [self._writer, self._index] + list(self._readers.values()):
+            if f is not None:
+                f.close()
+        self._writer = self._index = None
+        self._readers = {}
+
+    def __enter__(self) -> "HandLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+def scan(directory: str, start: Optional[Tuple[int, int]] = None
+         ) -> Iterator[Tuple[Tuple[int, int], str, float, Dict[str, Any]]]:
+    """
+    Stream records straight from the segments, without loading the index:
+    yields (position after the record, hand_id, timestamp, record). Pass a
+    yielded position back as `start` to continue from there later. Stops
+    quietly at a torn tail (a writer may be mid-append).
+    """
+    seg, off = start if start is not None else (1, len(MAGIC))
+    if not os.path.isdir(directory):
+        return
+    segs = [x for x in sorted(int(n[6:-4]) for n in os.listdir(directory)
+                              if n.startswith("hands-") and n.endswith(".log") and n[6:-4].isdigit())
+            if x >= seg]
+    for s in segs:
+        pos = off if s == seg else len(MAGIC)
+        with open(os.path.join(directory, _segment_name(s)), "rb") as f:
+            f.seek(pos)
+            while True:
+                try:
+                    rec = _read_record(f)
+                except CorruptRecord:
+                    return
+                if rec is None:
+                    break
+                hand_id, ts, payload, length = rec
+                pos += length
+                yield (s, pos), hand_id, ts, json.loads(payload)
+
+# ---------- conversion tools ----------
+def export_json(log: HandLog, out_dir: str) -> int:
+    """Write every hand as <hand_id>.json (the old per-hand format); returns the count."""
+    os.makedirs(out_dir, exist_ok=True)
+    n = 0
+    for hand_id in log.hand_ids():
+        with open(os.path.join(out_dir, f"{hand_id}.json"), "w", encoding="utf-8") as f:
+            json.dump(log.get(hand_id), f, indent=2)
+        n += 1
+    return n
+
+def export_csv(log: HandLog, path: str) -> int:
+    """One summary row per hand (hand_id, variant, players, winners, pot_total)."""
+    n = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(["hand_id", "variant", "players", "winners", "pot_total"])
+        for rec in log:
+            total = sum(Decimal(p["amount"]) for p in rec.get("pots", []))
+            w.writerow([rec["hand_id"], rec["variant"], len(rec["seats"]),
+                        "|".join(map(str, rec["winners"])), f"{total:.2f}"])
+            n += 1
+    return n
+
+def main():
+    args = sys.argv[1:]
+    cmd = args[0] if args else "ls"
+    directory = args[1] if len(args) > 1 else "history"
+    if cmd not in ("ls", "export", "csv", "reindex"):
+        print(__doc__)
+        sys.exit(1)
+    with HandLog(directory, readonly=cmd in ("ls", "export", "csv")) as log:
+        if cmd == "ls":
+            for hand_id, ts in zip(log.hand_ids(), log._ts):
+                print(f"{hand_id}  {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ts))}")
+            print(f"{len(log)} hands")
+        elif cmd == "export":
+            out = args[2] if len(args) > 2 else os.path.join(directory, "json")
+            print(f"wrote {export_json(log, out)} files to {out}")
+        elif cmd == "csv":
+            out = args[2] if len(args) > 2 else os.path.join(directory, "hands.csv")
+            print(f"wrote {export_csv(log, out)} rows to {out}")
+        else:
+            print(f"indexed {log.reindex()} records")
+
+if __name__ == "__main__":
+    main()
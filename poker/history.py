@@ -1,7 +1,12 @@
+from collections import deque
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from decimal import Decimal
-import json, csv, time, os
+import atexit, queue, threading, time, uuid
+
+from . import metrics
+from .card import CARDS
+from .handlog import HandLog
 
 @dataclass
 class Action:
@@ -25,32 +30,174 @@ class HandRecord:
     winners: List[int]
     actions: List[Action]
 
+def new_hand_id() -> str:
+    """Timestamp plus random suffix: sortable and unique across fast hands."""
+    return f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+def record_from_events(
+    hand_id: str,
+    variant: str,
+    seats: List[str],
+    levels: List[int],
+    stacks_start: List[Decimal],
+    state,
+    events: List[Any]
+) -> HandRecord:
+    """
+    HandRecord for a finished hand_state hand. `events` is everything new_hand
+    and apply returned, in order; seat i of the hand is seats[i].
+    """
+    def fmt(x: Decimal) -> str:
+        return f"{x:.2f}"
+    actions: List[Action] = []
+    for seat, (kind, due) in ((0, ("POST_SB", Decimal("1.00"))), (1, ("POST_BB", Decimal("2.00")))):
+        if seat < len(seats) and len(seats) >= 2:
+            actions.append(Action(seat, seats[seat], "Preflop", kind, fmt(min(stacks_start[seat], due)), {}))
+    street, pot, winners = "Preflop", Decimal("0.00"), []
+    for ev in events:
+        if ev.kind == "STREET":
+            street = ev.info[0]
+        elif ev.kind in ("CHECK", "FOLD"):
+            actions.append(Action(ev.seat, seats[ev.seat], street, ev.kind, "", {}))
+        elif ev.kind in ("BET", "CALL"):
+            actions.append(Action(ev.seat, seats[ev.seat], street, ev.kind, fmt(ev.amount), {}))
+        elif ev.kind == "SHOWDOWN":
+            for i, strength in ev.info:
+                meta = {"strength": strength, "hole": list(state.holes[i])}  # card ids
+                actions.append(Action(i, seats[i], "Showdown", "SHOWDOWN", "", meta))
+        elif ev.kind == "TAKE":
+            pot, winners = ev.amount, [ev.seat]
+        elif ev.kind == "WIN":
+            pot, winners = ev.amount, list(ev.info[0])
+    live = [i for i, alive in enumerate(state.in_hand) if alive]
+    return HandRecord(
+        hand_id=hand_id,
+        variant=variant,
+        seats=list(seats),
+        levels=list(levels),
+        stacks_start=[fmt(x) for x in stacks_start],
+        stacks_end=[fmt(x) for x in state.stacks],
+        board=[str(CARDS[c]) for c in state.board],
+        pots=[{"amount": fmt(pot), "contesters": live}],
+        winners=winners,
+        actions=actions,
+    )
+
 class Recorder:
+    """Appends finished hands to the HandLog in history_dir (see poker.handlog)."""
     def __init__(self, history_dir="history"):
         self.history_dir = history_dir
-        os.makedirs(history_dir, exist_ok=True)
+        self.log = HandLog(history_dir)
 
     def ts_id(self) -> str:
         return time.strftime("%Y%m%d-%H%M%S")
 
-    def dump(self, rec: HandRecord):
-        hid = rec.hand_id
-        jpath = os.path.join(self.history_dir, f"{hid}.json")
-        with open(jpath, "w", encoding="utf-8") as f:
-            json.dump({
-                **asdict(rec),
-                "actions":[asdict(a) for a in rec.actions]
-            }, f, indent=2)
-        # simple CSV summary (one row per hand)
-        cpath = os.path.join(self.history_dir, "hands.csv")
-        new = not os.path.exists(cpath)
-        with open(cpath, "a", newline="", encoding="utf-8") as f:
-            w = csv.writer(f)
-            if new:
-                w.writerow(["hand_id","variant","players","winners","pot_total"])
-            total = sum(Decimal(p["amount"]) for p in rec.pots)
-            w.writerow([hid, rec.variant, len(rec.seats), "|".join(map(str, rec.winners)), f"{total:.2f}"])
-        return jpath
+    def dump(self, rec: HandRecord) -> str:
+        """Append `rec`; returns its hand_id (python -m poker.replay <hand_id>)."""
+        with metrics.timer("history.dump"):
+            self.log.append(rec.hand_id, asdict(rec))
+        return rec.hand_id
+
+class BackgroundRecorder(Recorder):
+    """
+    Recorder whose dump() only enqueues; a writer thread appends to the log.
+
+    The queue is bounded (dump blocks once max_queue hands are waiting, so
+    memory stays bounded if the disk stalls). The thread takes whatever is
+    queued, up to batch_size hands, as one HandLog.append_many. fsync_every:
+    None never fsyncs, 0 fsyncs after every batch, N > 0 at most every N
+    seconds. close() (also run at exit) drains the queue and syncs.
+    """
+    def __init__(self, history_dir="history", max_queue: int = 1024, batch_size: int = 64,
+                 fsync_every: Optional[float] = 1.0):
+        super().__init__(history_dir)
+        self.batch_size = batch_size
+        self.fsync_every = fsync_every
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._latency = deque(maxlen=1000)   # seconds per batch write (incl. fsync)
+        self._written = self._batches = self._fsyncs = 0
+        self._last_sync = time.monotonic()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def dump(self, rec: HandRecord) -> str:
+        self._raise_error()
+        if self._closed:
+            raise RuntimeError("recorder is closed")
+        with metrics.timer("history.dump"):
+            self._queue.put((rec.hand_id, asdict(rec), time.time()))
+        return rec.hand_id
+
+    def flush(self) -> None:
+        """Block until every queued hand is in the log (readable by poker.replay)."""
+        self._queue.join()
+        self._raise_error()
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)  # drop the exit hook's reference to this recorder
+        self._queue.put(None)
+        self._thread.join()
+        if self.fsync_every is not None:
+            self.log.sync()
+        self.log.close()
+        self._raise_error()
+
+    def metrics(self) -> Dict[str, Any]:
+        lat = sorted(self._latency)
+        def ms(q: float) -> float:
+            return 1000 * lat[min(len(lat) - 1, int(q * len(lat)))] if lat else 0.0
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_queue": self._queue.maxsize,
+            "written": self._written,
+            "batches": self._batches,
+            "fsyncs": self._fsyncs,
+            "write_ms_p50": ms(0.50),
+            "write_ms_p99": ms(0.99),
+            "write_ms_max": 1000 * lat[-1] if lat else 0.0,
+        }
+
+    def _raise_error(self) -> None:
+        if self._error is not None:
+            err, self._error = self._error, None
+            raise RuntimeError("history writer failed") from err
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            items = [b for b in batch if b is not None]
+            stop = len(items) < len(batch)
+            try:
+                if items:
+                    t0 = time.perf_counter()
+                    self.log.append_many(items)
+                    now = time.monotonic()
+                    if self.fsync_every is not None and now - self._last_sync >= self.fsync_every:
+                        self.log.sync()
+                        self._fsyncs += 1
+                        self._last_sync = now
+                    self._latency.append(time.perf_counter() - t0)
+                    metrics.observe("history.batch_write", self._latency[-1])
+                    metrics.inc("history.hands_written", len(items))
+                    self._written += len(items)
+                    self._batches += 1
+            except BaseException as e:  # surfaced on the next dump/flush/close
+                self._error = e
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
 
 def build_sidepots(contrib: List[Decimal], alive: List[bool]) -> List[Dict[str,Any]]:
     """
@@ -0,0 +1,190 @@
+"""
+Lightweight instrumentation: counters, timing histograms, and a profiler hook.
+
+Off by default; POKERLAB_METRICS=1 (or enable()) turns it on. While off,
+inc() and observe() return at once and timer() hands back one shared no-op
+context manager, so an instrumented call site costs a function call.
+Subsystems use dotted names:
+
+    equity.*    estimate/adaptive/batch runs (seconds) and trials sampled
+    cache.*     EQUITY_CACHE hits and misses
+    bot.*       decisions (seconds)
+    engine.*    apply() (seconds), showdowns, street transitions
+    history.*   Recorder.dump (seconds the caller blocks), background batch writes
+    cheat.*     odds/suggest uses and the trials they consumed
+
+evaluate_ids itself is not timed per call (the check would cost a good
+share of the evaluation); showdowns and equity runs are measured instead,
+and raw evaluator throughput is what benchmarks.suite is for.
+
+summary() is the plain-text report cli_play prints at exit;
+prometheus_text() is the same data in the Prometheus text format (served
+at GET /metrics by poker.server). profile() runs cProfile around a block;
+cli_play wraps hand N in it when POKERLAB_PROFILE_HAND=N.
+"""
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from typing import Callable, Dict, List, Optional, Tuple
+import os, threading, time
+
+ENABLED = os.environ.get("POKERLAB_METRICS", "") not in ("", "0")
+# histogram upper bounds in seconds (plus +Inf)
+BUCKETS: Tuple[float, ...] = (1e-5, 1e-4, 1e-3, 0.01, 0.1, 1.0, 10.0)
+
+_lock = threading.Lock()
+_counters: Dict[str, float] = {}
+_hists: Dict[str, List[float]] = {}  # name -> per-bucket counts + [+Inf, count, sum]
+
+def enable() -> None:
+    global ENABLED
+    ENABLED = True
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+
+def reset() -> None:
+    with _lock:
+        _counters.clear()
+        _hists.clear()
+
+def inc(name: str, n: float = 1) -> None:
+    if not ENABLED:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+def value(name: str) -> float:
+    """Current value of a counter (0 if never incremented)."""
+    return _counters.get(name, 0)
+
+def observe(name: str, seconds: float) -> None:
+    if not ENABLED:
+        return
+    with _lock:
+        h = _hists.get(name)
+        if h is None:
+            h = _hists[name] = [0.0] * (len(BUCKETS) + 3)
+        for i, b in enumerate(BUCKETS):
+            if seconds <= b:
+                h[i] += 1
+                break
+        else:
+            h[len(BUCKETS)] += 1
+        h[-2] += 1
+        h[-1] += seconds
+
+class _Timer:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.t0)
+        return False
+
+_NOOP = nullcontext()
+
+def timer(name: str):
+    """Context manager recording the block's wall time under `name`."""
+    return _Timer(name) if ENABLED else _NOOP
+
+def timed(name: str) -> Callable:
+    """Decorator form of timer()."""
+    def wrap(fn):
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - t0)
+        return inner
+    return wrap
+
+def snapshot() -> Dict[str, dict]:
+    """{"counters": {name: n}, "timers": {name: {"count", "sum", "buckets": {le: n}}}}."""
+    with _lock:
+        timers = {}
+        for name, h in _hists.items():
+            les = [str(b) for b in BUCKETS] + ["+Inf"]
+            timers[name] = {"count": int(h[-2]), "sum": h[-1],
+                            "buckets": {le: int(n) for le, n in zip(les, h[:len(BUCKETS) + 1])}}
+        return {"counters": dict(_counters), "timers": timers}
+
+def _quantile(buckets: Dict[str, int], count: int, q: float) -> str:
+    seen = 0
+    for le, n in buckets.items():
+        seen += n
+        if seen >= q * count:
+            return "<=" + (le if le == "+Inf" else f"{float(le)*1000:g}ms")
+    return "-"
+
+def summary() -> str:
+    """Plain-text report of everything recorded so far."""
+    snap = snapshot()
+    if not snap["counters"] and not snap["timers"]:
+        return "metrics: nothing recorded" + ("" if ENABLED else " (off; set POKERLAB_METRICS=1)")
+    lines = []
+    if snap["timers"]:
+        lines.append(f"{'timer':<24} {'calls':>9} {'total s':>9} {'mean ms':>9} {'p50':>9} {'p99':>9}")
+        for name, t in sorted(snap["timers"].items()):
+            mean = 1000 * t["sum"] / max(1, t["count"])
+            lines.append(f"{name:<24} {t['count']:>9,} {t['sum']:>9.3f} {mean:>9.3f} "
+                         f"{_quantile(t['buckets'], t['count'], 0.5):>9} {_quantile(t['buckets'], t['count'], 0.99):>9}")
+    if snap["counters"]:
+        lines.append(f"{'counter':<24} {'value':>9}")
+        for name, v in sorted(snap["counters"].items()):
+            lines.append(f"{name:<24} {v:>9,.0f}")
+    return "\n".join(lines)
+
+def _prom_name(name: str) -> str:
+    return "poker_" + "".join(c if c.isalnum() else "_" for c in name)
+
+def prometheus_text() -> str:
+    """Counters as <name>_total, timers as <name>_seconds histograms (text format 0.0.4)."""
+    snap = snapshot()
+    out = []
+    for name, v in sorted(snap["counters"].items()):
+        m = _prom_name(name) + "_total"
+        out += [f"# TYPE {m} counter", f"{m} {v:g}"]
+    for name, t in sorted(snap["timers"].items()):
+        m = _prom_name(name) + "_seconds"
+        out.append(f"# TYPE {m} histogram")
+        cum = 0
+        for le, n in t["buckets"].items():
+            cum += n
+            out.append(f'{m}_bucket{{le="{le}"}} {cum}')
+        out += [f"{m}_sum {t['sum']:.6f}", f"{m}_count {t['count']}"]
+    return "\n".join(out) + "\n"
+
+@contextmanager
+def profile(out_path: Optional[str] = None, top: int = 25, print_fn=print):
+    """cProfile the block; print the `top` entries by cumulative time, and dump stats to out_path if given."""
+    import cProfile, io, pstats  # only when profiling; kept off every entry point's import path
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield prof
+    finally:
+        prof.disable()
+        if out_path:
+            prof.dump_stats(out_path)
+        if print_fn:
+            buf = io.StringIO()
+            pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(top)
+            print_fn(buf.getvalue())
+
+def profile_hand(hand_no: int):
+    """profile() when hand_no is the one POKERLAB_PROFILE_HAND asks for, else a no-op."""
+    want = os.environ.get("POKERLAB_PROFILE_HAND", "")
+    if want.isdigit() and int(want) == hand_no:
+        return profile(os.environ.get("POKERLAB_PROFILE_OUT") or None)
+    return _NOOP
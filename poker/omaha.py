@@ -0,0 +1,75 @@
+"""
+Omaha scoring: best hand using exactly 2 hole cards and 3 board cards.
+
+The naive rule evaluates every hole pair against every board triple (60
+five-card evaluations for 4 hole cards and 5 board cards). OmahaBoard does
+the board side once: the distinct rank keys of its triples, and the rank
+masks of same-suit triples for suits that can still make a flush. Scoring a
+hole is then one table lookup per (pair, triple), and flush lookups only for
+suited pairs in a flush-possible suit. Hero and every opponent share one
+OmahaBoard per runout.
+"""
+from itertools import combinations
+from typing import Dict, List, Sequence, Tuple
+
+from .card import Card, card_id
+from .hand_eval import _ID_BIT, _ID_KEY, _ID_SUIT, _tables, compare, evaluate_best
+
+class OmahaBoard:
+    __slots__ = ("triple_keys", "flush_masks", "_pair_memo")
+
+    def __init__(self, board: Sequence[int]):
+        if len(board) < 3:
+            raise ValueError("need at least 3 board cards")
+        self.triple_keys: List[int] = sorted({_ID_KEY[a] + _ID_KEY[b] + _ID_KEY[c]
+                                             for a, b, c in combinations(board, 3)})
+        # suit -> rank masks of the board triples in that suit
+        self.flush_masks: Dict[int, List[int]] = {}
+        for a, b, c in combinations(board, 3):
+            s = _ID_SUIT[a]
+            if _ID_SUIT[b] == s and _ID_SUIT[c] == s:
+                self.flush_masks.setdefault(s, []).append(_ID_BIT[a] | _ID_BIT[b] | _ID_BIT[c])
+        # best non-flush value per hole-pair rank key (shared across players)
+        self._pair_memo: Dict[int, int] = {}
+
+    def score(self, hole: Sequence[int]) -> int:
+        """Strength (as hand_eval.evaluate_ids) of a hole of any size >= 2 on this board."""
+        t = _tables()
+        noflush, flush = t.noflush, t.flush
+        memo = self._pair_memo
+        best = 0
+        for a, b in combinations(hole, 2):
+            pk = _ID_KEY[a] + _ID_KEY[b]
+            v = memo.get(pk)
+            if v is None:
+                v = max(noflush[pk + tk] for tk in self.triple_keys)
+                memo[pk] = v
+            if v > best:
+                best = v
+            if self.flush_masks and _ID_SUIT[a] == _ID_SUIT[b]:
+                masks = self.flush_masks.get(_ID_SUIT[a])
+                if masks:
+                    # five distinct ranks in one suit: the flush table is the whole answer
+                    pb = _ID_BIT[a] | _ID_BIT[b]
+                    for m in masks:
+                        fv = flush[pb | m]
+                        if fv > best:
+                            best = fv
+        return best
+
+def evaluate_omaha_ids(hole: Sequence[int], board: Sequence[int]) -> int:
+    return OmahaBoard(board).score(hole)
+
+def evaluate_omaha(hole: List[Card], board: List[Card]) -> int:
+    """Card-object front end for evaluate_omaha_ids."""
+    return OmahaBoard([card_id(c) for c in board]).score([card_id(c) for c in hole])
+
+def _evaluate_omaha_combos(hole: List[Card], board: List[Card]) -> Tuple[int, List[int]]:
+    # Reference path: evaluate_best on all 2-from-hole x 3-from-board combinations.
+    best = None
+    for h2 in combinations(hole, 2):
+        for b3 in combinations(board, 3):
+            hv = evaluate_best(list(h2) + list(b3))
+            if best is None or compare(hv, best) > 0:
+                best = hv
+    return best
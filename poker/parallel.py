@@ -0,0 +1,50 @@
+"""
+Process-pool Monte Carlo for estimate_equity and sim_cli.
+
+Trials are split into one chunk per worker. Chunk i runs with a seed derived
+from the master seed and i, so a fixed (seed, workers) pair reproduces the
+same win/tie counts bit for bit regardless of scheduling.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import hashlib, random
+
+def chunk_seed(master: int, index: int) -> int:
+    """Independent 64-bit seed for chunk `index` of a run seeded with `master`."""
+    digest = hashlib.blake2b(f"{master}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+def split_trials(trials: int, workers: int) -> List[int]:
+    """Chunk sizes: `trials` spread as evenly as possible over `workers`."""
+    workers = max(1, workers)
+    base, extra = divmod(max(0, trials), workers)
+    return [base + (1 if i < extra else 0) for i in range(workers)]
+
+def _run_chunk(job) -> Tuple[int, int]:
+    from .equity import sample_counts
+    hero, board, trials, n_opponents, eval_variant, target, backend, seed = job
+    return sample_counts(hero, board, trials, n_opponents, eval_variant, target, backend=backend, seed=seed)
+
+def parallel_counts(
+    hero: List[int],
+    board: List[int],
+    trials: int,
+    n_opponents: int,
+    eval_variant: str,
+    target: int,
+    backend: str = "python",
+    workers: int = 1,
+    seed: Optional[int] = None
+) -> Tuple[int, int]:
+    """Merged (wins, ties) over all chunks; workers <= 1 runs the chunk in-process."""
+    if seed is None:
+        seed = random.getrandbits(64)
+    sizes = split_trials(trials, workers)
+    jobs = [(hero, board, n, n_opponents, eval_variant, target, backend, chunk_seed(seed, i))
+            for i, n in enumerate(sizes) if n]
+    if len(jobs) <= 1:
+        results = [_run_chunk(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            results = list(pool.map(_run_chunk, jobs))
+    return sum(w for w, _ in results), sum(t for _, t in results)
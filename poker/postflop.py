@@ -0,0 +1,223 @@
+"""
+Precomputed postflop hand-strength buckets for Hold'em bots.
+
+A flop, turn or river spot is reduced to a small feature key: street, made
+hand category, where its main rank sits against the board, whether the hole
+makes it, kicker, flush and straight draws, and board texture (flush-able,
+paired). Every feature comes from one evaluator call plus a few bit
+operations, so lookup is O(1).
+
+The table is built offline by dealing random spots and playing each out
+once against 1..7 random opponents. A key's equity is the mean result of
+the spots that fell into it, i.e. the expected hand strength (EHS) of
+that bucket. EHS2 is the mean squared river strength, which shows how
+much a bucket's strength swings on later cards. Keys seen too rarely are
+left out, and lookup returns None for them. The table is a versioned JSON
+file like the preflop table.
+
+    python -m poker.postflop build [--spots N] [--workers W] [--seed S] [--out PATH]
+    python -m poker.postflop show [--street flop|turn|river] [--opponents N]
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Sequence
+import argparse, json, os, random, time
+
+from .hand_eval import ONE_PAIR, HIGH_CARD, FLUSH, STRAIGHT, TWO_PAIR, evaluate_ids, hand_class
+from .parallel import chunk_seed, split_trials
+from .preflop import MAX_OPPONENTS, save_table
+
+TABLE_VERSION = 1
+STREETS = {3: "flop", 4: "turn", 5: "river"}
+N_BUCKETS = 10
+MIN_COUNT = 40  # fewest spots behind a published key
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", f"postflop_v{TABLE_VERSION}.json")
+
+# straight windows as 13-bit rank masks (bit r = rank r+2), wheel included
+_STRAIGHTS = [0b11111 << lo for lo in range(9)] + [0b1000000001111]
+
+class Strength(NamedTuple):
+    equity: float   # bucket equity vs the asked number of opponents
+    ehs: float      # vs one opponent
+    ehs2: float     # mean squared river strength vs one opponent
+    bucket: int     # 0..N_BUCKETS-1 by ehs
+    count: int      # spots behind the estimate
+
+def _straight_outs(ranks: int) -> int:
+    """Ranks that would complete a straight not already made (capped at 2)."""
+    outs = 0
+    for r in range(13):
+        bit = 1 << r
+        if ranks & bit:
+            continue
+        m = ranks | bit
+        if any(m & s == s for s in _STRAIGHTS):
+            outs += 1
+    return min(outs, 2)
+
+def features(hole: Sequence[int], board: Sequence[int]) -> str:
+    """Bucket key of a two-card Hold'em hole on a 3..5 card board (card ids)."""
+    cat, tb = hand_class(evaluate_ids(list(hole) + list(board)))
+    hr = [c % 13 for c in hole]
+    br = [c % 13 for c in board]
+    top = tb[0] - 2  # main rank of the made hand, 0..12
+    above = min(2, len({r for r in br if r > top}))
+    in_hole = int(top in hr)
+    kick = 0
+    if cat == ONE_PAIR:
+        other = max((r for r in hr if r != top), default=max(hr))
+        kick = 2 if other >= 10 else 1 if other >= 7 else 0
+    elif cat == HIGH_CARD:
+        kick = min(2, sum(r > max(br) for r in hr))  # overcards
+    elif cat == TWO_PAIR:
+        kick = int(tb[1] - 2 in hr)
+    elif cat == FLUSH:
+        suit = max(range(4), key=lambda s: sum(c // 13 == s for c in list(hole) + list(board)))
+        kick = max((c % 13 for c in hole if c // 13 == suit), default=-1)
+        kick = 2 if kick == 12 else 1 if kick >= 9 else 0
+    fd = sd = 0
+    if len(board) < 5:
+        if cat < FLUSH:
+            fd = int(any(sum(c // 13 == s for c in board) + sum(c // 13 == s for c in hole) == 4
+                         and any(c // 13 == s for c in hole) for s in range(4)))
+        if cat < STRAIGHT:
+            ranks = 0
+            for r in hr + br:
+                ranks |= 1 << r
+            sd = _straight_outs(ranks)
+    flushy = int(max(sum(c // 13 == s for c in board) for s in range(4)) >= 3)
+    paired = int(len(set(br)) < len(br))
+    return f"{len(board)}|{cat}|{above}|{in_hole}|{kick}|{fd}|{sd}|{flushy}|{paired}"
+
+# ---------- lookup ----------
+_TABLE: Optional[Dict[str, List[float]]] = None
+_LOADED_FROM: Optional[str] = None
+
+def table_path() -> str:
+    return os.environ.get("POKERLAB_POSTFLOP") or DEFAULT_PATH
+
+def load_table(path: Optional[str] = None) -> Dict[str, List[float]]:
+    """Key -> [equity vs 1..7 opponents, ehs2, count]; {} if the table is missing or stale."""
+    path = path or table_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != TABLE_VERSION:
+        return {}
+    return data["buckets"]
+
+def lookup(
+    hole: Sequence[int],
+    board: Sequence[int],
+    n_opponents: int = 1,
+    eval_variant: str = "holdem",
+    board_target_size: int = 5
+) -> Optional[Strength]:
+    """Tabled strength of a Hold'em spot, or None if the table does not cover it."""
+    global _TABLE, _LOADED_FROM
+    if (eval_variant == "plo" or board_target_size != 5 or len(hole) != 2
+            or not 3 <= len(board) <= 5 or not 1 <= n_opponents <= MAX_OPPONENTS):
+        return None
+    path = table_path()
+    if _TABLE is None or _LOADED_FROM != path:
+        _TABLE, _LOADED_FROM = load_table(path), path
+    row = _TABLE.get(features(hole, board))
+    if row is None:
+        return None
+    ehs = row[0]
+    return Strength(row[n_opponents - 1], ehs, row[MAX_OPPONENTS], min(N_BUCKETS - 1, int(ehs * N_BUCKETS)),
+                    int(row[MAX_OPPONENTS + 1]))
+
+# ---------- building ----------
+def _score(x: int, y: int) -> float:
+    return 1.0 if x > y else 0.5 if x == y else 0.0
+
+def _build_chunk(job) -> Dict[str, List[float]]:
+    """Sums per key: [score vs 1..7 opponents, ehs2 sample, spots]."""
+    spots, seed = job
+    rng = random.Random(seed)
+    sums: Dict[str, List[float]] = {}
+    deck = list(range(52))
+    for i in range(spots):
+        n_board = 3 + i % 3
+        cards = rng.sample(deck, 2 + 5 + 2 * (MAX_OPPONENTS + 1))
+        hole, board, run = cards[:2], cards[2:2 + n_board], cards[2:7]
+        key = features(hole, board)
+        hv = evaluate_ids(hole + run)
+        opp = [evaluate_ids(cards[a:a + 2] + run) for a in range(7, len(cards), 2)]
+        row = sums.get(key)
+        if row is None:
+            row = sums[key] = [0.0] * (MAX_OPPONENTS + 2)
+        best = 0
+        for n in range(MAX_OPPONENTS):
+            best = max(best, opp[n])
+            row[n] += _score(hv, best)
+        # two independent opponents on one runout: E[x1*x2] is the squared river strength
+        row[MAX_OPPONENTS] += _score(hv, opp[0]) * _score(hv, opp[MAX_OPPONENTS])
+        row[MAX_OPPONENTS + 1] += 1
+    return sums
+
+def build_table(spots: int, workers: int = 1, seed: int = 1, min_count: int = MIN_COUNT, progress=print) -> dict:
+    t0 = time.perf_counter()
+    jobs = [(n, chunk_seed(seed, i)) for i, n in enumerate(split_trials(spots, max(1, workers) * 8)) if n]
+    total: Dict[str, List[float]] = {}
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = pool.map(_build_chunk, jobs)
+            for part in parts:
+                _merge(total, part)
+    else:
+        for job in jobs:
+            _merge(total, _build_chunk(job))
+    buckets = {}
+    for key, row in sorted(total.items()):
+        n = row[-1]
+        if n >= min_count:
+            buckets[key] = [round(v / n, 4) for v in row[:-1]] + [int(n)]
+    if progress:
+        progress(f"{spots:,} spots -> {len(buckets):,} of {len(total):,} keys kept "
+                 f"({time.perf_counter() - t0:.0f}s)")
+    return {"version": TABLE_VERSION, "spots": spots, "seed": seed, "min_count": min_count, "buckets": buckets}
+
+def _merge(total: Dict[str, List[float]], part: Dict[str, List[float]]) -> None:
+    for key, row in part.items():
+        acc = total.get(key)
+        if acc is None:
+            total[key] = row
+        else:
+            for j, v in enumerate(row):
+                acc[j] += v
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m poker.postflop")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="deal random spots and tabulate bucket strength")
+    b.add_argument("--spots", type=int, default=3_000_000)
+    b.add_argument("--workers", type=int, default=1)
+    b.add_argument("--seed", type=int, default=1)
+    b.add_argument("--min-count", type=int, default=MIN_COUNT)
+    b.add_argument("--out", default=table_path())
+    s = sub.add_parser("show", help="print the current table")
+    s.add_argument("--street", choices=list(STREETS.values()), default="flop")
+    s.add_argument("--opponents", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        data = build_table(args.spots, args.workers, args.seed, args.min_count)
+        save_table(data, args.out)
+        print(f"wrote {args.out}")
+        return
+    table = load_table()
+    if not table:
+        print(f"no postflop table at {table_path()}; run: python -m poker.postflop build")
+        return
+    n = max(1, min(MAX_OPPONENTS, args.opponents))
+    street = next(k for k, v in STREETS.items() if v == args.street)
+    print(f"{'key (street|cat|above|hole|kick|fd|sd|flushy|paired)':<52} {'equity':>7} {'ehs2':>6} {'spots':>8}")
+    for key, row in sorted(table.items(), key=lambda kv: -kv[1][n - 1]):
+        if key.startswith(f"{street}|"):
+            print(f"{key:<52} {row[n - 1]:>7.3f} {row[MAX_OPPONENTS]:>6.3f} {row[-1]:>8}")
+
+if __name__ == "__main__":
+    main()
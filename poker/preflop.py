@@ -0,0 +1,129 @@
+"""
+Precomputed preflop Hold'em equity for the 169 starting-hand classes.
+
+Preflop equity depends only on the hand's suit-isomorphism class (pairs,
+suited and offsuit combos) and the number of opponents, so it is simulated
+once per (class, 1..7 opponents) and stored in a small versioned JSON table.
+estimate_equity consults it automatically when the board is empty.
+
+    python -m poker.preflop build [--trials N] [--workers W] [--seed S] [--out PATH]
+    python -m poker.preflop show [--opponents N]
+"""
+from typing import Dict, List, Optional, Sequence
+import argparse, json, os, time
+
+TABLE_VERSION = 1
+MAX_OPPONENTS = 7
+RANK_CHARS = "23456789TJQKA"
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), "data", f"preflop_v{TABLE_VERSION}.json")
+
+def class_names() -> List[str]:
+    """All 169 classes: pairs, then suited, then offsuit, strongest ranks first."""
+    ranks = RANK_CHARS[::-1]
+    pairs = [r + r for r in ranks]
+    suited = [ranks[i] + ranks[j] + "s" for i in range(13) for j in range(i + 1, 13)]
+    offsuit = [ranks[i] + ranks[j] + "o" for i in range(13) for j in range(i + 1, 13)]
+    return pairs + suited + offsuit
+
+def class_of_ids(hole: Sequence[int]) -> str:
+    """Class name of a 2-card hole given as card ids (see card.card_id)."""
+    a, b = hole
+    ra, rb = a % 13, b % 13
+    if ra < rb:
+        ra, rb = rb, ra
+    if ra == rb:
+        return RANK_CHARS[ra] * 2
+    return RANK_CHARS[ra] + RANK_CHARS[rb] + ("s" if a // 13 == b // 13 else "o")
+
+def representative_ids(name: str) -> List[int]:
+    """One concrete hole for a class: spades first, hearts for the offsuit/paired card."""
+    hi, lo = RANK_CHARS.index(name[0]), RANK_CHARS.index(name[1])
+    second_suit = 3 if name.endswith("s") else 2
+    return [3*13 + hi, second_suit*13 + lo]
+
+# ---------- lookup ----------
+_TABLE: Optional[Dict[str, List[float]]] = None
+_LOADED_FROM: Optional[str] = None
+
+def table_path() -> str:
+    return os.environ.get("POKERLAB_PREFLOP") or DEFAULT_PATH
+
+def load_table(path: Optional[str] = None) -> Dict[str, List[float]]:
+    """Class -> [equity vs 1..7 opponents]; {} if the table is missing or stale."""
+    path = path or table_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != TABLE_VERSION:
+        return {}
+    return dict(zip(data["classes"], data["equity"]))
+
+def preflop_equity(hole: Sequence[int], n_opponents: int) -> Optional[float]:
+    """Tabled equity of a 2-card Hold'em hole (card ids), or None if not covered."""
+    global _TABLE, _LOADED_FROM
+    if len(hole) != 2 or not 1 <= n_opponents <= MAX_OPPONENTS:
+        return None
+    path = table_path()
+    if _TABLE is None or _LOADED_FROM != path:
+        _TABLE, _LOADED_FROM = load_table(path), path
+    row = _TABLE.get(class_of_ids(hole))
+    return row[n_opponents - 1] if row else None
+
+# ---------- building ----------
+def build_table(trials: int, workers: int = 1, seed: int = 1, backend: str = "python", progress=print) -> dict:
+    from .equity import estimate_equity_ids
+    from .parallel import chunk_seed
+    names = class_names()
+    rows = []
+    t0 = time.perf_counter()
+    for i, name in enumerate(names):
+        hole = representative_ids(name)
+        row = []
+        for n in range(1, MAX_OPPONENTS + 1):
+            eq = estimate_equity_ids(hole, [], trials=trials, n_opponents=n, backend=backend,
+                                     exact=False, preflop_table=False, workers=workers,
+                                     seed=chunk_seed(seed, i*MAX_OPPONENTS + n))
+            row.append(round(eq, 5))
+        rows.append(row)
+        if progress:
+            progress(f"{i+1:>3}/{len(names)} {name:<4} " + " ".join(f"{x:.3f}" for x in row)
+                     + f"  ({time.perf_counter()-t0:.0f}s)")
+    return {"version": TABLE_VERSION, "trials": trials, "seed": seed, "classes": names, "equity": rows}
+
+def save_table(data: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m poker.preflop")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    b = sub.add_parser("build", help="simulate every class vs 1..7 opponents")
+    b.add_argument("--trials", type=int, default=40000)
+    b.add_argument("--workers", type=int, default=1)
+    b.add_argument("--seed", type=int, default=1)
+    b.add_argument("--backend", default="python")
+    b.add_argument("--out", default=table_path())
+    s = sub.add_parser("show", help="print the current table")
+    s.add_argument("--opponents", type=int, default=1)
+    args = ap.parse_args(argv)
+
+    if args.cmd == "build":
+        data = build_table(args.trials, args.workers, args.seed, args.backend)
+        save_table(data, args.out)
+        print(f"wrote {args.out}")
+        return
+    table = load_table()
+    if not table:
+        print(f"no preflop table at {table_path()}; run: python -m poker.preflop build")
+        return
+    n = max(1, min(MAX_OPPONENTS, args.opponents))
+    for name, row in sorted(table.items(), key=lambda kv: -kv[1][n - 1]):
+        print(f"{name:<4} {row[n - 1]:.3f}")
+
+if __name__ == "__main__":
+    main()
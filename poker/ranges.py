@@ -0,0 +1,341 @@
+"""
+Weighted Hold'em hand ranges and range-vs-range equity.
+
+A range is written in the usual notation, comma separated, each part with an
+optional ":weight" (default 1):
+
+    QQ+, AKs, A5s-A2s, KQo:0.5, 22-66, T9s+, AhKh, any
+
+Pairs take "+" (that pair and up) or a "lo-hi" span; unpaired hands take
+"+" (kicker up to one below the top card) or a span over the kicker, with
+"s"/"o" for suited/offsuit and neither for both. A part with suits names one
+combo; "any" is all 1,326. A later part overrides an earlier one's weight.
+
+Every range is a subset of COMBOS, the 1,326 two-card combos precomputed
+once with their card bitmasks, so removing dead cards and checking two holes
+for overlap are single AND operations.
+
+    python -m poker.ranges "QQ+,AKs" "any" [--board AhKd2c] [--trials N] [--seed S]
+"""
+from bisect import bisect
+from itertools import combinations
+from math import comb, sqrt
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import argparse, random
+
+from .equity import EquityResult, Z_95, _board_scorer, precise_enough
+from .preflop import RANK_CHARS, class_of_ids
+
+SUIT_CHARS = "cdhs"  # suit index in card ids (see card.card_id)
+# Enumerate instead of sampling when runouts x live combos is at most this
+# (any river; the turn for ranges up to a couple of thousand combos).
+EXACT_LIMIT = 200_000
+
+COMBOS: Tuple[Tuple[int, int], ...] = tuple(combinations(range(52), 2))
+COMBO_MASKS: Tuple[int, ...] = tuple((1 << a) | (1 << b) for a, b in COMBOS)
+COMBO_INDEX: Dict[Tuple[int, int], int] = {c: i for i, c in enumerate(COMBOS)}
+
+def _class_combos() -> Dict[str, Tuple[int, ...]]:
+    out: Dict[str, List[int]] = {}
+    for i, c in enumerate(COMBOS):
+        out.setdefault(class_of_ids(c), []).append(i)
+    return {name: tuple(idx) for name, idx in out.items()}
+
+# preflop class name ("AKs") -> its combos
+CLASS_COMBOS: Dict[str, Tuple[int, ...]] = _class_combos()
+
+def parse_card(s: str) -> int:
+    """Card id of a two-character card like "Ah" or "Tc"."""
+    if len(s) != 2 or s[0].upper() not in RANK_CHARS or s[1].lower() not in SUIT_CHARS:
+        raise ValueError(f"bad card {s!r}")
+    return SUIT_CHARS.index(s[1].lower()) * 13 + RANK_CHARS.index(s[0].upper())
+
+def parse_cards(s: str) -> List[int]:
+    """Card ids of a run of two-character cards like "AhKd2c"."""
+    s = s.replace(" ", "")
+    if len(s) % 2:
+        raise ValueError(f"bad cards {s!r}")
+    return [parse_card(s[i:i + 2]) for i in range(0, len(s), 2)]
+
+def _rank(ch: str, part: str) -> int:
+    r = RANK_CHARS.find(ch.upper())
+    if r < 0:
+        raise ValueError(f"bad rank {ch!r} in {part!r}")
+    return r
+
+def _classes(part: str) -> List[str]:
+    """Class names (see preflop.class_names) covered by one part without its weight."""
+    def names(hi: int, lo: int, kind: str) -> List[str]:
+        base = RANK_CHARS[hi] + RANK_CHARS[lo]
+        if hi == lo:
+            return [base]
+        return [base + k for k in (kind or "so")]
+
+    def one(tok: str) -> Tuple[int, int, str]:
+        if len(tok) not in (2, 3) or (len(tok) == 3 and tok[2] not in "so"):
+            raise ValueError(f"bad hand {tok!r} in {part!r}")
+        a, b = _rank(tok[0], part), _rank(tok[1], part)
+        kind = tok[2:]
+        if a == b and kind:
+            raise ValueError(f"pairs take no suitedness: {part!r}")
+        return max(a, b), min(a, b), kind
+
+    if "-" in part:
+        left, right = part.split("-", 1)
+        (h1, l1, k1), (h2, l2, k2) = one(left), one(right)
+        if k1 != k2:
+            raise ValueError(f"mixed suitedness in {part!r}")
+        if h1 == l1 and h2 == l2:
+            return [n for r in range(min(h1, h2), max(h1, h2) + 1) for n in names(r, r, "")]
+        if h1 != h2 or h1 == l1 or h2 == l2:
+            raise ValueError(f"a span must keep the top card: {part!r}")
+        return [n for lo in range(min(l1, l2), max(l1, l2) + 1) for n in names(h1, lo, k1)]
+    plus = part.endswith("+")
+    hi, lo, kind = one(part[:-1] if plus else part)
+    if not plus:
+        return names(hi, lo, kind)
+    if hi == lo:
+        return [n for r in range(hi, 13) for n in names(r, r, "")]
+    return [n for k in range(lo, hi) for n in names(hi, k, kind)]
+
+class Range:
+    """A weighted set of two-card combos, stored as indexes into COMBOS."""
+
+    __slots__ = ("index", "weights")
+
+    def __init__(self, weights: Optional[Dict[int, float]] = None):
+        items = sorted((i, w) for i, w in (weights or {}).items() if w > 0)
+        self.index: Tuple[int, ...] = tuple(i for i, _ in items)
+        self.weights: Tuple[float, ...] = tuple(float(w) for _, w in items)
+
+    @classmethod
+    def parse(cls, text: str) -> "Range":
+        weights: Dict[int, float] = {}
+        for raw in text.split(","):
+            part = raw.strip()
+            if not part:
+                continue
+            w = 1.0
+            if ":" in part:
+                part, ws = part.rsplit(":", 1)
+                part = part.strip()
+                try:
+                    w = float(ws)
+                except ValueError:
+                    raise ValueError(f"bad weight {ws!r} in {raw.strip()!r}") from None
+                if w < 0:
+                    raise ValueError(f"negative weight in {raw.strip()!r}")
+            if part.lower() in ("any", "random"):
+                idx: Iterable[int] = range(len(COMBOS))
+            elif len(part) == 4 and part[1].lower() in SUIT_CHARS and part[3].lower() in SUIT_CHARS:
+                a, b = parse_cards(part)
+                if a == b:
+                    raise ValueError(f"repeated card in {part!r}")
+                idx = [COMBO_INDEX[(min(a, b), max(a, b))]]
+            else:
+                idx = [i for name in _classes(part) for i in CLASS_COMBOS[name]]
+            for i in idx:
+                weights[i] = w
+        return cls(weights)
+
+    @classmethod
+    def of_hole(cls, hole: Sequence[int]) -> "Range":
+        """The one-combo range of a known two-card hole (card ids)."""
+        a, b = sorted(hole)
+        return cls({COMBO_INDEX[(a, b)]: 1.0})
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __repr__(self) -> str:
+        return f"Range({len(self)} combos, weight {self.total():g})"
+
+    def total(self) -> float:
+        return sum(self.weights)
+
+    def combos(self) -> List[Tuple[Tuple[int, int], float]]:
+        return [(COMBOS[i], w) for i, w in zip(self.index, self.weights)]
+
+    def without(self, dead: int) -> "Range":
+        """The combos holding none of the cards in the `dead` bitmask."""
+        return Range({i: w for i, w in zip(self.index, self.weights) if not COMBO_MASKS[i] & dead})
+
+RangeLike = Union[Range, str, Sequence[int]]
+
+def as_range(r: RangeLike) -> Range:
+    """A Range from a Range, range notation, or a two-card hole of card ids."""
+    if isinstance(r, Range):
+        return r
+    if isinstance(r, str):
+        return Range.parse(r)
+    return Range.of_hole(r)
+
+def _live(r: Range, dead: int) -> List[Tuple[int, int, int, float]]:
+    # (card a, card b, mask, weight) of the combos clear of `dead`
+    return [(COMBOS[i][0], COMBOS[i][1], COMBO_MASKS[i], w)
+            for i, w in zip(r.index, r.weights) if not COMBO_MASKS[i] & dead]
+
+def _sweep(mine: List[Tuple[int, int, float, int]], theirs: List[Tuple[int, int, float, int]]
+           ) -> Tuple[float, float, float]:
+    """
+    Weighted (wins, ties, total) of every non-overlapping pair on one board,
+    from (a, b, weight, score) lists. Both are swept in score order, keeping
+    the weight seen so far overall, per card, and per combo; the weight of
+    opposing combos that share no card with (a, b) is then
+    all - card[a] - card[b] + combo[(a, b)], so the pass is O(n log n)
+    rather than O(n * m).
+    """
+    theirs = sorted(theirs, key=lambda t: t[3])
+    card_all = [0.0] * 52
+    combo_all: Dict[Tuple[int, int], float] = {}
+    for a, b, w, _ in theirs:
+        card_all[a] += w; card_all[b] += w
+        combo_all[(a, b)] = combo_all.get((a, b), 0.0) + w
+    w_all = sum(t[2] for t in theirs)
+    lt = [0.0, [0.0] * 52, {}]  # weight, per card, per combo of scores < s
+    le = [0.0, [0.0] * 52, {}]  # ... of scores <= s
+    p_lt = p_le = 0
+    wins = ties = total = 0.0
+
+    def add(acc, t):
+        a, b, w, _ = t
+        acc[0] += w
+        acc[1][a] += w; acc[1][b] += w
+        acc[2][(a, b)] = acc[2].get((a, b), 0.0) + w
+
+    def clear(acc_w, card, combo, a, b):
+        return acc_w - card[a] - card[b] + combo.get((a, b), 0.0)
+
+    for a, b, w, s in sorted(mine, key=lambda t: t[3]):
+        while p_lt < len(theirs) and theirs[p_lt][3] < s:
+            add(lt, theirs[p_lt]); p_lt += 1
+        while p_le < len(theirs) and theirs[p_le][3] <= s:
+            add(le, theirs[p_le]); p_le += 1
+        below = clear(lt[0], lt[1], lt[2], a, b)
+        wins += w * below
+        ties += w * (clear(le[0], le[1], le[2], a, b) - below)
+        total += w * clear(w_all, card_all, combo_all, a, b)
+    return wins, ties, total
+
+def _exact(mine: Range, theirs: Range, board: List[int], target: int, eval_variant: str) -> float:
+    board_scorer = _board_scorer(eval_variant)
+    dead = sum(1 << c for c in board)
+    rest = [c for c in range(52) if not dead >> c & 1]
+    wins = ties = total = 0.0
+    for run in combinations(rest, max(0, target - len(board))):
+        b = board + list(run)
+        score = board_scorer(b)
+        d = dead | sum(1 << c for c in run)
+        m = [(a, c, w, score([a, c])) for a, c, _, w in _live(mine, d)]
+        t = [(a, c, w, score([a, c])) for a, c, _, w in _live(theirs, d)]
+        w_, t_, n_ = _sweep(m, t)
+        wins += w_; ties += t_; total += n_
+    if total <= 0:
+        raise ValueError("the ranges have no combos that fit together on this board")
+    return (wins + 0.5*ties) / total
+
+def range_equity(
+    mine: RangeLike,
+    theirs: RangeLike,
+    board: Sequence[int] = (),
+    max_trials: int = 20000,
+    eval_variant: str = "holdem",
+    board_target_size: Optional[int] = None,
+    exact: Optional[bool] = None,
+    exact_limit: int = EXACT_LIMIT,
+    target_se: Optional[float] = None,
+    threshold: Optional[float] = None,
+    z: float = Z_95,
+    batch: int = 500,
+    seed: Optional[int] = None
+) -> EquityResult:
+    """
+    Heads-up equity of `mine` against `theirs`: each a Range, range notation,
+    or a two-card hole (card ids). Deals are weighted by the product of the two
+    combos' weights, and combos that share a card with each other or the
+    board are impossible (card removal).
+      - exact=None (default): enumerate every runout when runouts x live
+        combos is at most exact_limit, else sample; exact=True/False forces it
+      - sampling draws both combos by weight, redrawing on overlap, then the
+        runout, and stops as adaptive_equity_ids does (target_se, threshold,
+        max_trials)
+    Exact answers have stderr 0 and trials 0. Ties count as 0.5.
+    """
+    if eval_variant == "plo":
+        raise ValueError("ranges are two-card Hold'em hands")
+    board = list(board)
+    target = 5 if board_target_size is None else board_target_size
+    dead = sum(1 << c for c in board)
+    mine, theirs = as_range(mine).without(dead), as_range(theirs).without(dead)
+    if not len(mine) or not len(theirs):
+        raise ValueError("a range has no combos left after removing the board")
+    k = max(0, target - len(board))
+    runouts = comb(52 - len(board), k)
+    if exact or (exact is None and runouts * (len(mine) + len(theirs)) <= exact_limit):
+        return EquityResult(_exact(mine, theirs, board, target, eval_variant), 0.0, 0)
+
+    rng = random if seed is None else random.Random(seed)
+    board_scorer = _board_scorer(eval_variant)
+    m, t = _live(mine, 0), _live(theirs, 0)
+    cum_m, cum_t = [], []
+    acc = 0.0
+    for _, _, _, w in m:
+        acc += w; cum_m.append(acc)
+    acc = 0.0
+    for _, _, _, w in t:
+        acc += w; cum_t.append(acc)
+    rest = [c for c in range(52) if not dead >> c & 1]
+    max_trials = max(1, max_trials)
+    wins = ties = n = 0
+    res = EquityResult(0.0, 0.0, 0)
+    while n < max_trials:
+        kk = min(batch, max_trials - n)
+        for _ in range(kk):
+            for _tries in range(10_000):
+                a = m[min(bisect(cum_m, rng.random() * cum_m[-1]), len(m) - 1)]
+                b = t[min(bisect(cum_t, rng.random() * cum_t[-1]), len(t) - 1)]
+                if not a[2] & b[2]:
+                    break
+            else:
+                raise ValueError("the ranges have no combos that fit together on this board")
+            used = a[2] | b[2]
+            run = [c for c in rng.sample(rest, k + 4) if not used >> c & 1][:k]
+            score = board_scorer(board + run)
+            hv, ov = score([a[0], a[1]]), score([b[0], b[1]])
+            if hv > ov:
+                wins += 1
+            elif hv == ov:
+                ties += 1
+        n += kk
+        eq = (wins + 0.5*ties) / n
+        var = max(0.0, (wins + 0.25*ties) / n - eq*eq)
+        res = EquityResult(eq, sqrt(var / n), n)
+        if precise_enough(res, target_se, threshold, z):
+            break
+    return res
+
+def hand_vs_range(hole: Sequence[int], villain: RangeLike, board: Sequence[int] = (), **kw) -> EquityResult:
+    """Equity of a known two-card hole against a range; see range_equity."""
+    return range_equity(Range.of_hole(hole), villain, board, **kw)
+
+def range_vs_range(mine: RangeLike, theirs: RangeLike, board: Sequence[int] = (), **kw) -> EquityResult:
+    """Equity of one range against another; see range_equity."""
+    return range_equity(mine, theirs, board, **kw)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m poker.ranges", description="Range-vs-range Hold'em equity.")
+    ap.add_argument("mine", help='range or hole, e.g. "QQ+,AKs" or "AhKh"')
+    ap.add_argument("theirs", help='opposing range, e.g. "any" or "22+,A2s+,KTo+:0.5"')
+    ap.add_argument("--board", default="", help="board cards, e.g. AhKd2c")
+    ap.add_argument("--trials", type=int, default=20000, help="most deals to sample when not enumerating")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--exact", action="store_true", help="always enumerate every runout")
+    args = ap.parse_args(argv)
+    mine, theirs = Range.parse(args.mine), Range.parse(args.theirs)
+    res = range_equity(mine, theirs, parse_cards(args.board), max_trials=args.trials,
+                       exact=True if args.exact else None, seed=args.seed)
+    how = "exact" if not res.trials else f"±{Z_95 * res.stderr:.3f} over {res.trials:,} deals"
+    print(f"{len(mine)} vs {len(theirs)} combos: equity {res.equity:.3f} ({how})")
+
+if __name__ == "__main__":
+    main()
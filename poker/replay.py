@@ -1,24 +1,36 @@
 import json, sys
-from pathlib import Path
-from rich.console import Console
-from rich.table import Table
+from . import ui
+from .handlog import HandLog
 
-console = Console()
+USAGE = "Usage: python -m poker.replay [--plain] HAND_ID [history_dir] | path/to/HAND.json"
 
-def main():
-    if len(sys.argv) < 2:
-        console.print("Usage: python -m poker.replay path/to/HAND.json")
+def load_hand(ref: str, history_dir: str = "history") -> dict:
+    """A hand by id from the history log, or an exported HAND.json path."""
+    if ref.endswith(".json"):
+        with open(ref, encoding="utf-8") as f:
+            return json.load(f)
+    with HandLog(history_dir, readonly=True) as log:  # a session may be writing it
+        return log.get(ref)
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    if "--plain" in args:  # or POKERLAB_PLAIN=1; either way Rich is never imported
+        args.remove("--plain")
+        ui.set_plain()
+    console = ui.get_console()
+    if not args:
+        console.print(USAGE, markup=False)
+        sys.exit(1)
+    try:
+        data = load_hand(args[0], args[1] if len(args) > 1 else "history")
+    except KeyError:
+        console.print(f"No hand {args[0]!r} in the history log.")
         sys.exit(1)
-    p = Path(sys.argv[1])
-    data = json.loads(p.read_text(encoding="utf-8"))
     console.rule(f"[bold]Replay {data['hand_id']} ({data['variant']})[/bold]")
     console.print("Players:", ", ".join(f"{i}:{n}" for i,n in enumerate(data["seats"])))
     console.print("Board:", ", ".join(data["board"]) or "(none)")
-    t = Table(show_header=True, header_style="bold")
-    t.add_column("Seat"); t.add_column("Name"); t.add_column("Street"); t.add_column("Action"); t.add_column("Amount")
-    for a in data["actions"]:
-        t.add_row(str(a["seat"]), a["name"], a["street"], a["type"], a["amount"])
-    console.print(t)
+    ui.print_table(["Seat", "Name", "Street", "Action", "Amount"],
+                   [[str(a["seat"]), a["name"], a["street"], a["type"], a["amount"]] for a in data["actions"]])
     console.print("Pots:", data.get("pots"))
     console.print("Winners:", data["winners"])
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+"""
+Headless bot-vs-bot simulator on the hand_state engine.
+
+Every seat is played by bot.act_batch straight against HandState/apply (no console
+layer, nothing printed) and cards come from a seeded Deck, so runs are
+reproducible. Stacks reset every
+hand and seats rotate so each player sits in every position equally often.
+Per-level results (win rate, bb/100 with a 95% interval) are printed and can
+be written to JSON; --thr overrides bot.BET_THR/CALL_THR for a level so
+threshold changes can be compared from data.
+
+Postflop equity comes from poker.postflop's strength table by default
+(--equity buckets, roughly 800 hands/s per worker for three seats); spots
+the table lacks are sampled. --equity simulate samples every postflop
+decision instead, with a fixed budget of --trials per decision and no
+enumeration beyond that many deals: much slower (~80 hands/s per
+worker) but free of bucketing error. Preflop always uses the 169-class
+table. Throughput scales with --workers.
+
+    python -m poker.selfplay --levels 1 4 7 --hands 20000 --seed 1 --workers 4 --out selfplay.json
+"""
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+import argparse, json, math, random, time
+
+from . import bot
+from .deck import Deck
+from .engine import GameConfig
+from .hand_state import apply, new_hand
+from .parallel import chunk_seed, split_trials
+
+BIG_BLIND = Decimal("2.00")
+SIM_TRIALS = 200  # per-decision sampling budget in "simulate" mode
+HOLDEM = GameConfig("holdem", 2, [3, 1, 1], 5)
+
+@dataclass
+class SeatStats:
+    hands: int = 0
+    won: int = 0          # hands finished with a profit
+    net: float = 0.0      # sum of per-hand results, in big blinds
+    net_sq: float = 0.0   # sum of squares, for the interval
+
+    def add(self, bb: float) -> None:
+        self.hands += 1
+        self.won += bb > 0
+        self.net += bb
+        self.net_sq += bb * bb
+
+    def merge(self, other: "SeatStats") -> None:
+        self.hands += other.hands
+        self.won += other.won
+        self.net += other.net
+        self.net_sq += other.net_sq
+
+    def summary(self) -> Dict[str, float]:
+        n = max(1, self.hands)
+        mean = self.net / n
+        var = max(0.0, self.net_sq / n - mean * mean)
+        return {
+            "hands": self.hands,
+            "win_rate": self.won / n,
+            "bb_per_100": 100 * mean,
+            "ci95_bb_per_100": 100 * 1.96 * math.sqrt(var / n),
+        }
+
+@contextmanager
+def _thresholds(overrides: Dict[int, Tuple[float, float]]):
+    saved = dict(bot.BET_THR), dict(bot.CALL_THR)
+    for level, (b, c) in overrides.items():
+        bot.BET_THR[level], bot.CALL_THR[level] = b, c
+    try:
+        yield
+    finally:
+        bot.BET_THR.clear(); bot.BET_THR.update(saved[0])
+        bot.CALL_THR.clear(); bot.CALL_THR.update(saved[1])
+
+def _run_chunk(job) -> List[SeatStats]:
+    from .equity_cache import EquityCache
+    levels, first_hand, hands, seed, stack, config, overrides, mode, trials = job
+    n = len(levels)
+    deck_rng = random.Random(seed)
+    # private RNG and cache: with one worker the chunk runs in the caller's process
+    bot_rng = random.Random(seed ^ 0x5EED)
+    cache = EquityCache()
+    stats = [SeatStats() for _ in range(n)]
+    start = Decimal(stack)
+    with _thresholds(overrides):
+        for h in range(first_hand, first_hand + hands):
+            # seat s is taken by player (s + h) % n, so positions rotate every hand
+            order = [(s + h) % n for s in range(n)]
+            lv = [levels[p] for p in order]
+            state, _ = new_hand(config, [start] * n, Deck(deck_rng))
+            while not state.done:
+                state, _ = apply(state, bot.act_batch([(state, lv)], trials, mode=mode, cache=cache, rng=bot_rng,
+                                                     exact_limit=trials)[0])
+            for seat, end in enumerate(state.stacks):
+                stats[order[seat]].add(float((end - start) / BIG_BLIND))
+    return stats
+
+def simulate(
+    levels: List[int],
+    hands: int,
+    seed: int = 1,
+    workers: int = 1,
+    stack: str = "200.00",
+    config: GameConfig = HOLDEM,
+    overrides: Optional[Dict[int, Tuple[float, float]]] = None,
+    mode: str = "buckets",
+    trials: int = SIM_TRIALS
+) -> List[SeatStats]:
+    """Per-player stats (indexed like `levels`) over `hands` hands; reproducible per (seed, workers)."""
+    if len(levels) < 2:
+        raise ValueError("need at least 2 players")
+    jobs, first = [], 0
+    for i, n in enumerate(split_trials(hands, workers)):
+        if n:
+            jobs.append((list(levels), first, n, chunk_seed(seed, i), stack, config, dict(overrides or {}), mode, trials))
+            first += n
+    if len(jobs) <= 1:
+        parts = [_run_chunk(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            parts = list(pool.map(_run_chunk, jobs))
+    total = [SeatStats() for _ in levels]
+    for part in parts:
+        for acc, s in zip(total, part):
+            acc.merge(s)
+    return total
+
+def by_level(levels: List[int], stats: List[SeatStats]) -> Dict[int, SeatStats]:
+    out: Dict[int, SeatStats] = {}
+    for lv, s in zip(levels, stats):
+        out.setdefault(lv, SeatStats()).merge(s)
+    return out
+
+def _parse_thr(s: str) -> Tuple[int, Tuple[float, float]]:
+    level, b, c = s.split(":")
+    return int(level), (float(b), float(c))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m poker.selfplay", description="Headless bot-vs-bot hands.")
+    ap.add_argument("--levels", type=int, nargs="+", default=[1, 4, 7], help="one bot level (1-7) per seat")
+    ap.add_argument("--hands", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--workers", type=int, default=1)
+    ap.add_argument("--stack", default="200.00", help="stack every seat starts each hand with")
+    ap.add_argument("--thr", type=_parse_thr, action="append", default=[], metavar="LEVEL:BET:CALL",
+                    help="override bot thresholds for a level, e.g. 4:0.60:0.47")
+    ap.add_argument("--equity", choices=bot.MODES, default="buckets",
+                    help="postflop equity: precomputed buckets (~800 hands/s per worker, 3 seats) "
+                         "or sample every spot (~80 hands/s per worker)")
+    ap.add_argument("--trials", type=int, default=SIM_TRIALS,
+                    help="per-decision sampling budget with --equity simulate")
+    ap.add_argument("--out", default=None, help="write results as JSON")
+    args = ap.parse_args(argv)
+
+    overrides = dict(args.thr)
+    t0 = time.perf_counter()
+    stats = simulate(args.levels, args.hands, args.seed, args.workers, args.stack, overrides=overrides,
+                     mode=args.equity, trials=args.trials)
+    dt = time.perf_counter() - t0
+    print(f"{args.hands:,} hands, {len(args.levels)} seats, {args.hands/dt:,.1f} hands/s")
+    print(f"{'level':>5} {'hands':>8} {'win%':>6} {'bb/100':>9} {'±95%':>8}")
+    levels_out = {}
+    for lv, s in sorted(by_level(args.levels, stats).items()):
+        sm = s.summary()
+        levels_out[lv] = sm
+        print(f"{lv:>5} {sm['hands']:>8} {sm['win_rate']:>6.1%} {sm['bb_per_100']:>9.1f} {sm['ci95_bb_per_100']:>8.1f}")
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"levels": args.levels, "hands": args.hands, "seed": args.seed, "workers": args.workers,
+                       "stack": args.stack, "equity": args.equity, "trials": args.trials, "thresholds": {str(k): v for k, v in overrides.items()},
+                       "by_level": {str(k): v for k, v in levels_out.items()},
+                       "by_seat": [asdict(s) for s in stats]}, f, indent=2)
+        print(f"wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
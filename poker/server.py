@@ -0,0 +1,418 @@
+"""
+Asyncio table server: many concurrent tables in one process (extra: web).
+
+Each table is an asyncio task stepping a hand_state.HandState. Bot seats are
+played inline by the task, but the equity sampling runs in worker processes,
+so a slow decision only waits on its own table while the event loop keeps
+serving the others. Each table is pinned to one worker (its EQUITY_CACHE then
+holds the street's looked-ahead spots, see bot.act_batch), and the decisions
+pending for a worker's tables go over as one bot.act_batch call. Human seats
+connect over a WebSocket; a human who is not connected, or takes longer than
+the action timeout, checks or folds. Tables rotate the blinds every hand and rebuy busted seats.
+
+TableServer has no dependency on FastAPI; create_app wraps it in HTTP and
+WebSocket routes:
+
+    GET    /tables                      summaries
+    POST   /tables                      {"variant": "holdem", "bots": [1, 4, 7], "humans": 1, "hand_pause": 1.0}
+    DELETE /tables/{id}
+    GET    /stats?window=10             hands, actions, bot action latency p50/p99 (ms)
+    GET    /metrics                     poker.metrics in Prometheus text format (this
+                                        process; bot workers keep their own)
+    WS     /tables/{id}/seats/{seat}    server sends JSON messages; client sends
+                                        {"action": "CHECK|BET|CALL|FOLD", "amount": "4.00"}
+
+    python -m poker.server --port 8000 --workers 4
+"""
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
+from functools import partial
+from typing import Any, Deque, Dict, List, Optional, Tuple
+import argparse, asyncio, logging, os, random, time
+
+from . import bot
+from .deck import Deck
+from .engine import GameConfig
+from .hand_state import Action, BIG_BLIND, CHECK, FOLD, Event, HandState, apply, new_hand
+
+log = logging.getLogger(__name__)
+
+VARIANTS = {
+    "holdem": GameConfig("holdem", 2, [3, 1, 1], 5),
+    "plo": GameConfig("plo", 4, [3, 1, 1], 5),
+}
+ACTION_TIMEOUT = 30.0
+LATENCY_SAMPLES = 20000
+
+def _bot_batch(items: List[Tuple[HandState, List[Optional[int]]]]) -> List[Action]:
+    # runs in a worker: module-level so it pickles
+    return bot.act_batch(items)
+
+def _event_json(ev: Event, order: List[int]) -> Dict[str, Any]:
+    """Event with table seat numbers (hand positions rotate with the button)."""
+    out: Dict[str, Any] = {"type": "event", "kind": ev.kind}
+    if ev.seat >= 0:
+        out["seat"] = order[ev.seat]
+    if ev.amount:
+        out["amount"] = str(ev.amount)
+    if ev.kind == "STREET":
+        out["street"], out["board"] = ev.info[0], list(ev.info[1])
+    elif ev.kind == "SHOWDOWN":
+        out["hands"] = [[order[i], s] for i, s in ev.info]
+    elif ev.kind == "WIN":
+        out["winners"] = [order[i] for i in ev.info[0]]
+    return out
+
+class Seat:
+    __slots__ = ("name", "level", "stack", "outbox", "pending")
+
+    def __init__(self, name: str, level: Optional[int], stack: Decimal):
+        self.name = name
+        self.level = level                  # None for a human seat
+        self.stack = stack
+        self.outbox: Optional[asyncio.Queue] = None  # set while a client is connected
+        self.pending: Optional[asyncio.Future] = None
+
+    def send(self, msg: Dict[str, Any]) -> None:
+        if self.outbox is not None:
+            self.outbox.put_nowait(msg)
+
+class Table:
+    def __init__(self, server: "TableServer", tid: int, config: GameConfig, levels: List[Optional[int]],
+                 buy_in: Decimal, hand_pause: float, seed: Optional[int]):
+        self.server = server
+        self.id = tid
+        self.config = config
+        self.seats = [Seat(f"Seat {i}" if lv is None else f"Bot {i} (L{lv})", lv, buy_in)
+                      for i, lv in enumerate(levels)]
+        self.buy_in = buy_in
+        self.hand_pause = hand_pause
+        self.rng = random.Random(seed)
+        self.button = 0
+        self.hands = 0
+        self.state: Optional[HandState] = None
+        self.order: List[int] = []
+        self.task: Optional[asyncio.Task] = None
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "variant": self.config.variant,
+            "hands": self.hands,
+            "seats": [{"seat": i, "name": s.name, "level": s.level, "stack": str(s.stack),
+                       "connected": s.outbox is not None} for i, s in enumerate(self.seats)],
+        }
+
+    def _broadcast(self, msg: Dict[str, Any]) -> None:
+        for s in self.seats:
+            s.send(msg)
+
+    def _publish(self, events: List[Event]) -> None:
+        if any(s.outbox is not None for s in self.seats):
+            for ev in events:
+                self._broadcast(_event_json(ev, self.order))
+
+    async def run(self) -> None:
+        n = len(self.seats)
+        while True:
+            await self.play_hand()
+            self.hands += 1
+            self.button = (self.button + 1) % n
+            for s in self.seats:
+                if s.stack < BIG_BLIND:
+                    s.stack = self.buy_in
+            await asyncio.sleep(self.hand_pause)
+
+    async def play_hand(self) -> None:
+        n = len(self.seats)
+        order = [(self.button + i) % n for i in range(n)]
+        state, events = new_hand(self.config, [self.seats[p].stack for p in order], Deck(self.rng))
+        self.state, self.order = state, order
+        self._broadcast({"type": "hand", "number": self.hands, "order": order})
+        for pos, p in enumerate(order):
+            self.seats[p].send({"type": "hole", "cards": list(state.holes[pos])})
+        self._publish(events)
+        while not state.done:
+            seat = self.seats[order[state.to_act]]
+            if seat.level is None:
+                action = await self._human_action(seat, state)
+            else:
+                t0 = time.perf_counter()
+                action = await self.server.bot_action(self, state, [self.seats[p].level for p in order])
+                self.server.record_action(time.perf_counter() - t0)
+            state, events = apply(state, action)
+            self.state = state
+            self._publish(events)
+        for pos, p in enumerate(order):
+            self.seats[p].stack = state.stacks[pos]
+
+    @staticmethod
+    def _fallback(state: HandState) -> Action:
+        """What an absent or timed-out human does: check if possible, else fold."""
+        return Action(CHECK) if CHECK in state.legal_actions() else Action(FOLD)
+
+    async def _human_action(self, seat: Seat, state: HandState) -> Action:
+        fallback = self._fallback(state)
+        if seat.outbox is None:
+            return fallback
+        seat.pending = asyncio.get_running_loop().create_future()
+        pos = state.to_act
+        seat.send({"type": "turn", "legal": list(state.legal_actions()),
+                   "to_call": str(state.bet), "max_bet": str(state.max_bet(pos))})
+        try:
+            return await asyncio.wait_for(seat.pending, self.server.action_timeout)
+        except asyncio.TimeoutError:
+            return fallback
+        finally:
+            seat.pending = None
+
+    def submit(self, seat_no: int, msg: Any) -> Optional[str]:
+        """Action from a human client (a decoded JSON message); returns an error message if it can't be used."""
+        if not isinstance(msg, dict):
+            return "expected a JSON object"
+        seat = self.seats[seat_no]
+        state = self.state
+        if seat.pending is None or seat.pending.done() or state is None:
+            return "not your turn"
+        kind = str(msg.get("action", "")).upper()
+        if kind not in state.legal_actions():
+            return f"illegal action {kind!r}; legal: {', '.join(state.legal_actions())}"
+        try:
+            amount = Decimal(str(msg.get("amount", "0")))
+        except Exception:
+            return "bad amount"
+        if not amount.is_finite():  # NaN/sNaN/Infinity parse but can't be compared
+            return "bad amount"
+        if kind == "BET" and not (Decimal("0.01") <= amount <= state.max_bet(state.to_act)):
+            return f"bet must be 0.01..{state.max_bet(state.to_act)}"
+        seat.pending.set_result(Action(kind, amount))
+        return None
+
+    def connect(self, seat_no: int) -> asyncio.Queue:
+        seat = self.seats[seat_no]
+        if seat.level is not None:
+            raise ValueError(f"seat {seat_no} is a bot")
+        if seat.outbox is not None:
+            raise ValueError(f"seat {seat_no} is taken")
+        seat.outbox = asyncio.Queue()
+        seat.outbox.put_nowait({"type": "welcome", "table": self.summary(), "seat": seat_no})
+        return seat.outbox
+
+    def disconnect(self, seat_no: int) -> None:
+        seat = self.seats[seat_no]
+        seat.outbox = None
+        if seat.pending is not None and not seat.pending.done() and self.state is not None:
+            seat.pending.set_result(self._fallback(self.state))  # don't wait out action_timeout
+
+class TableServer:
+    def __init__(self, executor: Optional[Executor] = None, workers: Optional[int] = None,
+                 action_timeout: float = ACTION_TIMEOUT):
+        # bot decisions are CPU-bound equity sampling: keep them off the event loop.
+        # One single-process executor per worker, so tables can be pinned to one.
+        if executor is not None:
+            self.shards: List[Executor] = [executor]
+        else:
+            self.shards = [ProcessPoolExecutor(max_workers=1) for _ in range(workers or os.cpu_count() or 1)]
+        self.workers = len(self.shards)
+        self._pending: List[list] = [[] for _ in self.shards]  # (state, levels, future) per shard
+        self._busy = [False] * len(self.shards)
+        self.action_timeout = action_timeout
+        self.tables: Dict[int, Table] = {}
+        self._next_id = 1
+        self._actions: Deque[Tuple[float, float]] = deque(maxlen=LATENCY_SAMPLES)  # (when, seconds)
+        self._hands_at_start = 0
+
+    def create_table(self, variant: str = "holdem", bots: Optional[List[int]] = None, humans: int = 0,
+                     buy_in: str = "200.00", hand_pause: float = 1.0, seed: Optional[int] = None) -> Table:
+        if variant not in VARIANTS:
+            raise ValueError(f"unknown variant {variant!r} (choose from {', '.join(VARIANTS)})")
+        levels: List[Optional[int]] = [None] * humans + list(bots if bots is not None else [1, 4, 7])
+        if not 2 <= len(levels) <= 8:
+            raise ValueError("a table needs 2..8 seats")
+        if any(lv is not None and not 1 <= lv <= 7 for lv in levels):
+            raise ValueError("bot levels are 1..7")
+        try:
+            stack = Decimal(str(buy_in))
+        except InvalidOperation:
+            raise ValueError(f"bad buy_in {buy_in!r}") from None
+        if not stack.is_finite() or stack <= 0:
+            raise ValueError(f"buy_in must be a positive amount, not {buy_in!r}")
+        if not hand_pause >= 0:  # also rejects NaN
+            raise ValueError("hand_pause must be >= 0")
+        table = Table(self, self._next_id, VARIANTS[variant], levels, stack, hand_pause, seed)
+        self._next_id += 1
+        self.tables[table.id] = table
+        table.task = asyncio.get_running_loop().create_task(table.run())
+        return table
+
+    async def close_table(self, tid: int) -> None:
+        table = self.tables.pop(tid)
+        table.task.cancel()
+        try:
+            await table.task
+        except asyncio.CancelledError:
+            pass
+        except Exception:  # the table already died; still finish tearing down the rest
+            log.exception("table %d failed", tid)
+
+    async def close(self) -> None:
+        for tid in list(self.tables):
+            await self.close_table(tid)
+        for ex in self.shards:
+            ex.shutdown(wait=False, cancel_futures=True)
+
+    async def bot_action(self, table: Table, state: HandState, levels: List[Optional[int]]) -> Action:
+        """Queue a decision on the table's worker; it goes out with everything else pending there."""
+        shard = table.id % len(self.shards)
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[shard].append((state, levels, fut))
+        if not self._busy[shard] and len(self._pending[shard]) == 1:
+            # let every table that becomes ready in this loop iteration join the batch
+            asyncio.get_running_loop().call_soon(self._flush, shard)
+        return await fut
+
+    def _flush(self, shard: int) -> None:
+        batch = [p for p in self._pending[shard] if not p[2].done()]
+        self._pending[shard] = []
+        if not batch or self._busy[shard]:
+            self._pending[shard] = batch + self._pending[shard]
+            return
+        self._busy[shard] = True
+        cf = asyncio.get_running_loop().run_in_executor(self.shards[shard], _bot_batch,
+                                                        [(s, lv) for s, lv, _ in batch])
+        cf.add_done_callback(partial(self._deliver, shard, batch))
+
+    def _deliver(self, shard: int, batch: list, cf: asyncio.Future) -> None:
+        self._busy[shard] = False
+        for i, (_, _, fut) in enumerate(batch):
+            if fut.done():
+                continue
+            if cf.cancelled():
+                fut.cancel()
+            elif cf.exception() is not None:
+                fut.set_exception(cf.exception())
+            else:
+                fut.set_result(cf.result()[i])
+        if self._pending[shard]:
+            self._flush(shard)
+
+    def record_action(self, seconds: float) -> None:
+        self._actions.append((time.monotonic(), seconds))
+
+    def stats(self, window: float = 10.0) -> Dict[str, Any]:
+        since = time.monotonic() - window
+        lat = sorted(s for t, s in self._actions if t >= since)
+        def pct(q: float) -> float:
+            return 1000 * lat[min(len(lat) - 1, int(q * len(lat)))] if lat else 0.0
+        return {
+            "tables": len(self.tables),
+            "workers": self.workers,
+            "cpus": os.cpu_count() or 1,
+            "hands": sum(t.hands for t in self.tables.values()),
+            "window": window,
+            "bot_actions": len(lat),
+            "actions_per_s": len(lat) / window,
+            "p50_ms": pct(0.50),
+            "p99_ms": pct(0.99),
+        }
+
+def _require_web():
+    try:
+        import fastapi
+    except ImportError as e:  # optional dependency: pip install .[web]
+        raise ImportError("the table server needs fastapi and uvicorn (pip install .[web])") from e
+    return fastapi
+
+def create_app(workers: Optional[int] = None, action_timeout: float = ACTION_TIMEOUT):
+    fastapi = _require_web()
+    from contextlib import asynccontextmanager
+
+    holder: Dict[str, TableServer] = {}
+
+    @asynccontextmanager
+    async def lifespan(app):
+        holder["server"] = TableServer(workers=workers, action_timeout=action_timeout)
+        yield
+        await holder["server"].close()
+
+    app = fastapi.FastAPI(title="pokerlab tables", lifespan=lifespan)
+
+    def _table(tid: int) -> Table:
+        table = holder["server"].tables.get(tid)
+        if table is None:
+            raise fastapi.HTTPException(404, f"no table {tid}")
+        return table
+
+    @app.get("/tables")
+    async def list_tables():
+        return [t.summary() for t in holder["server"].tables.values()]
+
+    @app.post("/tables")
+    async def create_table(payload: Dict[str, Any] = fastapi.Body(default={})):
+        try:
+            table = holder["server"].create_table(**payload)
+        except (TypeError, ValueError) as e:
+            raise fastapi.HTTPException(400, str(e))
+        return table.summary()
+
+    @app.delete("/tables/{tid}")
+    async def delete_table(tid: int):
+        _table(tid)
+        await holder["server"].close_table(tid)
+        return {"closed": tid}
+
+    @app.get("/stats")
+    async def stats(window: float = 10.0):
+        return holder["server"].stats(window)
+
+    @app.get("/metrics")
+    async def prometheus():
+        from fastapi.responses import PlainTextResponse
+        from . import metrics
+        return PlainTextResponse(metrics.prometheus_text(), media_type="text/plain; version=0.0.4")
+
+    @app.websocket("/tables/{tid}/seats/{seat_no}")
+    async def seat_socket(ws: fastapi.WebSocket, tid: int, seat_no: int):
+        table = holder["server"].tables.get(tid)
+        if table is None or not 0 <= seat_no < len(table.seats):
+            await ws.close(code=4404)
+            return
+        try:
+            outbox = table.connect(seat_no)
+        except ValueError as e:
+            await ws.close(code=4409, reason=str(e))
+            return
+        await ws.accept()
+
+        async def pump():
+            while True:
+                await ws.send_json(await outbox.get())
+
+        sender = asyncio.create_task(pump())
+        try:
+            while True:
+                err = table.submit(seat_no, await ws.receive_json())
+                if err:
+                    outbox.put_nowait({"type": "error", "message": err})
+        except fastapi.WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            table.disconnect(seat_no)
+
+    return app
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m poker.server", description="Multi-table poker server.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--workers", type=int, default=None, help="bot decision processes (default: CPU count)")
+    ap.add_argument("--action-timeout", type=float, default=ACTION_TIMEOUT, help="seconds before a human auto-checks/folds")
+    args = ap.parse_args(argv)
+    app = create_app(args.workers, args.action_timeout)
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
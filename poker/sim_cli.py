@@ -1,17 +1,25 @@
 from .card import Card, Suit
 from .equity import estimate_equity
-import sys
+import argparse, os, time
 
-def main():
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m poker.sim_cli", description="Preflop equity of AA vs a random hand.")
+    ap.add_argument("trials", nargs="?", default="10000", help="number of trials (min 1000)")
+    ap.add_argument("--workers", type=int, default=1, help=f"worker processes (this machine has {os.cpu_count()} cores)")
+    ap.add_argument("--seed", type=int, default=None, help="master seed; fixed seed + workers reproduces a run exactly")
+    args = ap.parse_args(argv)
     trials = 10000
-    if len(sys.argv) > 1:
-        try:
-            trials = max(1000, int(sys.argv[1]))
-        except Exception:
-            pass
+    try:
+        trials = max(1000, int(args.trials))
+    except Exception:
+        pass
     hero = [Card(14, Suit.SPADES), Card(14, Suit.HEARTS)]
-    eq = estimate_equity(hero, board=None, trials=trials)
+    t0 = time.perf_counter()
+    eq = estimate_equity(hero, board=None, trials=trials, workers=args.workers, seed=args.seed,
+                         preflop_table=False)
+    dt = time.perf_counter() - t0
     print(f"Preflop equity of AA vs random over {trials:,} trials: {eq:.3f}")
+    print(f"  {args.workers} worker(s), seed={args.seed}, {trials/dt:,.0f} trials/s")
 
 if __name__ == "__main__":
     main()
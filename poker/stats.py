@@ -0,0 +1,171 @@
+"""
+Streaming analytics over the hand-history log (see poker.handlog).
+
+Hands are read one at a time with handlog.scan and folded into counters
+bucketed by (day, variant, player, opponent levels). Players are "You" and
+bots by level ("L1".."L7"). Memory depends only on how many buckets there
+are, never on how many hands. The buckets and the log position they cover
+are cached next to the log (stats_cache.json), so a rerun only reads hands
+appended since. Filters pick buckets, so changing them needs no rescan.
+
+    python -m poker.stats [--dir history] [--since 2026-01-01] [--until 2026-12-31]
+                          [--variant holdem] [--opp-level 5] [--json] [--rebuild]
+"""
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import argparse, json, math, os, time
+
+from .handlog import scan
+
+CACHE_NAME = "stats_cache.json"
+CACHE_VERSION = 1
+BIG_BLIND = Decimal("2.00")
+# pot-size histogram: upper bounds in big blinds, plus one open-ended bin
+POT_BINS = (5, 10, 20, 50, 100, 200)
+
+@dataclass
+class PlayerStats:
+    hands: int = 0
+    vpip: int = 0            # put money in voluntarily preflop
+    pfr: int = 0             # bet preflop (the only raise this game has)
+    showdowns: int = 0
+    showdown_wins: int = 0
+    net_bb: float = 0.0
+    net_bb_sq: float = 0.0
+    pots: List[int] = field(default_factory=lambda: [0] * (len(POT_BINS) + 1))
+
+    def to_list(self) -> list:
+        return [self.hands, self.vpip, self.pfr, self.showdowns, self.showdown_wins,
+                self.net_bb, self.net_bb_sq] + self.pots
+
+    @classmethod
+    def from_list(cls, v: list) -> "PlayerStats":
+        return cls(*v[:7], pots=list(v[7:]))
+
+    def merge(self, o: "PlayerStats") -> None:
+        self.hands += o.hands
+        self.vpip += o.vpip
+        self.pfr += o.pfr
+        self.showdowns += o.showdowns
+        self.showdown_wins += o.showdown_wins
+        self.net_bb += o.net_bb
+        self.net_bb_sq += o.net_bb_sq
+        self.pots = [a + b for a, b in zip(self.pots, o.pots)]
+
+    def summary(self) -> Dict[str, Any]:
+        n = max(1, self.hands)
+        mean = self.net_bb / n
+        var = max(0.0, self.net_bb_sq / n - mean * mean)
+        labels = [f"<{b}" for b in POT_BINS] + [f"{POT_BINS[-1]}+"]
+        return {
+            "hands": self.hands,
+            "vpip": self.vpip / n,
+            "pfr": self.pfr / n,
+            "wtsd": self.showdowns / n,
+            "showdown_win_rate": self.showdown_wins / max(1, self.showdowns),
+            "bb_per_100": 100 * mean,
+            "ci95_bb_per_100": 100 * 1.96 * math.sqrt(var / n),
+            "pot_bb_histogram": dict(zip(labels, self.pots)),
+        }
+
+def _player(level: int) -> str:
+    return "You" if not level else f"L{level}"
+
+def _pot_bin(pot_bb: float) -> int:
+    for i, b in enumerate(POT_BINS):
+        if pot_bb < b:
+            return i
+    return len(POT_BINS)
+
+def hand_buckets(ts: float, rec: Dict[str, Any]) -> Iterable[Tuple[str, PlayerStats]]:
+    """(bucket key, one-hand PlayerStats) for every seat of a HandRecord dict."""
+    day = time.strftime("%Y-%m-%d", time.localtime(ts))
+    levels = rec.get("levels") or [0] * len(rec["seats"])
+    pot_bb = float(sum(Decimal(p["amount"]) for p in rec.get("pots", [])) / BIG_BLIND)
+    acts = rec.get("actions", [])
+    winners = set(rec.get("winners", []))
+    for i, level in enumerate(levels):
+        mine = [a for a in acts if a["seat"] == i]
+        pre = [a["type"] for a in mine if a["street"] == "Preflop"]
+        sd = any(a["type"] == "SHOWDOWN" for a in mine)
+        net = float((Decimal(rec["stacks_end"][i]) - Decimal(rec["stacks_start"][i])) / BIG_BLIND)
+        ps = PlayerStats(1, int(any(t in ("CALL", "BET", "ALLIN") for t in pre)), int("BET" in pre),
+                         int(sd), int(sd and i in winners), net, net * net)
+        ps.pots[_pot_bin(pot_bb)] = 1
+        opp = ",".join(str(l) for l in sorted({l for j, l in enumerate(levels) if j != i and l}))
+        yield f"{day}|{rec['variant']}|{_player(level)}|{opp}", ps
+
+def update(directory: str = "history", rebuild: bool = False) -> Dict[str, PlayerStats]:
+    """Buckets for every hand in the log, reading only hands not yet in the cache."""
+    path = os.path.join(directory, CACHE_NAME)
+    buckets: Dict[str, PlayerStats] = {}
+    start = None
+    if not rebuild and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("version") == CACHE_VERSION:
+            start = tuple(cached["position"])
+            buckets = {k: PlayerStats.from_list(v) for k, v in cached["buckets"].items()}
+    pos, new = start, 0
+    for pos, _, ts, rec in scan(directory, start):
+        for key, ps in hand_buckets(ts, rec):
+            acc = buckets.get(key)
+            if acc is None:
+                buckets[key] = ps
+            else:
+                acc.merge(ps)
+        new += 1
+    if new and os.path.isdir(directory):
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "position": list(pos),
+                       "buckets": {k: v.to_list() for k, v in buckets.items()}}, f, separators=(",", ":"))
+        os.replace(tmp, path)
+    return buckets
+
+def aggregate(
+    buckets: Dict[str, PlayerStats],
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    variant: Optional[str] = None,
+    opp_level: Optional[int] = None
+) -> Dict[str, PlayerStats]:
+    """Per-player totals over the buckets matching the filters (dates are YYYY-MM-DD, inclusive)."""
+    out: Dict[str, PlayerStats] = {}
+    for key, ps in buckets.items():
+        day, var, player, opp = key.split("|")
+        if (since and day < since) or (until and day > until) or (variant and var != variant):
+            continue
+        if opp_level is not None and str(opp_level) not in opp.split(","):
+            continue
+        out.setdefault(player, PlayerStats()).merge(ps)
+    return out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m poker.stats", description="Player stats over the hand history.")
+    ap.add_argument("--dir", default="history", help="hand-history log directory")
+    ap.add_argument("--since", default=None, help="first day, YYYY-MM-DD")
+    ap.add_argument("--until", default=None, help="last day, YYYY-MM-DD")
+    ap.add_argument("--variant", default=None, choices=["holdem", "plo", "custom"])
+    ap.add_argument("--opp-level", type=int, default=None, help="only hands against a bot of this level")
+    ap.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    ap.add_argument("--rebuild", action="store_true", help="ignore the cache and rescan the whole log")
+    args = ap.parse_args(argv)
+
+    players = aggregate(update(args.dir, args.rebuild), args.since, args.until, args.variant, args.opp_level)
+    rows = {p: s.summary() for p, s in sorted(players.items(), key=lambda kv: (kv[0] != "You", kv[0]))}
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return
+    if not rows:
+        print("No hands match.")
+        return
+    print(f"{'player':<7} {'hands':>7} {'VPIP':>6} {'PFR':>6} {'WTSD':>6} {'W$SD':>6} {'bb/100':>8} {'±95%':>7}  pots (bb)")
+    for p, r in rows.items():
+        hist = " ".join(f"{k}:{v}" for k, v in r["pot_bb_histogram"].items() if v)
+        print(f"{p:<7} {r['hands']:>7} {r['vpip']:>6.1%} {r['pfr']:>6.1%} {r['wtsd']:>6.1%} "
+              f"{r['showdown_win_rate']:>6.1%} {r['bb_per_100']:>8.1f} {r['ci95_bb_per_100']:>7.1f}  {hist}")
+
+if __name__ == "__main__":
+    main()
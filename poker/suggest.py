@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import List, Optional, Tuple
 from .card import Card
-from .equity import estimate_equity
+from .equity_cache import cached_equity
 
 # ---------- Hold'em (equity-based) ----------
 def _holdem_suggest(
@@ -10,15 +10,17 @@ def _holdem_suggest(
     n_live_opponents: int,
     facing_bet: bool
 ) -> Tuple[str, str]:
-    # Scale trials down as streets progress
-    trials = 2000 // (1 + (0 if not board else len(board)))
-    eq = estimate_equity(hole, board, trials=max(1200, trials), n_opponents=max(1, n_live_opponents))
-
     # Thresholds tighten as more opponents enter
     add = max(0, n_live_opponents - 1) * 0.04
     bet_thr  = min(0.98, 0.58 + add)
     call_thr = min(0.98, 0.46 + add)
 
+    # Preflop comes from the 169-class table. Otherwise sample only until the
+    # estimate is clearly on one side of the threshold that decides the action.
+    trials = 2000 // (1 + (0 if not board else len(board)))
+    eq = cached_equity(hole, board, trials=max(1200, trials), n_opponents=max(1, n_live_opponents),
+                       threshold=call_thr if facing_bet else bet_thr)
+
     if not facing_bet:
         action = "BET" if eq >= bet_thr else "CHECK"
     else:
@@ -1,16 +1,74 @@
-from rich.console import Console
-from rich.table import Table
-from rich.text import Text
-from typing import List, Dict, Any
-from .card import Card, RANK_NAME
+"""
+Terminal output helpers for the console game and poker.replay.
 
-console = Console()
+Rich is imported on first output, not at import time. Plain mode
+(POKERLAB_PLAIN=1, or set_plain()) never imports it: markup is stripped,
+cards print as "A♠" strings and tables as aligned text, which is what
+scripts and pipes want.
+"""
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence
+import os, re
+
+if TYPE_CHECKING:  # poker.card pulls in dataclasses; replay never needs it
+    from .card import Card
+
+PLAIN = os.environ.get("POKERLAB_PLAIN", "") not in ("", "0")
+_MARKUP = re.compile(r"\[/?[a-z ]*\]")
+_console = None
+
+def set_plain(on: bool = True) -> None:
+    global PLAIN, _console
+    PLAIN, _console = on, None
+
+class _PlainConsole:
+    """The slice of rich.console.Console this package uses, as plain print()."""
+
+    def print(self, *objects, **_):
+        print(*(_MARKUP.sub("", o) if isinstance(o, str) else o for o in objects))
+
+    def rule(self, title: str = "", **_):
+        title = _MARKUP.sub("", title)
+        print(f"── {title} ──" if title else "─" * 40)
+
+def get_console():
+    global _console
+    if _console is None:
+        if PLAIN:
+            _console = _PlainConsole()
+        else:
+            from rich.console import Console
+            _console = Console()
+    return _console
+
+def __getattr__(name: str):
+    # ui.console kept working when it became lazy
+    if name == "console":
+        return get_console()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def print_table(headers: Sequence[str], rows: Sequence[Sequence[str]], title: str = "") -> None:
+    """A bold-header table, or aligned columns in plain mode."""
+    if PLAIN:
+        widths = [max(len(str(x)) for x in col) for col in zip(headers, *rows)]
+        if title:
+            print(title)
+        for row in [headers] + list(rows):
+            print("  ".join(str(x).ljust(w) for x, w in zip(row, widths)).rstrip())
+        return
+    from rich.table import Table
+    table = Table(title=title or None, show_header=True, header_style="bold")
+    for h in headers:
+        table.add_column(h)
+    for row in rows:
+        table.add_row(*(str(x) for x in row))
+    get_console().print(table)
 
 SUIT_GLYPH = {"SPADES":"♠","CLUBS":"♣","HEARTS":"♥","DIAMONDS":"♦"}
 RED_SUITS = {"HEARTS","DIAMONDS"}
 
-def _rank_letter(c: Card) -> str:
+def _rank_letter(c: "Card") -> str:
     # Try mapping via RANK_NAME[int]; fallback to parsing "X OF SUIT"
+    from .card import RANK_NAME
     try:
         rn = RANK_NAME[getattr(c, "rank")]
     except Exception:
@@ -20,7 +78,7 @@ def _rank_letter(c: Card) -> str:
         return mapping[rn]
     return rn  # "2".."9" or already single-char
 
-def _suit_name(c: Card) -> str:
+def _suit_name(c: "Card") -> str:
     s = getattr(getattr(c, "suit", None), "name", None)
     if s:
         return s
@@ -32,16 +90,23 @@ def _suit_name(c: Card) -> str:
         return parts[1].strip().upper()
     return "SPADES"
 
-def fmt_card(c: Card) -> Text:
+def fmt_card(c: "Card"):
+    """rich Text (red for hearts and diamonds), or a str in plain mode."""
     r = _rank_letter(c)
     sname = _suit_name(c)
     glyph = SUIT_GLYPH.get(sname, "♠")
+    if PLAIN:
+        return f"{r}{glyph}"
+    from rich.text import Text
     t = Text(f"{r}{glyph}")
     if sname in RED_SUITS:
         t.stylize("bold red")
     return t
 
-def fmt_cards(cards: List[Card]) -> Text:
+def fmt_cards(cards: List["Card"]):
+    if PLAIN:
+        return " ".join(fmt_card(c) for c in cards)
+    from rich.text import Text
     out = Text()
     for i, c in enumerate(cards):
         if i: out.append(" ")
@@ -49,36 +114,38 @@ def fmt_cards(cards: List[Card]) -> Text:
     return out
 
 def header_hand(title: str, dealer_name: str, positions: Dict[int,str], names: List[str]):
+    console = get_console()
     console.rule(f"[bold]{title}[/bold]")
-    ring = Table.grid(expand=False)
-    for idx, nm in enumerate(["You"] + names):
-        pos = positions.get(idx, "")
-        ring.add_row(f"{idx}. {nm}  [{pos}]")
-    console.print(ring)
+    seats = [f"{idx}. {nm}  [{positions.get(idx, '')}]" for idx, nm in enumerate(["You"] + names)]
+    if PLAIN:
+        print("\n".join(seats))
+    else:
+        from rich.table import Table
+        ring = Table.grid(expand=False)
+        for line in seats:
+            ring.add_row(line)
+        console.print(ring)
     console.print(f"Dealer: [bold]{dealer_name}[/bold]")
 
-def show_board(stage: str, board: List[Card]):
-    console.print(f"[bold]{stage}[/bold] | Board: ", fmt_cards(board) if board else Text("(no cards)"))
+def show_board(stage: str, board: List["Card"]):
+    get_console().print(f"[bold]{stage}[/bold] | Board: ", fmt_cards(board) if board else "(no cards)")
 
 def announce(msg: str):
-    console.print(msg)
+    get_console().print(msg)
 
 def winner_line(name: str, pot_str: str, bold=True):
     if bold:
-        console.print(f"[bold]{name} wins {pot_str}[/bold]")
+        get_console().print(f"[bold]{name} wins {pot_str}[/bold]")
     else:
-        console.print(f"{name} wins {pot_str}")
+        get_console().print(f"{name} wins {pot_str}")
 
 def show_pots(pots: List[Dict[str,Any]]):
-    table = Table(title="Side Pots", show_header=True, header_style="bold")
-    table.add_column("#")
-    table.add_column("Amount")
-    table.add_column("Contested by")
-    for i,p in enumerate(pots, start=1):
-        table.add_row(str(i), f"${p['amount']:.2f}", ", ".join(str(x) for x in p["contesters"]))
-    console.print(table)
+    print_table(["#", "Amount", "Contested by"],
+                [[str(i), f"${p['amount']:.2f}", ", ".join(str(x) for x in p["contesters"])]
+                 for i, p in enumerate(pots, start=1)], title="Side Pots")
 
 def stats_panel(stats: Dict[str,Any], profit_points: List[float], top_pots: List[float]):
+    console = get_console()
     console.rule("[bold]Session Stats[/bold]")
     console.print(f"Hands: {stats['hands']} | VPIP: {stats['vpip']:.0%} | PFR: {stats['pfr']:.0%} | Showdown wins: {stats['sd_wins']}")
     if profit_points:
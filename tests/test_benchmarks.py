@@ -0,0 +1,30 @@
+import json
+from benchmarks import suite
+
+def test_suite_saves_a_baseline_and_flags_regressions(tmp_path, capsys):
+    path = str(tmp_path / "base.json")
+    assert suite.main(["--only", "eval7", "sidepots", "--repeat", "1", "--scale", "0.02", "--save", path]) == 0
+    base = json.load(open(path))
+    assert set(base["results"]) == {"eval7", "sidepots"} and base["results"]["eval7"]["rate"] > 0
+
+    slower = {"results": {k: {**v, "rate": v["rate"] * 0.8} for k, v in base["results"].items()}}
+    rows = suite.compare(base, slower, max_drop=10)
+    assert [r[0] for r in rows if r[4]] == ["eval7", "sidepots"]
+    assert not any(r[4] for r in suite.compare(base, slower, max_drop=25))
+    base["results"]["eval7"]["rate"] *= 100  # a baseline no run can meet
+    json.dump(base, open(path, "w"))
+    assert suite.main(["--only", "eval7", "--repeat", "1", "--scale", "0.02", "--compare", path]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+def test_importtime_guards_entry_points(tmp_path, capsys):
+    from benchmarks import importtime
+    path = str(tmp_path / "imports.json")
+    assert importtime.main(["--only", "poker.replay", "poker.cli_play", "--repeat", "1", "--save", path]) == 0
+    base = json.load(open(path))
+    assert all(r["us"] > 0 and r["denied"] == [] for r in base["results"].values())
+    assert importtime.denied(["poker.card", "rich.console"], ("rich", "poker.bot")) == ["rich"]
+
+    base["results"]["poker.replay"]["us"] //= 100  # a baseline no cold import can meet
+    json.dump(base, open(path, "w"))
+    assert importtime.main(["--only", "poker.replay", "--repeat", "1", "--compare", path]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
@@ -0,0 +1,45 @@
+import random
+from dataclasses import asdict
+from decimal import Decimal
+import pytest
+from poker import columnar
+from poker.card import CARDS
+from poker.deck import Deck
+from poker.engine import GameConfig, play_hand_console
+from poker.handlog import HandLog
+
+np = pytest.importorskip("numpy")
+HOLDEM = GameConfig("holdem", 2, [3, 1, 1], 5)
+
+def test_columnar_export_round_trips_the_log(tmp_path):
+    d, out = str(tmp_path / "log"), str(tmp_path / "cols")
+    recs = []
+    with HandLog(d) as log:
+        for s in range(12):
+            random.seed(s)
+            _, _, _, info = play_hand_console(Decimal("200"), ["Ann", "Bo", "Cy"], [2, 4, 6], [Decimal("200")] * 3,
+                                              HOLDEM, print_fn=lambda *a: None, deck=Deck(random.Random(s)),
+                                              hero_level=4, record=True)
+            rec = info["record"]
+            log.append(rec.hand_id, asdict(rec), ts=1_700_000_000 + s)
+            recs.append(rec)
+    counts = columnar.export(d, out)
+    t = columnar.load(out)
+    hands, seats, acts, sd, cards = t["hands"], t["seats"], t["actions"], t["showdowns"], t["cards"]
+    assert counts["hands"] == len(recs) == len(hands["ts"])
+    assert isinstance(hands["ts"], np.memmap)
+    assert [h.decode() for h in hands["hand_id"]] == [r.hand_id for r in recs]
+    assert counts["actions"] == sum(a.type != "SHOWDOWN" for r in recs for a in r.actions)
+    # net chips are zero-sum per hand and across the log
+    assert int((seats["end_cents"] - seats["start_cents"]).sum()) == 0
+    for i, r in enumerate(recs):
+        b0, bn = hands["board_start"][i], hands["board_len"][i]
+        assert [str(CARDS[c]) for c in cards[b0:b0 + bn]] == r.board
+        assert hands["winners"][i] == sum(1 << w for w in r.winners)
+        assert hands["pot_cents"][i] == sum(int(Decimal(p["amount"]) * 100) for p in r.pots)
+    types = t["dicts"]["type"]
+    bets = acts["amount_cents"][acts["type"] == types.index("BET")]
+    assert len(bets) and (bets == 400).all()
+    for k in range(len(sd["hand"])):
+        hole = cards[sd["hole_start"][k]:sd["hole_start"][k] + sd["hole_len"][k]]
+        assert len(hole) == 2 and sd["strength"][k] > 0
@@ -0,0 +1,147 @@
+import random
+import pytest
+from poker.card import Card, Suit
+from poker.equity import estimate_equity
+from poker.hand_eval import evaluate_ids
+
+AA = [Card(14, Suit.SPADES), Card(14, Suit.HEARTS)]
+FLOP = [Card(12, Suit.SPADES), Card(7, Suit.SPADES), Card(2, Suit.CLUBS)]
+
+def test_evaluate_batch_matches_scalar():
+    np = pytest.importorskip("numpy")
+    from poker.equity_np import evaluate_batch
+    rng = random.Random(3)
+    for n in (5, 6, 7):
+        hands = [rng.sample(range(52), n) for _ in range(2000)]
+        got = evaluate_batch(np.array(hands))
+        assert list(got) == [evaluate_ids(h) for h in hands]
+
+@pytest.mark.parametrize("variant,hero,board,n_opp", [
+    ("holdem", AA, [], 1),
+    ("holdem", [Card(14, Suit.SPADES), Card(13, Suit.SPADES)], FLOP, 3),
+    ("plo", AA + [Card(13, Suit.SPADES), Card(13, Suit.HEARTS)], FLOP, 2),
+])
+def test_numpy_backend_agrees_with_python(variant, hero, board, n_opp):
+    pytest.importorskip("numpy")
+    random.seed(11)
+    trials = 4000
+    kw = dict(trials=trials, n_opponents=n_opp, eval_variant=variant, preflop_table=False)
+    py = estimate_equity(hero, board, **kw)
+    vec = estimate_equity(hero, board, backend="numpy", **kw)
+    # both are binomial-ish estimates; 5 joint standard errors is a loose bound
+    se = (0.25 / trials) ** 0.5
+    assert abs(py - vec) < 5 * se * 2 ** 0.5
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        estimate_equity(AA, None, trials=10, backend="gpu")
+
+def test_exact_mode_on_the_river():
+    from poker.equity import exact_deals
+    hero = [Card(14, Suit.SPADES), Card(13, Suit.SPADES)]
+    board = FLOP + [Card(9, Suit.DIAMONDS), Card(3, Suit.HEARTS)]
+    assert exact_deals(45, 0, 1, 2) == 990
+    eq = estimate_equity(hero, board)
+    assert eq == estimate_equity(hero, board)  # enumerated, so deterministic
+    random.seed(5)
+    mc = estimate_equity(hero, board, trials=20000, exact=False)
+    assert abs(eq - mc) < 0.02
+    # the nut flush on this river cannot lose or tie
+    nuts = estimate_equity([Card(14, Suit.SPADES), Card(13, Suit.SPADES)],
+                           [Card(10, Suit.SPADES), Card(7, Suit.SPADES), Card(2, Suit.SPADES),
+                            Card(9, Suit.DIAMONDS), Card(3, Suit.HEARTS)], exact=True)
+    assert nuts == 1.0
+
+def test_estimate_equity_result_carries_the_error():
+    from poker.equity import estimate_equity_result
+    river = FLOP + [Card(9, Suit.DIAMONDS), Card(3, Suit.HEARTS)]
+    hero = [Card(14, Suit.SPADES), Card(13, Suit.SPADES)]
+    assert estimate_equity_result(hero, river) == (estimate_equity(hero, river), 0.0, 0)
+    assert estimate_equity_result(AA, None).stderr == 0.0  # from the table
+    res = estimate_equity_result(AA, FLOP, trials=4000, exact=False, seed=1)
+    assert res.equity == estimate_equity(AA, FLOP, trials=4000, exact=False, seed=1)
+    assert res.trials == 4000 and 0 < res.stderr < (0.25 / 4000) ** 0.5
+
+def test_seeded_runs_reproduce_per_worker_count():
+    from poker.card import to_ids
+    from poker.parallel import parallel_counts, split_trials, chunk_seed, _run_chunk
+    a = estimate_equity(AA, None, trials=3000, seed=42, preflop_table=False)
+    assert a == estimate_equity(AA, None, trials=3000, seed=42, preflop_table=False)
+    hero = to_ids(AA)
+    pooled = parallel_counts(hero, [], 3001, 1, "holdem", 5, workers=2, seed=9)
+    chunks = [_run_chunk((hero, [], n, 1, "holdem", 5, "python", chunk_seed(9, i)))
+              for i, n in enumerate(split_trials(3001, 2))]
+    assert pooled == (sum(w for w, _ in chunks), sum(t for _, t in chunks))
+
+def test_preflop_table_classes_and_lookup():
+    from poker.card import to_ids
+    from poker.preflop import class_names, class_of_ids, representative_ids, preflop_equity
+    names = class_names()
+    assert len(names) == len(set(names)) == 169
+    assert all(class_of_ids(representative_ids(n)) == n for n in names)
+    assert class_of_ids(to_ids([Card(13, Suit.CLUBS), Card(14, Suit.CLUBS)])) == "AKs"
+    assert class_of_ids(to_ids([Card(7, Suit.CLUBS), Card(7, Suit.HEARTS)])) == "77"
+    eq = preflop_equity(to_ids(AA), 1)
+    assert eq is not None and abs(eq - 0.852) < 0.01
+    assert estimate_equity(AA, None, n_opponents=1) == eq
+    assert preflop_equity(to_ids(AA), 8) is None
+
+def test_equity_cache_canonical_keys_and_precision():
+    from poker.card import to_ids
+    from poker.equity_cache import EquityCache, canonical_key, cached_equity
+    spades = to_ids([Card(14, Suit.SPADES), Card(13, Suit.SPADES)] + FLOP)
+    hearts = to_ids([Card(13, Suit.HEARTS), Card(14, Suit.HEARTS),
+                     Card(12, Suit.HEARTS), Card(2, Suit.DIAMONDS), Card(7, Suit.HEARTS)])
+    assert canonical_key(spades[:2], spades[2:], 2) == canonical_key(hearts[:2], hearts[2:], 2)
+    assert canonical_key(spades[:2], spades[2:], 2) != canonical_key(spades[:2], spades[2:], 3)
+
+    cache = EquityCache(maxsize=2)
+    hero, flop = [Card(14, Suit.SPADES), Card(13, Suit.SPADES)], FLOP
+    a = cached_equity(hero, flop, trials=500, n_opponents=2, cache=cache)
+    assert cached_equity(hero, flop, trials=400, n_opponents=2, cache=cache) == a
+    cached_equity(hero, flop, trials=800, n_opponents=2, cache=cache)  # needs more precision
+    assert (cache.hits, cache.misses) == (1, 2)
+    cached_equity(hero, flop, trials=100, n_opponents=3, cache=cache)
+    cached_equity(hero, flop, trials=100, n_opponents=4, cache=cache)
+    assert len(cache) == 2  # oldest entry evicted
+
+def test_equity_cache_stores_only_exact_results_as_exact():
+    import math
+    from poker.equity_cache import EquityCache, cached_equity_result
+    cache = EquityCache()
+    hero, flop = [Card(14, Suit.SPADES), Card(13, Suit.SPADES)], FLOP
+    assert cached_equity_result(hero, flop, trials=0, n_opponents=3, target_se=0.01, cache=cache).trials == 0
+    assert len(cache) == 0  # a 0-trial estimate is not kept, let alone as exact
+    assert cached_equity_result(hero, flop, trials=500, n_opponents=3, target_se=0.01, cache=cache).trials > 0
+    river = flop + [Card(3, Suit.CLUBS), Card(9, Suit.DIAMONDS)]
+    cached_equity_result(hero, river, trials=500, cache=cache)  # heads-up river: enumerated
+    assert sorted(e.trials for e in cache._data.values()) == [500, math.inf]
+
+def test_adaptive_equity_stops_early_away_from_threshold():
+    from poker.card import to_ids
+    from poker.equity import adaptive_equity_ids
+    hero = to_ids([Card(14, Suit.SPADES), Card(13, Suit.SPADES)])
+    flop = to_ids(FLOP)
+    clear = adaptive_equity_ids(hero, flop, max_trials=4000, n_opponents=3, threshold=0.9, seed=1)
+    assert clear.trials < 4000 and clear.equity + 1.96 * clear.stderr < 0.9
+    tight = adaptive_equity_ids(hero, flop, max_trials=20000, n_opponents=3, target_se=0.01, seed=1)
+    assert tight.stderr <= 0.01 and tight.trials < 20000
+    assert adaptive_equity_ids(hero, [], n_opponents=3, target_se=0.01).stderr == 0.0  # preflop table
+
+def test_batch_equity_matches_single_hero_estimates():
+    from poker.card import to_ids
+    from poker.equity import batch_equity_ids
+    from poker.equity_cache import EquityCache, EquityQuery, cached_equity_batch
+    heroes = [AA, [Card(13, Suit.SPADES), Card(13, Suit.HEARTS)], [Card(7, Suit.HEARTS), Card(2, Suit.DIAMONDS)]]
+    n_opps = [1, 2, 3]
+    got = batch_equity_ids([to_ids(h) for h in heroes], to_ids(FLOP), n_opps, max_trials=6000, seed=2)
+    for hero, n, res in zip(heroes, n_opps, got):
+        want = estimate_equity(hero, FLOP, trials=20000, n_opponents=n, exact=False, seed=3)
+        se = (res.stderr**2 + 0.25 / 20000) ** 0.5
+        assert res.trials == 6000 and abs(res.equity - want) < 4 * se
+
+    cache = EquityCache()
+    queries = [EquityQuery(h, FLOP, n, thresholds=(0.5,)) for h, n in zip(heroes, n_opps)]
+    first = cached_equity_batch(queries, trials=4000, cache=cache)
+    assert all(r.trials < 4000 for r in first)  # each stopped once clear of 0.5
+    assert cached_equity_batch(queries, trials=4000, cache=cache) == first and cache.hits == 3
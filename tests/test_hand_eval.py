@@ -34,3 +34,86 @@ def test_wheel_straight():
     ])
     assert hv[0] == STRAIGHT
     assert hv[1][0] == 5
+
+def test_table_evaluator_matches_subsets():
+    import random
+    from poker.card import RANKS
+    from poker.hand_eval import evaluate, _evaluate_best_subsets
+    rng = random.Random(7)
+    deck = [Card(v, s) for s in Suit for v in RANKS.values()]
+    for n in (5, 6, 7):
+        hands = [rng.sample(deck, n) for _ in range(1500)]
+        for h in hands:
+            assert evaluate_best(h) == _evaluate_best_subsets(h)
+        for a, b in zip(hands, hands[1:]):
+            want = compare(_evaluate_best_subsets(a), _evaluate_best_subsets(b))
+            got = evaluate(a) - evaluate(b)
+            assert (got > 0) - (got < 0) == want
+
+def test_card_id_round_trip():
+    from poker.card import CARDS, card_id, to_ids, from_ids
+    assert [card_id(c) for c in CARDS] == list(range(52))
+    hand = [Card(14, Suit.SPADES), Card(2, Suit.CLUBS), Card(10, Suit.HEARTS)]
+    assert from_ids(to_ids(hand)) == hand
+    assert from_ids(to_ids(hand))[0] is CARDS[card_id(hand[0])]
+
+def test_omaha_board_matches_combinations():
+    import random
+    from poker.card import CARDS
+    from poker.hand_eval import hand_class, FLUSH
+    from poker.omaha import evaluate_omaha, _evaluate_omaha_combos
+    rng = random.Random(5)
+    for n_board in (3, 4, 5):
+        for _ in range(400):
+            cards = rng.sample(CARDS, 4 + n_board)
+            hole, board = cards[:4], cards[4:]
+            assert hand_class(evaluate_omaha(hole, board)) == _evaluate_omaha_combos(hole, board)
+    # four hearts on board but only one in hand: no flush in Omaha
+    hole = [Card(14, Suit.HEARTS), Card(13, Suit.CLUBS), Card(2, Suit.DIAMONDS), Card(3, Suit.SPADES)]
+    board = [Card(5, Suit.HEARTS), Card(9, Suit.HEARTS), Card(11, Suit.HEARTS), Card(12, Suit.HEARTS), Card(7, Suit.CLUBS)]
+    assert hand_class(evaluate_omaha(hole, board))[0] != FLUSH
+
+def test_board_context_matches_full_evaluation():
+    import random
+    from poker.hand_eval import BoardEval, evaluate_ids
+    rng = random.Random(23)
+    for _ in range(20000):
+        n = rng.choice([3, 4, 5])
+        cards = rng.sample(range(52), n + 4)
+        board = BoardEval(cards[4:])
+        assert board.score(cards[:2]) == evaluate_ids(cards[:2] + cards[4:])
+        assert board.score2(cards[2], cards[3]) == evaluate_ids(cards[2:])
+    # rewinding to a base board and adding a runout is the same as building it whole
+    flush_board = [0, 3, 7]  # three clubs
+    known, ctx = BoardEval(flush_board), BoardEval()
+    for _ in range(2000):
+        run = rng.sample([c for c in range(52) if c not in flush_board], 4)
+        ctx.reset(known)
+        ctx.add(run[2]); ctx.add(run[3])
+        assert ctx.score2(run[0], run[1]) == evaluate_ids(run + flush_board)
+
+def test_table_file_is_checked_and_rebuilt(tmp_path, monkeypatch):
+    import pytest
+    from poker import eval_tables
+    monkeypatch.setenv("POKERLAB_CACHE", str(tmp_path))
+    path = eval_tables.cache_path()
+    built = eval_tables.load_tables()  # missing: built and saved
+    mapped = eval_tables.read_tables(path)
+    assert mapped.noflush == built.noflush and list(mapped.flush) == list(built.flush)
+    assert [mapped.classes[v] for v in range(len(built.classes))] == list(built.classes)
+
+    data = bytearray(open(path, "rb").read())
+    data[-1] ^= 0xFF  # corrupt the payload: checksum fails
+    open(path, "wb").write(data)
+    with pytest.raises(ValueError):
+        eval_tables.read_tables(path)
+    assert eval_tables.load_tables().noflush == built.noflush
+    assert eval_tables.read_tables(path).flush[0b11111] == built.flush[0b11111]
+
+    data = bytearray(open(path, "rb").read())
+    data[4] += 1  # another version: stale
+    open(path, "wb").write(data)
+    with pytest.raises(ValueError):
+        eval_tables.read_tables(path)
+    eval_tables.load_tables()
+    assert eval_tables.read_tables(path).classes[len(built.classes) - 1] == built.classes[-1]
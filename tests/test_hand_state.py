@@ -0,0 +1,79 @@
+import random
+from decimal import Decimal
+import pytest
+from poker import bot
+from poker.deck import Deck
+from poker.engine import GameConfig
+from poker.hand_state import Action, BET, CALL, CHECK, FOLD, HandState, apply, new_hand
+
+HOLDEM = GameConfig("holdem", 2, [3, 1, 1], 5)
+
+def _start(seed, stacks=("50", "30", "9")):
+    return new_hand(HOLDEM, [Decimal(s) for s in stacks], Deck(random.Random(seed)))
+
+def test_blinds_deal_and_legal_actions():
+    state, events = _start(1)
+    assert state.pot == Decimal("3.00") and state.stacks[:2] == (Decimal("49.00"), Decimal("28.00"))
+    assert len(set(sum(state.holes, ()) + state.deck)) == 52
+    assert events[0].kind == "STREET" and state.to_act == 0
+    assert state.legal_actions() == (CHECK, BET, FOLD)
+    assert state.max_bet(0) == Decimal("9")  # capped by the shortest live stack
+    with pytest.raises(ValueError):
+        apply(state, Action(CALL))
+    with pytest.raises(ValueError):
+        apply(state, Action(BET, Decimal("9.01")))
+
+def test_checkers_answer_a_later_bet():
+    state, _ = _start(2)
+    state, _ = apply(state, Action(CHECK))
+    state, _ = apply(state, Action(BET, Decimal("4")))
+    assert state.facing_bet and state.queue == (2, 0)
+    state, ev = apply(state, Action(FOLD))
+    state, ev = apply(state, Action(FOLD))
+    assert state.done and ev[-1].kind == "TAKE" and ev[-1].seat == 1
+    assert state.stacks == (Decimal("49.00"), Decimal("31.00"), Decimal("9"))
+
+def test_checkpoint_resumes_identically():
+    random.seed(4)
+    state, _ = _start(4)
+    states = [state]
+    while not state.done:
+        state, _ = apply(state, Action(CHECK) if CHECK in state.legal_actions() else Action(CALL))
+        states.append(state)
+    mid = HandState.from_dict(states[len(states) // 2].to_dict())
+    assert mid == states[len(states) // 2]
+    while not mid.done:
+        mid, _ = apply(mid, Action(CHECK) if CHECK in mid.legal_actions() else Action(CALL))
+    assert mid == state and sum(state.stacks) == Decimal("89")
+
+def test_bots_play_to_completion_conserving_chips():
+    random.seed(5)
+    for seed in range(10):
+        state, _ = _start(seed)
+        while not state.done:
+            state, _ = apply(state, bot.act(state, 1 + seed % 7))
+        assert sum(state.stacks) == Decimal("89") and state.pot == 0
+
+def test_act_batch_looks_ahead_for_later_bots():
+    from poker.equity_cache import EQUITY_CACHE
+    random.seed(6)
+    EQUITY_CACHE.clear()
+    levels = [1, 4, 7]
+    state, _ = _start(6, stacks=("200", "200", "200"))
+    while not state.done and not state.board:
+        state, _ = apply(state, Action(CALL) if state.facing_bet else Action(CHECK))
+    assert state.to_act == 0 and not state.facing_bet
+    action = bot.act_batch([(state, levels)])[0]
+    assert action.kind in state.legal_actions()
+    misses = EQUITY_CACHE.misses
+    state, _ = apply(state, Action(CHECK))
+    bot.act_batch([(state, levels)])
+    assert EQUITY_CACHE.misses == misses  # seat 1 was estimated with seat 0
+
+def test_console_invalid_bet_is_announced_once():
+    from poker.engine import play_hand_console
+    out, answers = [], iter(["b", "999999"] + ["c"] * 20)
+    play_hand_console(Decimal("200"), ["Ann"], [1], [Decimal("200")], GameConfig("holdem", 2, [3, 1, 1], 5),
+                      input_fn=lambda _: next(answers), print_fn=out.append, deck=Deck(random.Random(4)))
+    i = out.index("Invalid amount. Treated as check.")
+    assert out[i + 1] != "You check."
@@ -0,0 +1,112 @@
+import json, os
+import pytest
+from poker.handlog import HandLog, export_csv, export_json, _segment_name
+from poker.history import Action, HandRecord, Recorder
+
+def _rec(i):
+    return {"hand_id": f"h{i}", "variant": "holdem", "seats": ["You", "Bot"], "winners": [i % 2],
+            "pots": [{"amount": "4.00", "contesters": [0, 1]}], "actions": [{"seat": 0, "type": "BET"}] * 5}
+
+def test_append_get_rotate_and_time_range(tmp_path):
+    with HandLog(str(tmp_path), segment_bytes=600) as log:
+        for i in range(40):
+            log.append(f"h{i}", _rec(i), ts=1000.0 + i)
+        assert len(log) == 40 and log.get("h17") == _rec(17)
+        assert [r["hand_id"] for r in log.between(1010, 1012)] == ["h10", "h11", "h12"]
+    assert len([n for n in os.listdir(tmp_path) if n.endswith(".log")]) > 1
+    with HandLog(str(tmp_path)) as log:  # reopened from the index
+        assert log.get("h39") == _rec(39) and "h40" not in log
+        with pytest.raises(KeyError):
+            log.get("nope")
+
+def test_recovers_unindexed_records_and_torn_tail(tmp_path):
+    with HandLog(str(tmp_path)) as log:
+        for i in range(5):
+            log.append(f"h{i}", _rec(i))
+    idx = tmp_path / "hands.idx"
+    idx.write_bytes(idx.read_bytes()[:-30])  # lose the last index entries
+    with open(tmp_path / _segment_name(1), "ab") as f:
+        f.write(b"\x10\x00\x00")  # half-written record
+    with HandLog(str(tmp_path)) as log:
+        assert log.hand_ids() == [f"h{i}" for i in range(5)]
+        assert log.get("h4") == _rec(4)
+        log.append("h5", _rec(5))
+        assert log.reindex() == 6
+
+def test_readonly_open_leaves_a_live_writer_alone(tmp_path):
+    writer = HandLog(str(tmp_path))
+    for i in range(3):
+        writer.append(f"h{i}", _rec(i))
+    seg, idx = tmp_path / _segment_name(1), tmp_path / "hands.idx"
+    idx.write_bytes(idx.read_bytes()[:-10])  # last index entry not fully written yet
+    with open(seg, "ab") as f:
+        f.write(b"\x10\x00\x00")  # the writer's next record, partly appended
+    before = (seg.read_bytes(), idx.read_bytes())
+    with HandLog(str(tmp_path), readonly=True) as reader:
+        assert reader.hand_ids() == ["h0", "h1", "h2"] and reader.get("h2") == _rec(2)
+        with pytest.raises(ValueError):
+            reader.append("h9", _rec(9))
+    assert (seg.read_bytes(), idx.read_bytes()) == before
+    writer.close()
+    with HandLog(str(tmp_path / "missing"), readonly=True) as reader:
+        assert len(reader) == 0
+    assert not (tmp_path / "missing").exists()
+
+def test_recorder_and_exports(tmp_path):
+    rec = Recorder(str(tmp_path / "hist"))
+    hand = HandRecord("20250101-000000", "holdem", ["You", "Ann"], [0, 3], ["200.00", "200.00"],
+                      ["204.00", "196.00"], ["AS"], [{"amount": "8.00", "contesters": [0, 1]}], [0],
+                      [Action(0, "You", "Preflop", "BET", "4.00", {})])
+    assert rec.dump(hand) == hand.hand_id
+    assert export_json(rec.log, str(tmp_path / "json")) == 1
+    data = json.loads((tmp_path / "json" / f"{hand.hand_id}.json").read_text())
+    assert data["actions"][0]["type"] == "BET" and data == rec.log.get(hand.hand_id)
+    assert export_csv(rec.log, str(tmp_path / "hands.csv")) == 1
+    assert (tmp_path / "hands.csv").read_text().splitlines()[1] == "20250101-000000,holdem,2,0,8.00"
+
+def test_background_recorder_batches_off_the_caller(tmp_path):
+    import time
+    from poker.history import BackgroundRecorder
+    rec = BackgroundRecorder(str(tmp_path), max_queue=100, batch_size=16, fsync_every=0)
+    slow = rec.log.append_many
+    def stalled(items):
+        time.sleep(0.02)  # a slow disk
+        return slow(items)
+    rec.log.append_many = stalled
+    t0 = time.perf_counter()
+    for i in range(50):
+        rec.dump(HandRecord(f"h{i}", "holdem", ["You"], [0], [], [], [], [], [0], []))
+    assert time.perf_counter() - t0 < 0.5  # dump never waited on a write
+    rec.flush()
+    m = rec.metrics()
+    assert m["written"] == 50 and m["batches"] < 50 and m["queue_depth"] == 0 and m["fsyncs"] >= 1
+    rec.close()
+    rec.close()
+    with HandLog(str(tmp_path)) as log:
+        assert log.hand_ids() == [f"h{i}" for i in range(50)]
+
+def test_replay_plain_mode(tmp_path, capsys, monkeypatch):
+    from poker import replay, ui
+    monkeypatch.setattr(ui, "PLAIN", ui.PLAIN)  # both restored after the test
+    monkeypatch.setattr(ui, "_console", None)
+    rec = Recorder(str(tmp_path))
+    hand = HandRecord("20250101-000001", "holdem", ["You", "Ann"], [0, 3], ["200.00", "200.00"],
+                      ["204.00", "196.00"], ["AS"], [{"amount": "8.00", "contesters": [0, 1]}], [0],
+                      [Action(0, "You", "Preflop", "BET", "4.00", {})])
+    rec.dump(hand)
+    rec.log.close()
+    replay.main(["--plain", hand.hand_id, str(tmp_path)])
+    out = capsys.readouterr().out.splitlines()
+    assert out[0] == f"── Replay {hand.hand_id} (holdem) ──"
+    assert out[3].split() == ["Seat", "Name", "Street", "Action", "Amount"]
+    assert out[4].split() == ["0", "You", "Preflop", "BET", "4.00"]
+
+def test_closed_background_recorder_is_not_kept_alive(tmp_path):
+    import gc, weakref
+    from poker.history import BackgroundRecorder
+    rec = BackgroundRecorder(str(tmp_path))
+    rec.close()
+    ref = weakref.ref(rec)
+    del rec
+    gc.collect()
+    assert ref() is None  # the atexit hook let go of it
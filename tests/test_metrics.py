@@ -0,0 +1,30 @@
+import random
+from poker import metrics
+from poker.selfplay import simulate
+
+def test_metrics_record_a_session_only_when_enabled(monkeypatch):
+    metrics.reset()
+    monkeypatch.setattr(metrics, "ENABLED", False)
+    simulate([2, 5], hands=3, seed=1)
+    assert metrics.snapshot() == {"counters": {}, "timers": {}}
+    assert metrics.timer("x") is metrics.timer("y")  # shared no-op while off
+
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    simulate([2, 5], hands=6, seed=1)
+    snap = metrics.snapshot()
+    assert snap["timers"]["engine.apply"]["count"] > 6
+    assert snap["timers"]["bot.act_batch"]["count"] == snap["timers"]["engine.apply"]["count"]
+    assert snap["counters"]["engine.street.preflop"] == 6
+    t = snap["timers"]["engine.apply"]
+    assert sum(t["buckets"].values()) == t["count"] and t["sum"] > 0
+
+    text = metrics.prometheus_text()
+    assert "# TYPE poker_engine_street_preflop_total counter\npoker_engine_street_preflop_total 6" in text
+    assert f'poker_engine_apply_seconds_bucket{{le="+Inf"}} {t["count"]}' in text
+    assert "engine.apply" in metrics.summary()
+
+    out = []
+    with metrics.profile(print_fn=out.append, top=5):
+        random.Random(1).sample(range(52), 7)
+    assert "function calls" in out[0]
+    metrics.reset()
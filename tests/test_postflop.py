@@ -0,0 +1,35 @@
+import random
+from poker import postflop
+from poker.equity import estimate_equity_ids
+from poker.ranges import parse_cards
+from poker.selfplay import simulate
+
+def test_features_describe_the_spot():
+    # top pair, top kicker on a rainbow flop
+    assert postflop.features(parse_cards("AsKd"), parse_cards("Kh7c2d")) == "3|1|0|1|2|0|0|0|0"
+    # nut flush draw plus gutshot, no pair yet
+    key = postflop.features(parse_cards("AhQh"), parse_cards("Jh7h2cTs"))
+    assert key.split("|")[:2] == ["4", "0"] and key.split("|")[5:7] == ["1", "1"]
+    # no draws are left on the river
+    assert postflop.features(parse_cards("AhQh"), parse_cards("Jh7h2cTs3d")).split("|")[5:7] == ["0", "0"]
+
+def test_built_table_tracks_simulated_equity(tmp_path, monkeypatch):
+    path = str(tmp_path / "postflop.json")
+    postflop.save_table(postflop.build_table(20000, seed=3, min_count=20, progress=None), path)
+    monkeypatch.setenv("POKERLAB_POSTFLOP", path)
+    rng = random.Random(7)
+    errs = []
+    for _ in range(40):
+        cards = rng.sample(range(52), 6)
+        hole, board = cards[:2], cards[2:]
+        s = postflop.lookup(hole, board, 1)
+        if s is None:
+            continue
+        assert 0 <= s.bucket < postflop.N_BUCKETS and s.ehs2 <= s.ehs + 1e-9
+        errs.append(abs(s.equity - estimate_equity_ids(hole, board, n_opponents=1)))
+    assert len(errs) > 20 and sum(errs) / len(errs) < 0.12
+    assert postflop.lookup(cards[:4], cards[4:], 1, "plo") is None
+    # bots in bucket mode still play reproducible, zero-sum hands
+    a = simulate([2, 6], hands=20, seed=4, mode="buckets")
+    assert a == simulate([2, 6], hands=20, seed=4, mode="buckets")
+    assert abs(sum(s.net for s in a)) < 1e-9
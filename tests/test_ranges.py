@@ -0,0 +1,48 @@
+import pytest
+from poker.hand_eval import evaluate_ids
+from poker.preflop import class_of_ids
+from poker.ranges import Range, hand_vs_range, parse_cards, range_equity, range_vs_range
+
+def test_range_notation():
+    assert len(Range.parse("QQ+")) == 18
+    assert len(Range.parse("A5s-A2s")) == 16
+    assert len(Range.parse("22-66")) == 30
+    assert {class_of_ids(c) for c, _ in Range.parse("T9s+").combos()} == {"T9s"}
+    assert {class_of_ids(c) for c, _ in Range.parse("ATo+").combos()} == {"ATo", "AJo", "AQo", "AKo"}
+    assert len(Range.parse("AK")) == 16 and len(Range.parse("any")) == 1326
+    r = Range.parse("AA, KQo:0.5, AhAs:0.25")
+    assert len(r) == 18 and r.total() == 5 * 1 + 0.25 + 12 * 0.5
+    for bad in ("AAs", "AK-QJ", "XYo", "AKs:x", "QQ+:-1"):
+        with pytest.raises(ValueError):
+            Range.parse(bad)
+
+def test_exact_matches_brute_force_with_card_removal():
+    board = parse_cards("Ah7d2c9sKs")
+    mine, theirs = Range.parse("QQ+, AKs, 98s:0.5"), Range.parse("JJ-77, AQ, Ks9h:2")
+    dead = sum(1 << c for c in board)
+    num = den = 0.0
+    for (a, wa) in mine.combos():
+        for (b, wb) in theirs.combos():
+            m1, m2 = sum(1 << c for c in a), sum(1 << c for c in b)
+            if m1 & m2 or (m1 | m2) & dead:
+                continue
+            hv, ov = evaluate_ids(list(a) + board), evaluate_ids(list(b) + board)
+            num += wa * wb * (1.0 if hv > ov else 0.5 if hv == ov else 0.0)
+            den += wa * wb
+    res = range_vs_range(mine, theirs, board)
+    assert res.trials == 0 and res.equity == pytest.approx(num / den)
+
+def test_sampling_agrees_with_enumeration():
+    board = parse_cards("Ah7d2c")
+    exact = range_vs_range("QQ+,AKs", "JJ-99,AQs", board, exact=True)
+    est = range_vs_range("QQ+,AKs", "JJ-99,AQs", board, exact=False, max_trials=20000, seed=3)
+    assert abs(est.equity - exact.equity) < 4 * est.stderr
+    aa = hand_vs_range(parse_cards("AsAh"), "any", max_trials=20000, seed=1)
+    assert abs(aa.equity - 0.852) < 4 * aa.stderr
+    # the hole's own cards are removed from the opposing range: AA can only be AdAc
+    assert Range.parse("AA").without(sum(1 << c for c in parse_cards("AsAh"))).combos() == \
+        [(tuple(sorted(parse_cards("AcAd"))), 1.0)]
+    assert range_equity(parse_cards("AsAh"), "AA", exact=False, max_trials=2000, seed=1).equity == \
+        pytest.approx(0.5, abs=0.03)
+    with pytest.raises(ValueError):
+        range_equity("AsAh", "AsAh")
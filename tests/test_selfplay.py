@@ -0,0 +1,27 @@
+from poker.selfplay import by_level, simulate
+
+def test_selfplay_is_reproducible_and_zero_sum():
+    a = simulate([1, 7], hands=30, seed=5, mode="simulate")
+    b = simulate([1, 7], hands=30, seed=5, mode="simulate")
+    assert a == b
+    assert all(s.hands == 30 for s in a)
+    assert abs(sum(s.net for s in a)) < 1e-9
+
+def test_selfplay_groups_by_level():
+    stats = simulate([3, 3, 6], hands=12, seed=2)
+    grouped = by_level([3, 3, 6], stats)
+    assert grouped[3].hands == 24 and grouped[6].hands == 12
+
+def test_selfplay_leaves_global_rng_and_cache_alone():
+    import random
+    from poker.equity import EquityResult
+    from poker.equity_cache import EQUITY_CACHE
+    marker = EquityResult(0.5, 0.01, 100)
+    EQUITY_CACHE.clear()
+    EQUITY_CACHE.put(("marker",), marker)
+    random.seed(99)
+    state = random.getstate()
+    simulate([2, 5], hands=10, seed=3)
+    assert random.getstate() == state
+    assert len(EQUITY_CACHE) == 1 and EQUITY_CACHE.get(("marker",), trials=100) == marker
+    EQUITY_CACHE.clear()
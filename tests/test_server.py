@@ -0,0 +1,74 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from poker.server import TableServer
+
+def test_bot_tables_run_concurrently_and_conserve_chips():
+    async def go():
+        server = TableServer(executor=ThreadPoolExecutor(2), workers=2)
+        tables = [server.create_table(bots=[1, 7], buy_in="10000", hand_pause=0, seed=i) for i in range(3)]
+        while min(t.hands for t in tables) < 3:
+            await asyncio.sleep(0.01)
+        stats = server.stats()
+        await server.close()
+        return tables, stats
+    tables, stats = asyncio.run(go())
+    assert stats["bot_actions"] > 0 and stats["p99_ms"] >= stats["p50_ms"]
+    # seat stacks settle at hand end, so chips only ever move between seats
+    assert all(sum(s.stack for s in t.seats) == Decimal("20000") for t in tables)
+
+def test_human_seat_over_outbox():
+    async def go():
+        server = TableServer(executor=ThreadPoolExecutor(1), workers=1, action_timeout=5)
+        table = server.create_table(bots=[4], humans=1, hand_pause=0, seed=3)
+        outbox = table.connect(0)
+        seen = []
+        while table.hands < 2:
+            msg = await asyncio.wait_for(outbox.get(), 5)
+            seen.append(msg)
+            if msg["type"] == "turn":
+                assert table.submit(0, {"action": "RAISE"})  # rejected, still pending
+                assert table.submit(0, {"action": msg["legal"][0]}) is None
+        await server.close()
+        return seen
+    seen = asyncio.run(go())
+    kinds = {m["type"] for m in seen}
+    assert {"welcome", "hand", "hole", "turn", "event"} <= kinds
+
+def test_bad_messages_and_disconnect_mid_turn():
+    async def go():
+        server = TableServer(executor=ThreadPoolExecutor(1), workers=1, action_timeout=30)
+        table = server.create_table(bots=[4], humans=1, hand_pause=0, seed=3)
+        outbox = table.connect(0)
+        while (await asyncio.wait_for(outbox.get(), 5))["type"] != "turn":
+            pass
+        legal = table.state.legal_actions()
+        errors = [table.submit(0, m) for m in ([], "x")]
+        errors += [table.submit(0, {"action": legal[0], "amount": a}) for a in ("NaN", "sNaN", "Infinity")]
+        pending = table.seats[0].pending
+        table.disconnect(0)  # the table moves on without waiting out action_timeout
+        action = await asyncio.wait_for(pending, 1)
+        await server.close()
+        return errors, legal, action
+    errors, legal, action = asyncio.run(go())
+    assert errors == ["expected a JSON object"] * 2 + ["bad amount"] * 3
+    assert action.kind == ("CHECK" if "CHECK" in legal else "FOLD")
+
+def test_bad_table_settings_and_teardown_after_a_failed_table():
+    import pytest
+    async def go():
+        server = TableServer(executor=ThreadPoolExecutor(1), workers=1)
+        for kw in ({"buy_in": "abc"}, {"buy_in": "NaN"}, {"buy_in": "-5"}, {"buy_in": "0"}, {"hand_pause": -1}):
+            with pytest.raises(ValueError):
+                server.create_table(**kw)
+        broken, ok = server.create_table(hand_pause=0), server.create_table(hand_pause=0)
+        broken.task.cancel()
+
+        async def die():
+            raise RuntimeError("table crashed")
+        broken.task = asyncio.get_running_loop().create_task(die())
+        await asyncio.sleep(0)
+        await server.close()  # must not stop at the failed table
+        return server, ok
+    server, ok = asyncio.run(go())
+    assert not server.tables and ok.task.cancelled()
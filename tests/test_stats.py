@@ -0,0 +1,39 @@
+import random
+from dataclasses import asdict
+from decimal import Decimal
+from poker import stats
+from poker.deck import Deck
+from poker.engine import GameConfig, play_hand_console
+from poker.handlog import HandLog
+
+HOLDEM = GameConfig("holdem", 2, [3, 1, 1], 5)
+
+def _play(log, seed, ts):
+    random.seed(seed)
+    _, _, _, info = play_hand_console(Decimal("200"), ["Ann", "Bo"], [2, 6], [Decimal("200")] * 2, HOLDEM,
+                                      print_fn=lambda *a: None, deck=Deck(random.Random(seed)),
+                                      hero_level=4, record=True)
+    rec = info["record"]
+    log.append(rec.hand_id, asdict(rec), ts=ts)
+    return rec
+
+def test_stats_stream_and_update_incrementally(tmp_path, monkeypatch):
+    d = str(tmp_path)
+    with HandLog(d) as log:
+        recs = [_play(log, s, 1_700_000_000 + s) for s in range(8)]
+    players = stats.aggregate(stats.update(d))
+    assert set(players) == {"You", "L2", "L6"} and all(p.hands == 8 for p in players.values())
+    assert abs(sum(p.net_bb for p in players.values())) < 1e-9
+    you_vpip = sum(any(a.seat == 0 and a.street == "Preflop" and a.type in ("CALL", "BET") for a in r.actions)
+                   for r in recs)
+    assert players["You"].vpip == you_vpip
+    assert stats.aggregate(stats.update(d), opp_level=6)["L2"].hands == 8
+    assert stats.aggregate(stats.update(d), opp_level=3) == {}
+
+    with HandLog(d) as log:
+        _play(log, 99, 1_700_000_100)
+    seen = []
+    real = stats.hand_buckets
+    monkeypatch.setattr(stats, "hand_buckets", lambda ts, rec: seen.append(rec["hand_id"]) or real(ts, rec))
+    assert stats.aggregate(stats.update(d))["You"].hands == 9
+    assert len(seen) == 1  # only the new hand was read